@@ -1,22 +1,43 @@
-import sys, time, io
+from __future__ import annotations
+
+import sys, time, atexit, threading
+_T_START = time.perf_counter()  # startup timing: import phase begins
 import os, re, json
-from PIL import Image
 import shutil, subprocess, tempfile
-import urllib.request
-from zipfile import ZipFile, BadZipFile
+from zipfile import ZipFile
 from pathlib import Path
-from PyQt5.QtCore import Qt
-from PyQt5.QtWidgets import *
-from PyQt5.QtCore import *
-from PyQt5.QtGui import *
-from PyQt5.QtWidgets import QWidget
-import qdarktheme
-import markdown
+# PIL, qdarktheme, markdown, urllib and QtWebEngine are imported where first used
+from PyQt5.QtCore import (
+    Qt, QAbstractItemModel, QCoreApplication, QEvent, QFileSystemWatcher, QLockFile,
+    QModelIndex, QObject, QPoint, QRect, QSettings, QSize, QSortFilterProxyModel, QTimer, QUrl,
+    pyqtSignal,
+)
+from PyQt5.QtWidgets import (
+    QAbstractItemView, QApplication, QCheckBox, QDialog, QDialogButtonBox, QFileDialog, QFormLayout,
+    QFrame, QHBoxLayout, QLabel, QLineEdit, QListWidget, QMenu, QMessageBox, QProgressBar,
+    QProgressDialog, QPushButton, QSizePolicy, QSpinBox, QStyle, QTabWidget, QToolButton,
+    QTreeView, QTreeWidget, QTreeWidgetItem, QVBoxLayout, QWidget,
+)
+from PyQt5.QtGui import QBrush, QColor, QDesktopServices, QFont, QIcon, QImage, QImageReader, QPixmap
 from utils.stream import (_run_and_copy_core_stream)
-from PyQt5.QtWebEngineWidgets import QWebEngineView, QWebEnginePage
+from utils.scan import (entry_signature, diff_signatures, load_scan_index, save_scan_index)
+from utils.zipcache import ZipExtractCache, scan_archive
+from utils.registry import ModRegistryStore, RegistryCache
+from utils.thumbcache import ThumbnailCache
+from utils.search import ModSearchIndex
+from utils.manifest import ManifestStore, REL, SIZE, CLASS, STREAM, CORE, IMAGE, META
+from utils.conflicts import ConflictIndex
+from utils.jobs import (
+    JobScheduler, PRIORITY_INTERACTIVE, PRIORITY_SCAN, PRIORITY_PACK, PRIORITY_HOUSEKEEPING, PRIORITY_NAMES,
+    DONE, CANCELLED,
+)
 import logging
 import zlib
 import hashlib
+from collections import OrderedDict
+from typing import NamedTuple
+from concurrent.futures import ThreadPoolExecutor
+_T_IMPORTED = time.perf_counter()
 
 # Feature flags
 FEAT_REGISTRY_META  = True
@@ -29,15 +50,40 @@ FEAT_UPDATE_CHECKER = False
 FEAT_HELP_WEBENGINE = False
 FEAT_CONFLICT_COLOR = True
 FEAT_PILLOW_ICC     = True
+FEAT_INCREMENTAL_SCAN = True
+FEAT_ZIP_LAZY_EXTRACT = True
+FEAT_FS_WATCHER     = True
+STARTUP_TIMING      = bool(os.environ.get("HFW_MM_STARTUP_TIMING"))  # print import/window/paint times
 # -------------------------
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
-REGISTRY_PATH = Path.cwd() / "meta.ini"
+REGISTRY_PATH = Path.cwd() / "meta.ini"  # legacy JSON registry, imported once
+REGISTRY_DB_PATH = Path.cwd() / "meta.db"
+SCAN_INDEX_PATH = Path.cwd() / "scan.idx"
+MANIFEST_PATH = Path.cwd() / "manifest.idx"  # per-folder file listings (conflicts, packing, variants)
+SNAPSHOT_PATH = Path.cwd() / "modlist.snap"  # last built tree, shown at startup
+SNAPSHOT_VERSION = 1
 # MAX_TOTAL_UNCOMPRESSED_SIZE = 250 * 1024 * 1024  # 250 MB
 MAX_TOTAL_UNCOMPRESSED_SIZE = 800 * 1024 * 1024  # Testing
 MAX_FILE_SIZE = 50 * 1024 * 1024  # 50 MB
+WATCH_LIMIT = 512          # max paths handed to QFileSystemWatcher
+WATCH_DEBOUNCE_MS = 750    # quiet time before a burst of events is applied
+WATCH_MAX_DELAY_MS = 5000  # apply anyway if events never stop
+CORE_FILES = ('streaming_graph.core', 'streaming_links.stream')
+HASH_CHUNK = 4 * 1024 * 1024  # streamed hashing/copying; the core files are large
+PREVIEW_CACHE_MB = 64      # decoded previews kept in memory (prefs: preview/cache_mb)
+THUMB_CACHE_MB = 256       # downscaled previews kept on disk
+SEARCH_FIELDS = ("mod_name", "author", "version", "description", "link")  # registry fields the search box covers
+SEARCH_DEBOUNCE_MS = 80
+CONFLICT_DEBOUNCE_MS = 150  # quiet time after check changes before conflicts are recolored
+PROGRESS_FPS = 15          # packing progress is redrawn at most this often
+JOB_WORKERS = 4            # background job threads (previews, scans, packing, housekeeping)
+IDLE_DELAY_MS = 2000       # quiet time after the last input before caches are warmed
+IDLE_POLL_MS = 50
+IDLE_BATCH = 32            # already-warm mods skipped per tick
+IDLE_BUDGET_PCT = 20       # share of wall time idle warming may use (prefs: idle/budget_pct, 0 = off)
 KNOWN_HASHES = {
     "streaming_graph.core": {
         "crc32": 0x6bc24389,
@@ -52,16 +98,28 @@ KNOWN_HASHES = {
 img_ext = ['.png', '.jpg', '.jpeg','.bmp', '.gif' ]
 temp_ = Path.cwd() / 'temp_'
 temp_drag = Path.cwd() / 'temp_drag'
+ZIP_CACHE_DIR = Path.cwd() / 'zip_cache'
+THUMB_CACHE_DIR = Path.cwd() / 'thumb_cache'
+_THUMBS = ThumbnailCache(THUMB_CACHE_DIR, THUMB_CACHE_MB * 1024 * 1024)
 
 
-def _load_mod_registry(path: Path = REGISTRY_PATH) -> dict:
-    try:
-        if path.exists():
-            data = json.load(open(path, "r", encoding="utf-8"))
-            return data if isinstance(data, dict) else {}
-    except Exception as e:
-        print(f"[!] meta.ini read error: {e}")
-    return {}
+def _default_scan_workers() -> int:
+    # I/O bound: a few threads help on SSDs, more mostly thrash spinning disks
+    return min(8, os.cpu_count() or 4)
+
+_REGISTRY = None
+_REGISTRY_LOCK = threading.Lock()
+
+def _mod_registry() -> RegistryCache:
+    """The one shared registry: loaded once, O(1) reads, writes flushed in the background."""
+    global _REGISTRY
+    with _REGISTRY_LOCK:  # first use may come from a scan thread
+        if _REGISTRY is None:
+            name_fn = lambda key: _normalize_mod_name(_normalize_key(key))
+            store = ModRegistryStore(REGISTRY_DB_PATH, name_fn=name_fn, legacy_json=REGISTRY_PATH)
+            _REGISTRY = RegistryCache(store, name_fn=name_fn)
+            atexit.register(_REGISTRY.close)  # flush pending writes
+        return _REGISTRY
 
 def _normalize_key(name: str) -> str:
     return name.replace(" ", " ")
@@ -89,15 +147,15 @@ def _normalize_mod_name(raw_name: str) -> str:
 def _normpath(p: str) -> str:
     return os.path.normcase(os.path.normpath(p))
 
-def _candidate_roots(mods_dir: Path, display_name: str, top_item: QTreeWidgetItem) -> list[Path]:
+def _candidate_roots(mods_dir: Path, display_name: str, top_path: str | None) -> list[Path]:
     if not FEAT_SMART_DELETE:
         return []
 
     wanted = display_name.strip()
     cand = []
 
-    # From top item (UserRole)
-    ur = top_item.data(0, Qt.UserRole)
+    # From the mod's root path
+    ur = top_path
     if isinstance(ur, str) and ur:
         p = Path(ur)
         try:
@@ -114,24 +172,20 @@ def _candidate_roots(mods_dir: Path, display_name: str, top_item: QTreeWidgetIte
             if rp != mods_dir and rp.is_dir():
                 cand.append(rp)
 
-    # From meta.ini by normalized key match
-    reg = _load_mod_registry()
-    for key, meta in reg.items():
-        if key == "_meta":
-            continue
-        if _normalize_mod_name(_normalize_key(key)) == wanted:
-            src = meta.get("source_path", "")
-            if src:
-                ps = Path(src)
-                try:
-                    rps = ps.resolve()
-                except Exception:
-                    rps = ps
-                if mods_dir in rps.parents or rps == mods_dir:
-                    if rps.is_dir() and rps.parent != mods_dir:
-                        cand.append(rps.parent)
-                    if rps.is_dir():
-                        cand.append(rps)
+    # From the registry by normalized name (indexed lookup)
+    for key, meta in _mod_registry().find_by_name(wanted).items():
+        src = meta.get("source_path", "")
+        if src:
+            ps = Path(src)
+            try:
+                rps = ps.resolve()
+            except Exception:
+                rps = ps
+            if mods_dir in rps.parents or rps == mods_dir:
+                if rps.is_dir() and rps.parent != mods_dir:
+                    cand.append(rps.parent)
+                if rps.is_dir():
+                    cand.append(rps)
 
     # Scan mods/ for directories
     for d in mods_dir.iterdir():
@@ -167,7 +221,8 @@ def _compute_crc32(data: bytes) -> int:
 def _compute_sha1(data: bytes) -> str:
     return hashlib.sha1(data).hexdigest()
 
-def _validate_original_file(file_path: Path) -> tuple[bool, str]:
+def _validate_original_file(file_path: Path, progress=None, cancelled=None) -> tuple[bool, str]:
+    """Hash in chunks; `progress(done, total)` is called per chunk, `cancelled()` stops early."""
     name = file_path.name
     if name not in KNOWN_HASHES:
         return True, ""  # skip unknown files
@@ -176,9 +231,20 @@ def _validate_original_file(file_path: Path) -> tuple[bool, str]:
     expected_sha1 = KNOWN_HASHES[name]["sha1"]
 
     try:
-        data = file_path.read_bytes()
-        actual_crc = _compute_crc32(data)
-        actual_sha1 = _compute_sha1(data)
+        total = file_path.stat().st_size
+        done = crc = 0
+        sha1 = hashlib.sha1()
+        with open(file_path, "rb") as f:
+            while chunk := f.read(HASH_CHUNK):
+                if cancelled and cancelled():
+                    return False, f"Validation of {name} cancelled."
+                crc = zlib.crc32(chunk, crc)
+                sha1.update(chunk)
+                done += len(chunk)
+                if progress:
+                    progress(done, total)
+        actual_crc = crc & 0xffffffff
+        actual_sha1 = sha1.hexdigest()
 
         crc_match = actual_crc == expected_crc
         sha1_match = actual_sha1.lower() == expected_sha1.lower()
@@ -198,13 +264,90 @@ def _validate_original_file(file_path: Path) -> tuple[bool, str]:
         return False, f"[!] Error reading {name}: {e}"
 
 
+def _copy_file_chunked(src: Path, dst: Path, progress=None, cancelled=None) -> bool:
+    """Copy via dst.partial and swap it in, so an interrupted copy never looks like a backup."""
+    partial = dst.with_name(dst.name + ".partial")
+    total = src.stat().st_size
+    done = 0
+    try:
+        with open(src, "rb") as fin, open(partial, "wb") as fout:
+            while chunk := fin.read(HASH_CHUNK):
+                if cancelled and cancelled():
+                    return False
+                fout.write(chunk)
+                done += len(chunk)
+                if progress:
+                    progress(done, total)
+        shutil.copystat(src, partial)
+        os.replace(partial, dst)
+        return True
+    finally:
+        if partial.exists():
+            try:
+                partial.unlink()
+            except OSError:
+                pass
+
+
+def _fmt_size(n: float) -> str:
+    for unit in ("B", "KB", "MB", "GB"):
+        if n < 1024 or unit == "GB":
+            return f"{n:.0f} {unit}" if unit == "B" else f"{n:.1f} {unit}"
+        n /= 1024
+
+
+def _build_pack_plan(candidates) -> dict:
+    """
+    Resolve every staged file name to exactly one source. `candidates` are
+    (label, src, name, size) in load order, lowest precedence first: a later
+    candidate for the same name wins and the earlier ones become its losers.
+    """
+    targets = {}
+    for label, src, name, size in candidates:
+        key = os.path.normcase(name)  # pack/ is case-insensitive on Windows
+        target = targets.get(key)
+        if target is None:
+            targets[key] = {"name": name, "winner": (label, src, size), "losers": []}
+        else:
+            target["losers"].append(target["winner"])
+            target["name"] = name
+            target["winner"] = (label, src, size)
+    ordered = sorted(targets.values(), key=lambda t: t["name"].lower())
+    return {
+        "targets": ordered,
+        "files": len(ordered),
+        "bytes": sum(t["winner"][2] for t in ordered),
+        "overridden": sum(len(t["losers"]) for t in ordered),
+        "overridden_bytes": sum(size for t in ordered for _, _, size in t["losers"]),
+    }
+
+
+def _plan_summary(plan: dict) -> str:
+    text = f"{plan['files']} files to stage ({_fmt_size(plan['bytes'])})."
+    if plan["overridden"]:
+        text += (f"\n{plan['overridden']} overridden cop{'y' if plan['overridden'] == 1 else 'ies'} "
+                 f"skipped ({_fmt_size(plan['overridden_bytes'])}).")
+    return text
+
+
+def _plan_report(plan: dict) -> list[str]:
+    """Dry-run lines: each target with its winner, then what it overrides (lower in the list wins)."""
+    lines = []
+    for t in plan["targets"]:
+        label, _, size = t["winner"]
+        lines.append(f"{t['name']}  ({_fmt_size(size)})  ← {label}")
+        for loser, _, lsize in reversed(t["losers"]):
+            lines.append(f"    overrides {loser} ({_fmt_size(lsize)})")
+    return lines
+
+
 def _write_json_atomic(path: Path, data: dict):
-    # tmp = Path(tempfile.mkstemp(prefix="modmeta_", suffix=".json")[1])
-    tmp = Path.cwd() / "modmeta_.json"
+    # Unique temp file next to the target, so concurrent writers never share one
+    fd, tmp = tempfile.mkstemp(prefix=f"{path.name}.", suffix=".tmp", dir=str(path.parent))
+    tmp = Path(tmp)
     try:
-        if FEAT_REGISTRY_META:
-            with open(tmp, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
         os.replace(tmp, path)  # atomic on the same filesystem
     finally:
         try:
@@ -214,33 +357,102 @@ def _write_json_atomic(path: Path, data: dict):
             pass
 
 
+def _first_image(folder) -> Path | None:
+    # Single listing: a keyword match wins, else the first image seen
+    keywords = ['preview', 'variation', 'screenshot', 'image']
+    fallback = None
+    try:
+        with os.scandir(folder) as it:
+            for e in it:
+                stem, suffix = os.path.splitext(e.name)
+                if suffix.lower() not in img_ext:
+                    continue
+                if any(k in stem.lower() for k in keywords):
+                    return Path(e.path)
+                if fallback is None:
+                    fallback = Path(e.path)
+    except OSError:
+        return None
+    return fallback
+
 def _find_mod_images(folder: Path) -> Path | None:
     if not folder.is_dir():
         return None
+    return _first_image(folder)
 
-    # Prioritize known keywords
-    keywords = ['preview', 'variation', 'screenshot', 'image']
-    for f in folder.iterdir():
-        if f.suffix.lower() in img_ext and any(k in f.stem.lower() for k in keywords):
-            return f
-
-    # Fallback to any image
-    for f in folder.iterdir():
-        if f.suffix.lower() in img_ext:
-            return f
+def _list_variant_dirs(folder: Path) -> list[Path]:
+    """Sub-folders holding a preview image, sorted by name."""
+    found = []
+    try:
+        with os.scandir(folder) as it:
+            for e in it:
+                if e.is_dir() and _first_image(e.path) is not None:
+                    found.append(Path(e.path))
+    except OSError:
+        return []
+    found.sort(key=lambda d: d.name.lower())
+    return found
 
-    return None
+def _has_subdirs(folder: Path, skip=()) -> bool:
+    """Cheap "may have variants" hint: any sub-folder at all, images not checked."""
+    try:
+        with os.scandir(folder) as it:
+            return any(e.name not in skip and e.is_dir() for e in it)
+    except OSError:
+        return False
+
+def _load_pix(path: Path, box: tuple[int, int] | None = None, cover: bool = False) -> QPixmap:
+    return QPixmap.fromImage(_decode_image(path, box, cover))
+
+def _display_size(size: tuple[int, int], box: tuple[int, int] | None, cover: bool) -> tuple[int, int]:
+    """Smallest size that still fills `box` (fit inside, or cover it); never larger than the source."""
+    w, h = size
+    if not box or w <= 0 or h <= 0:
+        return w, h
+    ratio = (max if cover else min)(box[0] / w, box[1] / h)
+    if ratio >= 1:
+        return w, h
+    return max(1, round(w * ratio)), max(1, round(h * ratio))
+
+def _decode_image(path: Path, box: tuple[int, int] | None = None, cover: bool = False) -> QImage:
+    """
+    Decode on any thread, at (or near) the size it will be shown at. Downscaled results
+    are kept in thumb_cache/, so a preview is only decoded at full size once.
+    With Pillow, pixels go straight into the QImage, so the ICC profile never reaches Qt.
+    """
+    tag = f"{box[0]}x{box[1]}{'c' if cover else ''}" if box else None
+    if tag:
+        cached = _THUMBS.lookup(path, tag)
+        if cached is not None:
+            image = QImage(str(cached))
+            if not image.isNull():
+                return image
 
-def _load_pix(path: Path) -> QPixmap:
     if FEAT_PILLOW_ICC:
         from PIL import Image
         with Image.open(path) as img:
-            if "icc_profile" in img.info:
-                del img.info["icc_profile"]
-            with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as tmp:
-                img.save(tmp.name, format="PNG")
-                return QPixmap(tmp.name)
-    return QPixmap(str(path))
+            target = _display_size(img.size, box, cover)
+            scaled = target != img.size
+            if scaled:
+                img.draft("RGB", target)  # JPEG: decode at 1/2, 1/4 or 1/8 scale
+            img = img.convert("RGBA")
+            if img.size != target:
+                img = img.resize(target, Image.LANCZOS, reducing_gap=3.0)
+            data = img.tobytes("raw", "RGBA")
+        image = QImage(data, img.width, img.height, img.width * 4, QImage.Format_RGBA8888).copy()
+    else:
+        reader = QImageReader(str(path))
+        reader.setAutoTransform(True)
+        src = reader.size()
+        target = _display_size((src.width(), src.height()), box, cover)
+        scaled = src.isValid() and target != (src.width(), src.height())
+        if scaled:
+            reader.setScaledSize(QSize(*target))
+        image = reader.read()
+
+    if tag and scaled and not image.isNull():
+        _THUMBS.store(path, tag, lambda tmp: image.save(tmp, "PNG"))
+    return image
 
 
 def _safe_json_load(path: Path) -> dict:
@@ -266,6 +478,12 @@ def _file_mtime(path: Path) -> int:
     except Exception:
         return 0
 
+def _file_size(path: Path) -> int:
+    try:
+        return path.stat().st_size
+    except Exception:
+        return 0
+
 def _diff_fields(old: dict, new: dict, keys: list[str]) -> dict:
     diffs = {}
     for k in keys:
@@ -283,30 +501,785 @@ def _short(val, n=80):
     return (s[:n] + "…") if len(s) > n else s
 
 
+class PackStatus(NamedTuple):
+    """One progress report from the packing worker."""
+    stage: str
+    files_done: int = 0
+    files_total: int = 0
+    bytes_done: int = 0
+    bytes_total: int = 0
+
+
 class PackingWorker(QObject):
-    finished = pyqtSignal(bool, str)  # success, message
-    def __init__(self, manager: 'ModManager'):
-        super().__init__()
+    """
+    Runs ModManager.pack_mods_worker() as a scheduler job. The worker never touches
+    widgets: progress goes out as PackStatus (at most once per frame, plus every
+    stage change) and messages as notice(level, title, text). Every report is also
+    a cancellation point.
+    """
+    progress = pyqtSignal(object)         # PackStatus
+    notice = pyqtSignal(str, str, str)    # level, title, text
+
+    def __init__(self, manager: 'ModManager', spec: dict):
+        super().__init__(manager)
         self.manager = manager
+        self.spec = spec
+        self.job = None
+        self._status = PackStatus("")
+        self._last_emit = 0.0
+
+    def stage(self, name: str, files_total: int = 0, bytes_total: int = 0):
+        self.job.check()
+        self._status = PackStatus(name, 0, files_total, 0, bytes_total)
+        self._emit(force=True)
+
+    def advance(self, files: int = 0, nbytes: int = 0):
+        self.job.check()
+        st = self._status
+        self._status = st._replace(files_done=st.files_done + files, bytes_done=st.bytes_done + nbytes)
+        self._emit()
+
+    def _emit(self, force: bool = False):
+        now = time.monotonic()
+        if force or now - self._last_emit >= 1.0 / PROGRESS_FPS:
+            self._last_emit = now
+            self.progress.emit(self._status)
+
+    def run(self, job) -> tuple[bool, str]:
+        self.job = job
+        return self.manager.pack_mods_worker(self.spec, self)
+
+
+class BackupJob(QObject):
+    """Validates the original core files and creates backup/ and .org copies; run() is a scheduler job."""
+    progress = pyqtSignal(str, int, int)  # stage, bytes done, bytes total
+    notice = pyqtSignal(str, str, str)    # level, title, text
+    done = pyqtSignal(bool)               # every present core file has a backup
+
+    def __init__(self, manager: 'ModManager', pkg: Path, backup_dir: Path):
+        super().__init__(manager)
+        self.pkg = pkg
+        self.backup_dir = backup_dir
+        self.job = None
+
+    def _reporter(self, stage: str):
+        return lambda done, total: self.progress.emit(stage, done, total)
+
+    def run(self, job):
+        ok = True
+        for f in CORE_FILES:
+            orig = self.pkg / f
+            if not orig.exists():
+                continue
 
-    def run(self):
+            valid, detail = _validate_original_file(orig, self._reporter(f"Verifying {f}"), job.cancelled)
+            if job.cancelled():
+                break
+            if not valid:
+                if FEAT_STRICT_HASH:
+                    self.notice.emit(
+                        "critical",
+                        f"Hash Mismatch - {f}",
+                        f"The original file does not match known-good hashes."
+                        f"\n\n{detail}\n\n"
+                        f"Backup skipped for safety.\n\nDelete this file:\n{orig}\n\nThen verify your game files with steam."
+                    )
+                    ok &= (self.backup_dir / f).exists()
+                    continue
+                print(f"[!] Warning: {detail} CRC mismatch (skipping strict validation)")
+
+            try:
+                for dst, stage in ((self.backup_dir / f, f"Backing up {f}"), (self.pkg / f"{f}.org", f"Copying {f}.org")):
+                    if not dst.exists():
+                        _copy_file_chunked(orig, dst, self._reporter(stage), job.cancelled)
+            except Exception as e:
+                self.notice.emit("warning", "Backup Failed", f"Could not back up {f}:\n{e}")
+            ok &= (self.backup_dir / f).exists()
+
+        self.done.emit(ok and not job.cancelled())
+
+
+class PreviewCache:
+    """LRU of decoded QImages keyed by (normalized path, mtime_ns, box), bounded by total bytes."""
+
+    def __init__(self, budget_bytes: int):
+        self.budget = budget_bytes
+        self.used = 0
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key_for(path, box=None, cover=False) -> tuple | None:
         try:
-            success, message = self.manager.pack_mods_worker()
-            self.finished.emit(success, message)
+            return (_normpath(str(path)), os.stat(path).st_mtime_ns, box, cover)
+        except OSError:
+            return None
+
+    def get(self, key) -> QImage | None:
+        with self._lock:
+            image = self._items.get(key)
+            if image is not None:
+                self._items.move_to_end(key)
+            return image
+
+    def put(self, key, image: QImage):
+        cost = image.sizeInBytes()
+        if cost > self.budget:
+            return
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self.used -= old.sizeInBytes()
+            self._items[key] = image
+            self.used += cost
+            while self.used > self.budget:
+                _, dropped = self._items.popitem(last=False)
+                self.used -= dropped.sizeInBytes()
+
+
+class PreviewLoader(QObject):
+    """
+    Decodes previews as interactive-priority jobs on `jobs` (or, without a
+    scheduler, on a small pool of its own). Each caller "slot" (e.g. the mod list
+    preview) has one live request: a newer request cancels the queued one, and a
+    result that arrives after being superseded is dropped instead of emitted.
+    """
+    ready = pyqtSignal(str, object)        # slot, QImage (null if nothing to show)
+    _decoded = pyqtSignal(str, int, object)
+
+    def __init__(self, parent=None, budget_mb: int = PREVIEW_CACHE_MB, workers: int = 2,
+                 jobs: JobScheduler | None = None):
+        super().__init__(parent)
+        self.cache = PreviewCache(budget_mb * 1024 * 1024)
+        self._jobs = jobs
+        self._pool = None if jobs else ThreadPoolExecutor(max_workers=workers, thread_name_prefix="preview")
+        self._tickets = {}  # slot -> latest ticket
+        self._futures = {}  # slot -> queued/running job or future
+        self._images = {}   # folder -> image found in it (memo of _find_mod_images)
+        self._next = 0
+        self._decoded.connect(self._on_decoded)  # queued: emitted from pool threads
+        # keep thumb_cache/ within its budget
+        if jobs:
+            jobs.submit("Pruning thumbnail cache", lambda job: _THUMBS.prune(), PRIORITY_HOUSEKEEPING, ("thumb_cache",))
+        else:
+            self._pool.submit(_THUMBS.prune)
+
+    def request(self, slot: str, path: Path, box: tuple[int, int] | None = None, cover: bool = False) -> QImage | None:
+        """
+        Preview of `path` (an image, or a folder to search), decoded for display in `box`.
+        Returns the image at once on a cache hit; otherwise None, and `ready` fires once
+        it is decoded.
+        """
+        self._next += 1
+        ticket = self._tickets[slot] = self._next
+        previous = self._futures.pop(slot, None)
+        if previous is not None:
+            previous.cancel()
+
+        hit = self._cached(path, box, cover)
+        if hit is not None:
+            return hit
+        args = (slot, ticket, Path(path), box, cover)
+        if self._jobs is not None:
+            self._futures[slot] = self._jobs.submit("Preview", lambda job: self._work(*args), PRIORITY_INTERACTIVE, hidden=True)
+        else:
+            self._futures[slot] = self._pool.submit(self._work, *args)
+        return None
+
+    def warm(self, path: Path, box: tuple[int, int] | None = None, cover: bool = False):
+        """Decode into the cache as a housekeeping job; nothing is emitted. None if already cached."""
+        if self._cached(path, box, cover) is not None:
+            return None
+        if self._jobs is not None:
+            return self._jobs.submit("Warm preview", lambda job: self._warm(path, box, cover, job),
+                                     PRIORITY_HOUSEKEEPING, hidden=True)
+        return self._pool.submit(self._warm, path, box, cover)
+
+    def cancel(self, slot: str):
+        self._tickets.pop(slot, None)
+        future = self._futures.pop(slot, None)
+        if future is not None:
+            future.cancel()
+
+    def shutdown(self):
+        self._tickets.clear()
+        for future in self._futures.values():
+            future.cancel()
+        self._futures.clear()
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)  # cancel_futures needs Python 3.9
+
+    def _current(self, slot: str, ticket: int) -> bool:
+        return self._tickets.get(slot) == ticket
+
+    def _cached(self, path: Path, box, cover: bool) -> QImage | None:
+        image_path = self._images.get(_normpath(str(path)))
+        if image_path is None and not path.is_dir():
+            image_path = path
+        key = PreviewCache.key_for(image_path, box, cover) if image_path is not None else None
+        return self.cache.get(key) if key else None
+
+    def _load(self, path: Path, box, cover: bool, wanted) -> QImage:
+        # Pool thread: no widget access. `wanted()` is asked once more before decoding.
+        image_path = path
+        if not path.is_file():
+            image_path = _find_mod_images(path)
+            if image_path is None:
+                return QImage()
+            self._images[_normpath(str(path))] = image_path
+        key = PreviewCache.key_for(image_path, box, cover)
+        cached = self.cache.get(key) if key else None
+        if cached is not None:
+            return cached
+        if not wanted():
+            return QImage()
+        image = _decode_image(image_path, box, cover)
+        if key and not image.isNull():
+            self.cache.put(key, image)
+        return image
+
+    def _work(self, slot: str, ticket: int, path: Path, box, cover: bool):
+        if not self._current(slot, ticket):
+            return
+        image = QImage()
+        try:
+            image = self._load(path, box, cover, lambda: self._current(slot, ticket))
         except Exception as e:
-            self.finished.emit(False, f"Packing failed:\n{e}")
+            print(f"[Preview] Could not load {path}: {e}")
+        self._decoded.emit(slot, ticket, image)
+
+    def _warm(self, path: Path, box, cover: bool, job=None):
+        try:
+            self._load(path, box, cover, lambda: job is None or not job.cancelled())
+        except Exception as e:
+            print(f"[Preview] Could not warm {path}: {e}")
+
+    def _on_decoded(self, slot: str, ticket: int, image: QImage):
+        if self._tickets.get(slot) != ticket:
+            return  # superseded while decoding
+        self._tickets.pop(slot, None)
+        self._futures.pop(slot, None)
+        self.ready.emit(slot, image)
+
+
+class IdleWarmer(QObject):
+    """
+    Pays the cold-cache costs of a mod (variant listing, preview decode) before the
+    user selects, expands or packs it. Runs while the app is idle, one mod at a time
+    in view order starting at the top visible row. Any key or mouse input cancels
+    the unit in flight and restarts the quiet period; after each unit the warmer
+    rests long enough to stay within `budget_pct` of wall time.
+    """
+    _INPUT = frozenset((QEvent.KeyPress, QEvent.MouseButtonPress, QEvent.MouseMove, QEvent.Wheel))
+
+    def __init__(self, manager: 'ModManager', budget_pct: int = IDLE_BUDGET_PCT):
+        super().__init__(manager)
+        self.manager = manager
+        self.budget_pct = budget_pct
+        self._warm = set()       # norms of mods done since the last reset
+        self._queue = []         # mods still to visit, in view order
+        self._top = None         # first visible mod when the queue was built
+        self._unit = None        # (mod, [(job, apply)]) in flight
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._tick)
+        QApplication.instance().installEventFilter(self)
+
+    def set_budget(self, pct: int):
+        self.budget_pct = pct
+        self.kick()
+
+    def reset(self):
+        """Mods changed (rescan, snapshot): visit everything again; cached results make it cheap."""
+        self._warm.clear()
+        self._queue = []
+        self.kick()
+
+    def kick(self, delay: int = IDLE_DELAY_MS):
+        if self.budget_pct > 0:
+            self._timer.start(delay)
+        else:
+            self._timer.stop()
+
+    def stop(self):
+        QApplication.instance().removeEventFilter(self)
+        self._timer.stop()
+        self._cancel_unit()
+
+    def eventFilter(self, obj, event):
+        if event.type() in self._INPUT and (self._unit is not None or self._timer.isActive()):
+            self._cancel_unit()
+            self.kick()
+        return False
+
+    def _cancel_unit(self):
+        if self._unit is not None:
+            for job, _ in self._unit[1]:
+                job.cancel()
+
+    def _tick(self):
+        if self._unit is not None:
+            mod, jobs = self._unit
+            if not all(job.done() for job, _ in jobs):
+                self._timer.start(IDLE_POLL_MS)
+                return
+            self._unit = None
+            busy = 0.0
+            for job, apply in jobs:
+                busy += job.elapsed()
+                if job.state == DONE and apply is not None:
+                    apply(job.result)
+                elif job.state == CANCELLED:
+                    self._warm.discard(mod.norm)  # interrupted; visit again
+            # Rest in proportion to the work just done
+            rest = busy * (100 / max(1, self.budget_pct) - 1)
+            self._timer.start(max(IDLE_POLL_MS, int(rest * 1000)))
+            return
+
+        for _ in range(IDLE_BATCH):
+            mod = self._next_mod()
+            if mod is None:
+                return  # everything is warm; reset() starts over after the next scan
+            self._warm.add(mod.norm)
+            jobs = self.manager._warm_units(mod)
+            if jobs:
+                self._unit = (mod, jobs)
+                break
+        self._timer.start(IDLE_POLL_MS)
+
+    def _next_mod(self):
+        mgr = self.manager
+        view = mgr.mod_list
+        top = mgr._node_at(view.indexAt(QPoint(0, 0)))
+        top = top.top if top is not None else None
+        if not self._queue or top is not self._top:
+            # Rebuilt when the view scrolls: visible rows first, then the ones below, then above
+            self._top = top
+            model = view.model()
+            mods = [mgr._node_at(model.index(row, 0)) for row in range(model.rowCount())]
+            start = next((i for i, m in enumerate(mods) if m is top), 0)
+            self._queue = [m for m in mods[start:] + mods[:start] if m is not None and m.norm not in self._warm]
+            self._queue.reverse()  # popped from the end
+        while self._queue:
+            mod = self._queue.pop()
+            if mod.norm not in self._warm:
+                return mod
+        return None
+
+
+class ModNode:
+    """
+    One row of the mod list: a mod ("mod") or one of its "variant"/"shared" children.
+    Plain slots only; labels, check boxes and colors are derived by ModListModel.
+    """
+    __slots__ = ("kind", "name", "path", "norm", "key", "priority", "tooltip", "parent", "children", "checked", "color",
+                 "pending")
+
+    def __init__(self, kind: str, name: str, path: str | None, parent: 'ModNode | None' = None):
+        self.kind = kind
+        self.name = name
+        self.path = path
+        self.norm = _normpath(str(path)) if path else None  # normalized once, used for lookups
+        self.key = None
+        self.priority = 5
+        self.tooltip = ""
+        self.parent = parent
+        self.children = []
+        self.checked = False  # mods without variants, and variants (one per mod)
+        self.color = None     # foreground highlight
+        self.pending = False  # variants not listed yet (see ModListModel.fetchMore)
+
+    @classmethod
+    def from_record(cls, record: dict) -> 'ModNode':
+        node = cls("mod", record["name"], record["root"])
+        node.key = record["key"]
+        if FEAT_ORDER_UI:
+            node.priority = record.get("priority", 5)
+        if FEAT_REGISTRY_META:
+            node.tooltip = record.get("tooltip", "")
+        # shared_files child (always included with its mod)
+        if record.get("shared"):
+            node.children.append(cls("shared", "shared_files", record["shared"], node))
+        variants = record.get("variants")
+        if variants is None:
+            node.pending = bool(record.get("has_children"))
+        for var_name, var_path in variants or ():
+            node.children.append(cls("variant", var_name, var_path, node))
+        return node
+
+    def add_variants(self, rows) -> list['ModNode']:
+        self.pending = False
+        added = [ModNode("variant", var_name, var_path, self) for var_name, var_path in rows]
+        self.children.extend(added)
+        return added
+
+    @property
+    def top(self) -> 'ModNode':
+        return self.parent or self
+
+    def variants(self) -> list['ModNode']:
+        return [c for c in self.children if c.kind == "variant"]
+
+    def chosen_variant(self) -> 'ModNode | None':
+        return next((c for c in self.children if c.kind == "variant" and c.checked), None)
+
+    def is_active(self) -> bool:
+        """Mods: ticked themselves or through a variant. Children: their own tick (shared follows the mod)."""
+        if self.kind == "shared":
+            return self.parent.is_active()
+        if self.kind == "variant":
+            return self.checked
+        return self.checked or self.chosen_variant() is not None
+
+    def checked_paths(self) -> list[str]:
+        """Normalized paths that bring this mod's selection back via ModListModel.restore_checks()."""
+        variant = self.chosen_variant()
+        if variant is not None and variant.norm:
+            return [variant.norm]
+        if self.checked and self.norm:
+            return [self.norm]
+        return []
 
 
-class DropTreeWidget(QTreeWidget):
+class ModListModel(QAbstractItemModel):
+    """
+    Two-level model over ModNode records. Ticking a mod activates it (its first
+    variant if it has any); ticking a variant unticks its siblings. Bulk changes
+    are applied to the records first and announced with one dataChanged per parent.
+    """
+
+    # Views ask for flags on every relayout; precomputed per kind
+    _FLAGS = {
+        "mod": Qt.ItemIsEnabled | Qt.ItemIsSelectable | Qt.ItemIsUserCheckable,
+        "variant": Qt.ItemIsEnabled | Qt.ItemIsSelectable | Qt.ItemIsUserCheckable | Qt.ItemNeverHasChildren,
+        "shared": Qt.ItemIsEnabled | Qt.ItemIsSelectable | Qt.ItemNeverHasChildren,
+    }
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.mods: list[ModNode] = []
+        self._rows: dict[int, int] = {}     # id(mod) -> row
+        self._by_path: dict[str, int] = {}  # normalized mod path -> row
+        self.fetcher = None                 # mod -> [[name, path], ...] for pending variants
+
+    # Qt model API
+    # --------------------------------------------------------------------------
+    def index(self, row, column=0, parent=QModelIndex()):
+        node = parent.internalPointer() if parent.isValid() else None
+        rows = node.children if node is not None else self.mods
+        if column != 0 or not 0 <= row < len(rows):
+            return QModelIndex()
+        return self.createIndex(row, 0, rows[row])
+
+    def parent(self, index):
+        if not index.isValid():
+            return QModelIndex()
+        node = index.internalPointer()
+        if node.parent is None:
+            return QModelIndex()
+        return self.createIndex(self._rows[id(node.parent)], 0, node.parent)
+
+    def rowCount(self, parent=QModelIndex()):
+        if not parent.isValid():
+            return len(self.mods)
+        return len(parent.internalPointer().children)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 1
+
+    def hasChildren(self, parent=QModelIndex()):
+        if parent.isValid() and parent.internalPointer().pending:
+            return True
+        return self.rowCount(parent) > 0
+
+    def canFetchMore(self, parent):
+        return parent.isValid() and parent.internalPointer().pending
+
+    def fetchMore(self, parent):
+        if parent.isValid():
+            self.populate([parent.internalPointer()])
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        return self._FLAGS[index.internalPointer().kind]
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        node = index.internalPointer()
+        if role == Qt.DisplayRole:
+            if node.kind == "mod":
+                # Order label is derived from the row; nothing to rewrite on moves
+                return f"{self._rows[id(node)] + 1:02d}. [{node.priority}] {node.name}"
+            return node.name
+        if role == Qt.CheckStateRole:
+            return Qt.Checked if node.is_active() else Qt.Unchecked
+        if role == Qt.ToolTipRole:
+            return node.tooltip or None
+        if role == Qt.ForegroundRole:
+            return QBrush(node.color) if node.color is not None else None
+        if role == Qt.UserRole:
+            return node.path
+        if node.kind == "mod":
+            if role == Qt.UserRole + 1:
+                return node.name
+            if role == Qt.UserRole + 2:
+                return node.priority
+            if role == Qt.UserRole + 3:
+                return node.key
+        return None
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if role != Qt.CheckStateRole or not index.isValid():
+            return False
+        node = index.internalPointer()
+        on = int(value) == Qt.Checked
+        if node.kind == "mod":
+            self._set_mod_active(node, on)
+        elif node.kind == "variant":
+            self._set_variant(node, on)
+        else:
+            return False
+        self._emit_changed([node.top], [Qt.CheckStateRole])
+        return True
+
+    # Records
+    # --------------------------------------------------------------------------
+    def node(self, index: QModelIndex) -> ModNode | None:
+        return index.internalPointer() if index.isValid() else None
+
+    def index_of(self, node: ModNode) -> QModelIndex:
+        if node.parent is None:
+            row = self._rows.get(id(node))
+            return self.createIndex(row, 0, node) if row is not None else QModelIndex()
+        return self.createIndex(node.parent.children.index(node), 0, node)
+
+    def row_of_path(self, norm_path: str) -> int | None:
+        """Row of the mod whose normalized path is `norm_path` (see ModNode.norm)."""
+        return self._by_path.get(norm_path)
+
+    def _reindex(self):
+        self._rows = {id(m): i for i, m in enumerate(self.mods)}
+        by_path = {}
+        for i, m in enumerate(self.mods):
+            if m.norm is not None:
+                by_path.setdefault(m.norm, i)
+        self._by_path = by_path
+
+    def set_mods(self, mods: list[ModNode]):
+        self.beginResetModel()
+        self.mods = list(mods)
+        self._reindex()
+        self.endResetModel()
+
+    def insert_mods(self, row: int, mods: list[ModNode]):
+        if not mods:
+            return
+        row = max(0, min(row, len(self.mods)))
+        self.beginInsertRows(QModelIndex(), row, row + len(mods) - 1)
+        self.mods[row:row] = mods
+        self._reindex()
+        self.endInsertRows()
+
+    def remove_mods(self, mods):
+        rows = sorted((self._rows[id(m)] for m in mods if id(m) in self._rows), reverse=True)
+        # Contiguous runs go in one removal each, last run first so rows stay valid
+        while rows:
+            last = first = rows.pop(0)
+            while rows and rows[0] == first - 1:
+                first = rows.pop(0)
+            self.beginRemoveRows(QModelIndex(), first, last)
+            del self.mods[first:last + 1]
+            self._reindex()
+            self.endRemoveRows()
+
+    def remove_child(self, node: ModNode):
+        mod = node.parent
+        row = mod.children.index(node)
+        self.beginRemoveRows(self.index_of(mod), row, row)
+        del mod.children[row]
+        self.endRemoveRows()
+        self._emit_changed([mod], [Qt.CheckStateRole])
+
+    def populate(self, mods):
+        """
+        List the variants of pending mods. A mod ticked before its variants were
+        known hands its tick to the first variant, as if it had been ticked now.
+        """
+        touched = []
+        for mod in mods:
+            if not mod.pending:
+                continue
+            rows = self.fetcher(mod) if self.fetcher is not None else []
+            if not rows:
+                mod.pending = False
+                touched.append(mod)  # drops the expand arrow
+                continue
+            first = len(mod.children)
+            self.beginInsertRows(self.index_of(mod), first, first + len(rows) - 1)
+            added = mod.add_variants(rows)
+            self.endInsertRows()
+            if mod.checked:
+                mod.checked = False
+                added[0].checked = True
+            touched.append(mod)
+        self._emit_changed(touched, [Qt.CheckStateRole])
+
+    # Ordering
+    # --------------------------------------------------------------------------
+    def reorder(self, ordered: list[ModNode]) -> bool:
+        """
+        Apply a permutation of the mods in place: one layoutChanged, with persistent
+        indexes (current row, selection, expanded mods) moved to the new rows.
+        `ordered` must hold exactly the current mods.
+        """
+        if len(ordered) != len(self.mods) or all(a is b for a, b in zip(ordered, self.mods)):
+            return False
+        self.layoutAboutToBeChanged.emit([], QAbstractItemModel.VerticalSortHint)
+        self.mods = list(ordered)
+        self._reindex()
+        # Child indexes keep their row under the moved parent; only mods need remapping
+        old = [ix for ix in self.persistentIndexList() if ix.internalPointer().parent is None]
+        new = [self.createIndex(self._rows[id(ix.internalPointer())], 0, ix.internalPointer()) for ix in old]
+        self.changePersistentIndexList(old, new)
+        self.layoutChanged.emit([], QAbstractItemModel.VerticalSortHint)
+        return True
+
+    def sort_by_priority(self) -> bool:
+        # Stable; 0 = highest priority ends up last, as before
+        return self.reorder(sorted(self.mods, key=lambda m: m.priority if m.priority is not None else 5, reverse=True))
+
+    def order_by_paths(self, saved_paths) -> bool:
+        """Saved order first (paths as stored), then every mod the list did not mention, in current order."""
+        ordered, placed = [], set()
+        for p in saved_paths:
+            norm = _normpath(p)
+            row = self._by_path.get(norm)
+            if row is None:
+                # Older lists saved single-variant folder mods by their variant path
+                row = self._by_path.get(os.path.dirname(norm))
+            if row is not None and row not in placed:
+                placed.add(row)
+                ordered.append(self.mods[row])
+        ordered.extend(m for i, m in enumerate(self.mods) if i not in placed)
+        return self.reorder(ordered)
+
+    def move_rows(self, rows, step: int) -> bool:
+        """Shift the mods at `rows` by one place up (-1) or down (+1); blocks move together."""
+        rows = set(rows)
+        mods = list(self.mods)
+        indices = range(len(mods)) if step < 0 else range(len(mods) - 1, -1, -1)
+        for i in indices:
+            j = i + step
+            if i in rows and 0 <= j < len(mods) and j not in rows:
+                mods[i], mods[j] = mods[j], mods[i]
+                rows.discard(i)
+                rows.add(j)
+        return self.reorder(mods)
+
+    # Check state (batched)
+    # --------------------------------------------------------------------------
+    @staticmethod
+    def _set_mod_active(mod: ModNode, on: bool):
+        variants = mod.variants()
+        if on:
+            if not variants:
+                mod.checked = True
+            elif mod.chosen_variant() is None:
+                variants[0].checked = True
+        else:
+            mod.checked = False
+            for v in variants:
+                v.checked = False
+
+    @staticmethod
+    def _set_variant(variant: ModNode, on: bool):
+        if on:
+            for sibling in variant.parent.variants():
+                sibling.checked = sibling is variant
+        else:
+            variant.checked = False
+
+    def _emit_changed(self, mods, roles):
+        """
+        One dataChanged for the span of touched mods. Children are announced only
+        for single-mod edits; a multi-row dataChanged already repaints the whole view.
+        """
+        rows = [self._rows[id(m)] for m in mods if id(m) in self._rows]
+        if not rows:
+            return
+        self.dataChanged.emit(self.index(min(rows)), self.index(max(rows)), roles)
+        if len(rows) == 1 and self.mods[rows[0]].children:
+            parent = self.index(rows[0])
+            last = len(self.mods[rows[0]].children) - 1
+            self.dataChanged.emit(self.index(0, 0, parent), self.index(last, 0, parent), roles)
+
+    def set_all_active(self, on: bool):
+        for mod in self.mods:
+            self._set_mod_active(mod, on)
+        self._emit_changed(self.mods, [Qt.CheckStateRole])
+
+    def restore_checks(self, paths: set, mods=None):
+        """Tick whatever in `mods` (default: all) matches a normalized path in `paths`."""
+        mods = self.mods if mods is None else mods
+        # A saved variant of a mod whose variants aren't listed yet: list them now
+        parents = {os.path.dirname(p) for p in paths}
+        self.populate([m for m in mods if m.pending and m.norm in parents and m.norm not in paths])
+        touched = []
+        for mod in mods:
+            variants = mod.variants()
+            hit = next((v for v in variants if v.norm in paths), None)
+            if hit is not None:
+                self._set_variant(hit, True)
+            elif mod.norm in paths:
+                self._set_mod_active(mod, True)
+            else:
+                continue
+            touched.append(mod)
+        self._emit_changed(touched, [Qt.CheckStateRole])
+
+    def set_colors(self, colors: dict):
+        """Set foreground colors for {node: QColor | None}, repainting each run of touched rows once."""
+        for node, color in colors.items():
+            node.color = color
+        rows = sorted({self._rows[id(n.top)] for n in colors if id(n.top) in self._rows})
+        start = 0
+        for i in range(1, len(rows) + 1):
+            if i == len(rows) or rows[i] != rows[i - 1] + 1:
+                self._emit_changed(self.mods[rows[start]:rows[i - 1] + 1], [Qt.ForegroundRole])
+                start = i
+
+
+class ModFilterProxy(QSortFilterProxyModel):
+    """Shows the mods whose key is in a set (None: all); children follow their mod."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._keys = None
+        self.setDynamicSortFilter(False)  # check/color changes never re-filter
+
+    def set_keys(self, keys: set | None):
+        if keys is None and self._keys is None:
+            return
+        self._keys = keys
+        self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        if self._keys is None or source_parent.isValid():
+            return True
+        return self.sourceModel().mods[source_row].key in self._keys
+
+
+class DropTreeView(QTreeView):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setHeaderHidden(True)
-        self.setColumnCount(1)
-        self.setSelectionMode(self.ExtendedSelection)
+        self.setUniformRowHeights(True)
+        self.setSelectionMode(QAbstractItemView.ExtendedSelection)
         self.setAcceptDrops(True)
         self.setDragDropOverwriteMode(False)
-        self.setDragDropMode(self.DropOnly)
-        self.itemChanged.connect(self._on_item_changed)
+        self.setDragDropMode(QAbstractItemView.DropOnly)
 
         self.setContextMenuPolicy(Qt.CustomContextMenu)
         self.customContextMenuRequested.connect(self.show_context_menu)
@@ -346,28 +1319,12 @@ class DropTreeWidget(QTreeWidget):
         self.drop_overlay.raise_()  # bring to top
 
 
-    def _on_item_changed(self, item, col):
-        parent = item.parent()
-        # only handle child items
-        if parent is None:
-            return
-        # only process user-checkable children (skip shared_files)
-        if not (item.flags() & Qt.ItemIsUserCheckable):
-            return
-        # if a child was checked, uncheck its siblings
-        if item.checkState(0) == Qt.Checked:
-            for i in range(parent.childCount()):
-                sibling = parent.child(i)
-                if sibling is not item and (sibling.flags() & Qt.ItemIsUserCheckable):
-                    sibling.setCheckState(0, Qt.Unchecked)
-        parent.setCheckState(0, Qt.PartiallyChecked)
-    
     def show_context_menu(self, pos):
-        item = self.itemAt(pos)
-        if not item:
+        index = self.indexAt(pos)
+        if not index.isValid():
             return
 
-        mod_path = item.data(0, Qt.UserRole)
+        mod_path = index.data(Qt.UserRole)
         if not mod_path:
             return
 
@@ -390,7 +1347,7 @@ class DropTreeWidget(QTreeWidget):
         layout = QVBoxLayout(dlg)
         label = QLabel()
         label.setAlignment(Qt.AlignCenter)
-        label.setPixmap(_load_pix(img_path).scaled(580, 580, Qt.KeepAspectRatioByExpanding, Qt.SmoothTransformation))
+        label.setPixmap(_load_pix(img_path, (580, 580), cover=True).scaled(580, 580, Qt.KeepAspectRatioByExpanding, Qt.SmoothTransformation))
         layout.addWidget(label)
 
         btns = QDialogButtonBox(QDialogButtonBox.Close)
@@ -436,6 +1393,7 @@ class DropTreeWidget(QTreeWidget):
                 mods_folder = Path(gd) / 'mods'
                 mods_folder.mkdir(parents=True, exist_ok=True)
 
+        installs = []
         for url in event.mimeData().urls():
             path = Path(url.toLocalFile())
             mod_name = _normalize_mod_name(path.with_suffix('').name)
@@ -458,15 +1416,36 @@ class DropTreeWidget(QTreeWidget):
             # Normalize to a list of (mod_path, display_name)
             items = result if isinstance(result, list) else [result]
             for mod_path, display_name in items:
-                self.add_mod_to_tree(mod_name, display_name, mod_path, path, mods_folder)
+                installs.append((mod_name, display_name, mod_path, path, mods_folder))
 
         event.acceptProposedAction()
 
-        # Refresh mod list in main window
+        # Copies run as a job; the mod list is refreshed once they are in place
         main_win = self.window()
-        if hasattr(main_win, 'refresh_list'):
+        if installs:
+            what = installs[0][0] if len(installs) == 1 else f"{len(installs)} mods"
+            main_win.jobs.submit(
+                f"Installing {what}", lambda job: self.install_mods(installs, job), PRIORITY_SCAN, ("mods",),
+                on_done=lambda job: main_win.refresh_list(),
+            )
+        elif hasattr(main_win, 'refresh_list'):
             main_win.refresh_list()
 
+    def install_mods(self, installs: list[tuple], job=None):
+        """Copy dropped mods into mods/. Runs on a job thread: no widget access."""
+        for mod_name, display_name, mod_path, source_path, mods_folder in installs:
+            if job is not None:
+                job.check()
+            # A plain ZIP (no variants) is unpacked straight into mods/ first
+            if mod_path.suffix.lower() == '.zip' and mod_path.is_file():
+                target = mods_folder / mod_name
+                if target.exists():
+                    shutil.rmtree(target)
+                with ZipFile(mod_path) as z:
+                    z.extractall(target)
+                mod_path = target
+            self.add_mod_to_tree(mod_name, display_name, mod_path, source_path, mods_folder)
+
 
     def handle_zip_input(self, path: Path, mods_folder: Path, main_win) -> tuple[Path, str] | None:
         mod_name = _normalize_mod_name(path.with_suffix('').name)
@@ -511,14 +1490,9 @@ class DropTreeWidget(QTreeWidget):
                 else:
                     return None
             else:
-                # no variants
+                # no variants; install_mods() extracts it
                 if mods_folder:
-                    target = mods_folder / mod_name
-                    if target.exists():
-                        shutil.rmtree(target)
-                    with ZipFile(path) as z:
-                        z.extractall(target)
-                    return target, mod_name
+                    return path, mod_name
         except Exception as e:
             print(f"ZIP Error: {e}")
             return None
@@ -535,30 +1509,7 @@ class DropTreeWidget(QTreeWidget):
         return path, mod_name
 
     def add_mod_to_tree(self, mod_name: str, display_name: str, mod_path: Path, source_path: Path, mods_folder: Path):
-        # Find or create top-level item
-        top = None
-        for i in range(self.topLevelItemCount()):
-            if self.topLevelItem(i).text(0) == mod_name:
-                top = self.topLevelItem(i)
-                break
-        if not top:
-            top = QTreeWidgetItem(self, [mod_name])
-            top.setFlags(top.flags() | Qt.ItemIsUserCheckable | Qt.ItemIsTristate | Qt.ItemIsEnabled | Qt.ItemIsSelectable)
-            top.setCheckState(0, Qt.Unchecked)
-            top.setData(0, Qt.UserRole, str(mod_path)) # Add top path to preview images
-
-
-        # Skip duplicate children
-        if any(top.child(j).text(0) == display_name for j in range(top.childCount())):
-            return
-
-        # Add mod variation as child
-        child = QTreeWidgetItem(top, [display_name])
-        child.setFlags(child.flags() | Qt.ItemIsUserCheckable | Qt.ItemIsEnabled | Qt.ItemIsSelectable)
-        child.setCheckState(0, Qt.Unchecked)
-        child.setData(0, Qt.UserRole, str(mod_path))
-        top.addChild(child)
-
+        """Copy a dropped mod into mods/; the refresh after the drop adds its row."""
         # Copy mod into mods/ folder
         if mods_folder and mod_path:
             base_target = mods_folder / mod_name
@@ -578,16 +1529,8 @@ class DropTreeWidget(QTreeWidget):
             except Exception as e:
                 print(f"Error copying mod to mods/: {e}")
 
-        # Add shared_files to tree if present
+        # Top-level files of the source
         if source_path.is_dir():
-            shared = source_path / 'shared_files'
-            if shared.is_dir():
-                if not any(top.child(j).text(0) == 'shared_files' for j in range(top.childCount())):
-                    sf = QTreeWidgetItem(top, ['shared_files'])
-                    sf.setCheckState(0, Qt.Checked)
-                    sf.setData(0, Qt.UserRole, str(shared))
-                    sf.setFlags(sf.flags() & ~Qt.ItemIsUserCheckable)
-
             root_src = source_path
             if not (source_path / 'shared_files').exists():
                 for f in root_src.iterdir():
@@ -637,11 +1580,28 @@ class VariationDialog(QDialog):
         self.setWindowTitle("Select Variation")
         self.mod_path = Path(mod_path)
 
-        # Gather valid variation folders with preview images
-        self.variations = [
-            d for d in self.mod_path.iterdir()
-            if d.is_dir() and _find_mod_images(d) is not None
-        ]
+        # Gather valid variation folders with preview images (one listing each)
+        found = []
+        try:
+            with os.scandir(self.mod_path) as it:
+                for e in it:
+                    img = _first_image(e.path) if e.is_dir() else None
+                    if img is not None:
+                        found.append((Path(e.path), img))
+        except OSError:
+            pass
+        found.sort(key=lambda f: f[0].name.lower())
+        self.variations = [d for d, _ in found]
+        self._images = [img for _, img in found]
+
+        # Decoded once per variation (shared cache with the mod list), rescaled on resize
+        self._source = None
+        self.previews = getattr(parent, "previews", None) or PreviewLoader(self)
+        self.previews.ready.connect(self._on_preview_ready)
+        self._resize_timer = QTimer(self)
+        self._resize_timer.setSingleShot(True)
+        self._resize_timer.setInterval(120)
+        self._resize_timer.timeout.connect(self._rescale)
 
         # Main layout
         # ----------------------------------------------------------------------
@@ -715,30 +1675,60 @@ class VariationDialog(QDialog):
         return []
 
     def update_preview(self, idx: int) -> None:
+        self._source = None
+        self.image_label.clear()
         if idx < 0 or idx >= len(self.variations):
-            self.image_label.clear()
+            self.previews.cancel("variation")
             return
-        
-        var = self.variations[idx]
-        img_path = _find_mod_images(var)
-
-        if img_path and img_path.exists():
-            # pix = QPixmap(str(img_path))
-            pix = _load_pix(img_path)
-            if not pix.isNull():
-                self.image_label.setPixmap(pix.scaled(
-                    self.image_label.size(), Qt.KeepAspectRatio, Qt.SmoothTransformation
-                ))
-        else:
+
+        box = self._decode_box()
+        image = self.previews.request("variation", self._images[idx], box)
+        if image is not None:
+            self._show(image)
+        # Neighbours decode in the background, so the next arrow key is a cache hit
+        for slot, j in (("variation-next", idx + 1), ("variation-prev", idx - 1)):
+            if 0 <= j < len(self._images):
+                self.previews.request(slot, self._images[j], box)
+
+    def _decode_box(self) -> tuple[int, int]:
+        # Big enough for any size the dialog can be dragged to on this screen
+        screen = QApplication.primaryScreen()
+        size = screen.availableGeometry().size() * screen.devicePixelRatio()
+        return size.width(), size.height()
+
+    def _on_preview_ready(self, slot: str, image: QImage):
+        if slot == "variation":
+            self._show(image)
+
+    def _show(self, image: QImage):
+        self._source = None if image.isNull() else QPixmap.fromImage(image)
+        self._rescale()
+
+    def _rescale(self):
+        if self._source is None:
             self.image_label.clear()
+            return
+        self.image_label.setPixmap(self._source.scaled(
+            self.image_label.size(), Qt.KeepAspectRatio, Qt.SmoothTransformation
+        ))
 
     def resizeEvent(self, event):
         super().resizeEvent(event)
-        self.update_preview(self.list_widget.currentRow())
+        self._resize_timer.start()
+
+    def done(self, result):
+        for slot in ("variation", "variation-next", "variation-prev"):
+            self.previews.cancel(slot)
+        try:
+            self.previews.ready.disconnect(self._on_preview_ready)
+        except TypeError:
+            pass  # already closed
+        super().done(result)
 
 
 class ModManager(QWidget):
     CONFIG_PATH = Path.cwd() / 'decima.ini'
+    job_changed = pyqtSignal(object)  # Job; emitted from scheduler threads
 
     def __init__(self):
         super().__init__()
@@ -761,17 +1751,55 @@ class ModManager(QWidget):
         legacy_ = Path.cwd() / 'mod.meta'
         if legacy_.exists():
             legacy_.rename(legacy_.with_suffix('.meta_legacy'))
+        # temp_ (per-name ZIP extractions) is superseded by zip_cache/
+        self.clear_temp(temp_)
+        self.zip_cache = ZipExtractCache(ZIP_CACHE_DIR)
+        self.manifest = ManifestStore(MANIFEST_PATH)
+        self.conflicts = ConflictIndex(self._conflict_digest)  # file name -> providing mods/variants
+        self._conflict_seen = {}          # mod norm -> (manifest rows, shape, sources) last indexed
+        self._conflict_dirty = {}         # mods whose checks changed since the last live update
+        self._conflict_full = False       # ...or the whole list (rows removed, Flags turned on)
+        self._conflict_recolor = set()    # sources dropped by a rescan, to redraw
+        self._conflict_listing = False    # a live update waits for _prepare_conflicts()
+        self._hash_job = None
+        self._hash_then = []              # callbacks waiting for every duplicate to be hashed
+        self._check_then = []             # callbacks waiting for check_conflicts()
+        self._zip_cache_pruned = False
+        self._registry_pruned = False
 
         # Temp workspace for packing
         self.temp_dir = Path.cwd() / 'pack'
         self.backup_dir = Path.cwd() / 'backup'
+
+        # Previews, scans, installs, packing and housekeeping all go through one scheduler
+        self.jobs = JobScheduler(JOB_WORKERS, on_change=self.job_changed.emit)
+        self.job_changed.connect(self._on_job_changed, Qt.QueuedConnection)
         self.init_ui()
-        self.load_config()
+
+        # Keeps the list live when mods/ is changed outside the app
+        self.fs_watcher = QFileSystemWatcher(self)
+        self.fs_watcher.directoryChanged.connect(self._on_fs_event)
+        self.fs_watcher.fileChanged.connect(self._on_fs_event)
+        self._fs_pending = set()
+        self._fs_burst_start = 0.0
+        self._fs_timer = QTimer(self)
+        self._fs_timer.setSingleShot(True)
+        self._fs_timer.setInterval(WATCH_DEBOUNCE_MS)
+        self._fs_timer.timeout.connect(self._flush_fs_events)
+        self._scan_job = None     # the running (or queued) scan
+        self._scan_then = []      # callbacks for it, run once the tree is patched
+        self._scan_next = None    # requests merged while it runs
+        self._scan_waiters = []   # actions held back until no scan is pending (see _after_scan)
+        self._backup_worker = None
+        self._pack_worker = None
+        self._backups_ok = False  # Pack stays disabled until the backup job confirms them
 
         self.pack_tool = Path.cwd() / 'Decima_pack.exe'
+        self.load_config()
+
         if not self.pack_tool.exists():
             if hasattr(self, 'btn_pack'):
-                self.btn_pack.setEnabled(False)
+                self._update_pack_enabled()
                 QMessageBox.critical(
                     self,
                     "Missing Tool",
@@ -786,10 +1814,28 @@ class ModManager(QWidget):
         # if temp_ or temp_drag:
         #     self.clear_temp(self.temp_, self.temp_drag)
 
-        self.refresh_list()
+        # Startup already started a scan (snapshot reconcile or refresh)
+        if self._scan_job is None:
+            self.refresh_list()
 
         print("Settings file:", self.prefs.fileName()) # For testing
 
+    def closeEvent(self, event):
+        self.fs_watcher.blockSignals(True)
+        self._fs_timer.stop()
+        self._conflict_timer.stop()
+        self.warmer.stop()
+        self.previews.shutdown()
+        self._stop_backup_job()
+        self._scan_waiters = []
+        self._hash_then, self._check_then = [], []
+        self._wait_for_scan()
+        self._save_snapshot()
+        self.jobs.shutdown()
+        self.manifest.save()
+        _THUMBS.save()
+        super().closeEvent(event)
+
     def init_ui(self):
         self.temp_dir.mkdir(exist_ok=True)
         self.backup_dir.mkdir(parents=True, exist_ok=True)
@@ -834,6 +1880,7 @@ class ModManager(QWidget):
         self.conflict_check.setChecked(False)
         tl.addWidget(self.conflict_check)
         self.conflict_check.setToolTip("Detect and highlight conflicted files.")
+        self.conflict_check.toggled.connect(self._on_conflict_flags_toggled)
 
         # Reorder/sort by; buttons
         btn_up = QPushButton("↑ Move Up")
@@ -872,20 +1919,77 @@ class ModManager(QWidget):
             )
             tl.addWidget(self.notify_meta_changes)
 
+        self.scan_workers = QSpinBox()
+        self.scan_workers.setRange(1, 32)
+        self.scan_workers.setValue(self.prefs.value("scan/workers", _default_scan_workers(), type=int))
+        self.scan_workers.setToolTip("Threads used to scan the mods folder.\nLower it for spinning disks, raise it for SSDs.")
+        self.scan_workers.valueChanged.connect(
+            lambda v: (self.prefs.setValue("scan/workers", v), self.prefs.sync())
+        )
+        tl.addWidget(QLabel("Scan threads:"))
+        tl.addWidget(self.scan_workers)
+
+        self.idle_budget = QSpinBox()
+        self.idle_budget.setRange(0, 100)
+        self.idle_budget.setSuffix(" %")
+        self.idle_budget.setValue(self.prefs.value("idle/budget_pct", IDLE_BUDGET_PCT, type=int))
+        self.idle_budget.setToolTip("Share of time spent preparing previews and variant lists while the app is idle.\n0 turns it off.")
+        self.idle_budget.valueChanged.connect(
+            lambda v: (self.prefs.setValue("idle/budget_pct", v), self.prefs.sync(), self.warmer.set_budget(v))
+        )
+        tl.addWidget(QLabel("Idle warm-up:"))
+        tl.addWidget(self.idle_budget)
+
         tl.addStretch()
         main_layout.addLayout(tl)
 
         # Split drop list and buttons
         sl = QHBoxLayout()
         left = QFrame(); ll = QVBoxLayout(left)
-        ll.addWidget(QLabel("Drag & Drop mods:")); self.mod_list = DropTreeWidget(self); ll.addWidget(self.mod_list)
+        self.previews = PreviewLoader(self, self.prefs.value("preview/cache_mb", PREVIEW_CACHE_MB, type=int), jobs=self.jobs)
+        self.previews.ready.connect(self._on_preview_ready)
+
+        self.mod_model = ModListModel(self)
+        self.mod_model.fetcher = self._fetch_variants
+        # Search: index follows the model's inserts/removals; the view always goes through
+        # the filter proxy, which passes every row while no query is active
+        self.mod_proxy = ModFilterProxy(self); self.mod_proxy.setSourceModel(self.mod_model)
+        self.mod_list = DropTreeView(self); self.mod_list.setModel(self.mod_proxy)
+        self.search_index = ModSearchIndex()
+        self.mod_model.modelReset.connect(self._rebuild_search_index)
+        self.mod_model.rowsInserted.connect(self._on_mod_rows_inserted)
+        self.mod_model.rowsAboutToBeRemoved.connect(self._on_mod_rows_removed)
+        self.mod_model.rowsRemoved.connect(self._on_variant_rows_removed)
+
+        # Live conflict colors follow check changes (debounced, only the touched mods)
+        self._conflict_timer = QTimer(self)
+        self._conflict_timer.setSingleShot(True)
+        self._conflict_timer.setInterval(CONFLICT_DEBOUNCE_MS)
+        self._conflict_timer.timeout.connect(self._update_conflicts)
+        self.mod_model.dataChanged.connect(self._on_checks_changed)
+        self.mod_model.rowsRemoved.connect(lambda parent, first, last: self._schedule_conflicts())
+        self.mod_model.modelReset.connect(self._schedule_conflicts)
+
+        # Idle-time warming of variant lists and previews, in view order
+        self.warmer = IdleWarmer(self, self.idle_budget.value())
+        self.mod_model.modelReset.connect(self.warmer.reset)
+        self.search_box = QLineEdit()
+        self.search_box.setPlaceholderText("Search name, author, version, description, link or variant...")
+        self.search_box.setClearButtonEnabled(True)
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(SEARCH_DEBOUNCE_MS)
+        self._search_timer.timeout.connect(self._apply_search)
+        self.search_box.textChanged.connect(self._search_timer.start)
+
+        ll.addWidget(QLabel("Drag & Drop mods:")); ll.addWidget(self.search_box); ll.addWidget(self.mod_list)
         sl.addWidget(left, 3)
         right = QFrame(); rl = QVBoxLayout(right)
         
         about_layout = QVBoxLayout()
         logo_path = self.icon_path
         self.logo_thumb= QLabel()
-        pixmap = _load_pix(logo_path)
+        pixmap = _load_pix(logo_path, (200, 200))
         self.logo_thumb.setFixedSize(200, 200)
         self.logo_thumb.setPixmap(pixmap)
         self.logo_thumb.setScaledContents(True)
@@ -914,6 +2018,7 @@ class ModManager(QWidget):
             ("Refresh Mod List", self.refresh_list, 'SP_DialogResetButton', "Click to reload list and organize entries from A to Z"),
             ("Remove Selected Mods", self.remove_selected, 'SP_DialogCancelButton', "Delete the currently selected mods from your list and mods folder"),
             ("Restore Game Files", self.restore_default, 'SP_DialogOkButton', "Revert game files to original, unmodified state."),
+            ("Preview Pack Plan", self.preview_pack_plan, 'SP_FileDialogDetailedView', "Show which mod each packed file comes from and which copies it overrides, without packing."),
             ("Pack Activated Mods", self.pack_mods, 'SP_DialogSaveButton', "Bundle all active mods into a single package.")
         ]:
             btn = QToolButton()
@@ -944,9 +2049,9 @@ class ModManager(QWidget):
         self.image_label2.setFixedSize(400, 400)
         self.image_label2.setAlignment(Qt.AlignCenter)
         pl.addWidget(self.image_label2)
-        self.mod_list.currentItemChanged.connect(self.on_mod_selected)
+        self.mod_list.selectionModel().currentChanged.connect(self.on_mod_selected)
         default_icon_path = self.icon_path
-        pix = _load_pix(default_icon_path)
+        pix = _load_pix(default_icon_path, (400, 400), cover=True)
         self.image_label2.setPixmap(
             pix.scaled(self.image_label2.size(), Qt.KeepAspectRatioByExpanding, Qt.SmoothTransformation,)
         )
@@ -973,33 +2078,77 @@ class ModManager(QWidget):
         # Status Bar
         status = QHBoxLayout()
         self.status_label = QLabel("Status: Idle"); status.addWidget(self.status_label)
+        self.job_progress = QProgressBar()
+        self.job_progress.setFixedWidth(220)
+        self.job_progress.setRange(0, 1000)
+        self.job_progress.hide()
+        status.addWidget(self.job_progress)
+        self.btn_jobs = QToolButton()
+        self.btn_jobs.setText("Jobs")
+        self.btn_jobs.setCheckable(True)
+        self.btn_jobs.setToolTip("Show background jobs (scans, installs, packing, backups) and how long they have run.")
+        status.addWidget(self.btn_jobs)
         status.addStretch()
         special_thanks = "Special Thanks: - id-daemon - HardcoreHobbyist - hornycopter"
         thanks = QLabel(special_thanks); status.addWidget(thanks)
 
+        # Background jobs panel, toggled from the status bar
+        self.jobs_panel = QTreeWidget()
+        self.jobs_panel.setHeaderLabels(["Job", "Priority", "State", "Time"])
+        self.jobs_panel.setRootIsDecorated(False)
+        self.jobs_panel.setColumnWidth(0, 320)
+        self.jobs_panel.setMaximumHeight(110)
+        self.jobs_panel.hide()
+        self.btn_jobs.toggled.connect(self.jobs_panel.setVisible)
+        self.btn_jobs.toggled.connect(self._refresh_jobs_panel)
+        self._jobs_timer = QTimer(self)
+        self._jobs_timer.setInterval(500)  # elapsed times tick while jobs run
+        self._jobs_timer.timeout.connect(self._refresh_jobs_panel)
+
+        main_layout.addWidget(self.jobs_panel)
         main_layout.addLayout(status)
         tabs.addTab(mods_page, "Management")
 
+        # Secondary tabs are built the first time they are opened
+        self._lazy_tabs = {}
+        tabs.currentChanged.connect(lambda i: self._build_lazy_tab(tabs, i))
+
         # Enable for V4
         # Tools Tab
-        # tabs.addTab(StreamPacking(self), "Tools")
+        # self._add_lazy_tab(tabs, lambda: StreamPacking(self), "Tools")
 
         # Help Tab
         if FEAT_HELP_WEBENGINE:
-            tabs.addTab(Help(self), "Help")
+            self._add_lazy_tab(tabs, lambda: Help(self), "Help")
         else:
-            from PyQt5.QtGui import QDesktopServices
-            help_stub = QWidget()
-            stub_layout = QVBoxLayout(help_stub)
-            help_btn = QPushButton("Open Online Help")
-            help_btn.clicked.connect(lambda: QDesktopServices.openUrl(QUrl("https://hfw-mm.gitbook.io/hfw-mm-docs/")))
-            stub_layout.addWidget(help_btn, alignment=Qt.AlignCenter)
-            tabs.addTab(help_stub, "Help")
+            self._add_lazy_tab(tabs, self._help_stub, "Help")
         
         # Tab widget fill window
         outer = QVBoxLayout(self)
         outer.addWidget(tabs)
     
+    def _add_lazy_tab(self, tabs: QTabWidget, factory, title: str):
+        holder = QWidget()
+        QVBoxLayout(holder).setContentsMargins(0, 0, 0, 0)
+        self._lazy_tabs[tabs.addTab(holder, title)] = factory
+
+    def _build_lazy_tab(self, tabs: QTabWidget, index: int):
+        factory = self._lazy_tabs.pop(index, None)
+        if factory is None:
+            return
+        t0 = time.perf_counter()
+        tabs.widget(index).layout().addWidget(factory())
+        if STARTUP_TIMING:
+            print(f"[Startup] {tabs.tabText(index)} tab built in {time.perf_counter() - t0:.3f}s")
+
+    def _help_stub(self) -> QWidget:
+        help_stub = QWidget()
+        stub_layout = QVBoxLayout(help_stub)
+        help_btn = QPushButton("Open Online Help")
+        help_btn.clicked.connect(lambda: QDesktopServices.openUrl(QUrl("https://hfw-mm.gitbook.io/hfw-mm-docs/")))
+        stub_layout.addWidget(help_btn, alignment=Qt.AlignCenter)
+        return help_stub
+
     def load_config(self):
         # Read bare cache path from decima.ini (should include LocalCacheWinGame)
         if self.CONFIG_PATH.exists():
@@ -1007,10 +2156,10 @@ class ModManager(QWidget):
             if cache_path.name == 'LocalCacheWinGame':
                 game_path = cache_path.parent
                 self.select_game_dir.setText(str(game_path))
-                self.post_browse_setup(game_path)
+                self.post_browse_setup(game_path, startup=True)
             elif cache_path.exists():
                 self.select_game_dir.setText(str(cache_path))
-                self.post_browse_setup(cache_path)
+                self.post_browse_setup(cache_path, startup=True)
 
         dark_on = self.prefs.value("ui/dark_mode", True, type=bool)
         self.dark_mode_checkbox.blockSignals(True)
@@ -1031,6 +2180,7 @@ class ModManager(QWidget):
     def apply_dark_mode(self, enabled: bool):
         app = QApplication.instance()
         if enabled:
+            import qdarktheme
             app.setStyleSheet(qdarktheme.load_stylesheet())
         else:
             # app.setStyleSheet("")
@@ -1041,6 +2191,7 @@ class ModManager(QWidget):
         if not FEAT_UPDATE_CHECKER:
             return
         """Conditional‐GET against GitHub; on 403 use cached version, on 304 do nothing."""
+        import urllib.request, urllib.error
         settings = self.prefs
         url = "https://api.github.com/repos/Julz876/HFW_Mod_Manager/releases/latest"
         headers = {"User-Agent": "HFW Mod Manager"}
@@ -1111,49 +2262,92 @@ class ModManager(QWidget):
             self.select_game_dir.setText("")
             self.btn_open_mods.hide()
 
-    def post_browse_setup(self, game_path: Path):
+    def post_browse_setup(self, game_path: Path, startup: bool = False):
         # create and sync 'mods' folder
         mods_folder = game_path / 'mods'
         mods_folder.mkdir(parents=True, exist_ok=True)
-        self.refresh_list()
-        # backup and .org copies
-        pkg = game_path / 'LocalCacheWinGame' / 'package'
-        pkg.mkdir(parents=True, exist_ok=True)
-
-        for f in ['streaming_graph.core', 'streaming_links.stream']:
-            orig = pkg / f
-            if not orig.exists():
-                continue
-
-            if FEAT_STRICT_HASH:
-                # Validate before backing up
-                valid, detail = _validate_original_file(orig)
-                if not valid:
-                    QMessageBox.critical(
-                        self,
-                        f"Hash Mismatch - {f}",
-                        f"The original file does not match known-good hashes."
-                        f"\n\n{detail}\n\n"
-                        f"Backup skipped for safety.\n\nDelete this file:\n{orig}\n\nThen verify your game files with steam."
-                    )
-                    continue
-            else:
-                valid, detail = _validate_original_file(orig)
-                if not valid:
-                    print(f"[!] Warning: {detail} CRC mismatch (skipping strict validation)")
-
-            bak = self.backup_dir / f
-            if not bak.exists():
-                shutil.copy(orig, bak)
-
-            org = pkg / f"{f}.org"
-            if not org.exists():
-                shutil.copy(orig, org)
+        # At startup, show the last list right away and check mods/ in the background
+        if startup and self._show_snapshot(mods_folder):
+            self._start_reconcile(mods_folder)
+        else:
+            self.refresh_list()
+        # Hash validation and backups run in the background; Pack waits for them
+        self._start_backup_job(game_path / 'LocalCacheWinGame' / 'package')
 
         self.update_open_mods_visibility()
 
         self.status_label.setText("Game folder set.")
 
+    def _start_backup_job(self, pkg: Path):
+        self._stop_backup_job()
+        pkg.mkdir(parents=True, exist_ok=True)
+        self._backups_ok = False
+        self._update_pack_enabled()
+
+        worker = BackupJob(self, pkg, self.backup_dir)
+        worker.progress.connect(self._on_job_progress)
+        worker.notice.connect(self.notify)
+        worker.done.connect(self._on_backup_done)
+        self._backup_worker = worker
+        worker.job = self.jobs.submit("Verifying game files", worker.run, PRIORITY_HOUSEKEEPING, ("game",))
+
+    def _stop_backup_job(self):
+        worker = self._backup_worker
+        if worker is not None:
+            self._backup_worker = None
+            worker.job.cancel()
+            worker.job.wait()
+            worker.deleteLater()
+            self.job_progress.hide()
+
+    def _on_job_progress(self, stage: str, done: int, total: int):
+        self.job_progress.setValue(int(done * 1000 / total) if total else 0)
+        self.job_progress.setFormat(f"{stage} %p%")
+        self.job_progress.show()
+
+    def _on_backup_done(self, ok: bool):
+        worker = self.sender()
+        if worker is not self._backup_worker:
+            return  # superseded by a newer job
+        self._backup_worker = None
+        worker.deleteLater()
+        self.job_progress.hide()
+        self._backups_ok = ok
+        self._update_pack_enabled()
+        if not ok:
+            self.status_label.setText("⚠️ Packing disabled: game file backups are missing.")
+
+    def _update_pack_enabled(self):
+        if hasattr(self, 'btn_pack'):
+            self.btn_pack.setEnabled(self.pack_tool.exists() and self._backups_ok)
+
+    def _on_job_changed(self, job):
+        job.deliver()  # on_done callbacks run here, on the GUI thread
+        if not job.hidden:
+            self._refresh_jobs_panel()
+
+    def _refresh_jobs_panel(self):
+        jobs = self.jobs.jobs()
+        self.btn_jobs.setText(f"Jobs ({len(jobs)})" if jobs else "Jobs")
+        if not jobs:
+            self._jobs_timer.stop()
+        elif not self._jobs_timer.isActive():
+            self._jobs_timer.start()
+        if not self.jobs_panel.isVisible():
+            return
+        self.jobs_panel.clear()
+        for job in jobs:
+            elapsed = f"{job.elapsed():.1f} s" if job.started else "–"
+            QTreeWidgetItem(self.jobs_panel, [job.name, PRIORITY_NAMES.get(job.priority, str(job.priority)), job.state, elapsed])
+
+    def notify(self, level: str, title: str, text: str):
+        """Non-blocking message box; the GUI keeps running while it is open."""
+        icon = {"critical": QMessageBox.Critical, "warning": QMessageBox.Warning}.get(level, QMessageBox.Information)
+        box = QMessageBox(icon, title, text, QMessageBox.Ok, self)
+        box.setWindowModality(Qt.NonModal)
+        box.setAttribute(Qt.WA_DeleteOnClose)
+        box.show()
+
     def open_mods_folder(self):
         game_dir = self.select_game_dir.text().strip()
         if not game_dir:
@@ -1163,35 +2357,26 @@ class ModManager(QWidget):
         mods_path.mkdir(parents=True, exist_ok=True)
         QDesktopServices.openUrl(QUrl.fromLocalFile(str(mods_path)))
 
-    def temp_mods_extracted(self, folder_path):
-        mods_folder = folder_path
-        zip_names = {_normalize_key(f.stem) for f in mods_folder.glob("*.zip")}
-
-        temp_root = Path.cwd() / "temp_"
-        if temp_root.exists():
-            for d in temp_root.iterdir():
-                if d.is_dir() and d.name.endswith("_extracted"):
-                    mod_base = d.name.removesuffix("_extracted")
-                    if mod_base not in zip_names:
-                        try:
-                            shutil.rmtree(d)
-                            print(f"[Cleanup] Removed stale temp dir for: {mod_base}")
-                        except Exception as e:
-                            print(f"[Cleanup] Failed to remove {d}: {e}")
-
-
-    def clear_temp(self, temp_, temp_drag):
-        if temp_.exists() or temp_drag.exists():
+    def prune_zip_cache(self, mods_folder: Path):
+        # Only drops extractions whose archive was deleted or replaced
+        try:
+            self.zip_cache.prune(list(mods_folder.glob("*.zip")))
+        except Exception as e:
+            print(f"[Cleanup] ZIP cache prune failed: {e}")
+        self._zip_cache_pruned = True
+
+    def clear_temp(self, *dirs: Path):
+        for d in dirs:
+            if not d.exists():
+                continue
             try:
-                shutil.rmtree(temp_)
-                shutil.rmtree(temp_drag)
-                print("[Startup Cleanup] Removed leftover temp_")
+                shutil.rmtree(d)
+                print(f"[Startup Cleanup] Removed leftover {d.name}")
             except Exception as e:
                 print(f"[Startup Cleanup] Failed: {e}")
 
     def _load_merge_metadata_for_entry(self, entry: Path, mod_name_stem: str, tmp_extract: Path, registry: dict,
                                     changes_accum: list[tuple[str, dict]]):
-        meta_path = REGISTRY_PATH
         existing = registry.get(mod_name_stem, {}) if isinstance(registry.get(mod_name_stem), dict) else {}
 
         # Find modinfo.json
@@ -1214,12 +2399,20 @@ class ModManager(QWidget):
             **existing,
         }
 
-        # New probe
+        # New probe (re-hash only when mtime/size moved)
         probe = {
             "modinfo_exists": bool(modinfo_path),
-            "modinfo_sha1": _file_sha1(modinfo_path) if modinfo_path else "",
+            "modinfo_sha1": "",
             "modinfo_mtime": _file_mtime(modinfo_path) if modinfo_path else 0,
+            "modinfo_size": _file_size(modinfo_path) if modinfo_path else 0,
         }
+        if modinfo_path:
+            if (existing.get("_probe_modinfo_sha1")
+                    and existing.get("_probe_modinfo_mtime") == probe["modinfo_mtime"]
+                    and existing.get("_probe_modinfo_size") == probe["modinfo_size"]):
+                probe["modinfo_sha1"] = existing["_probe_modinfo_sha1"]
+            else:
+                probe["modinfo_sha1"] = _file_sha1(modinfo_path)
 
         previously = {
             "modinfo_sha1": existing.get("_probe_modinfo_sha1", ""),
@@ -1244,6 +2437,7 @@ class ModManager(QWidget):
         merged["_probe_modinfo_exists"] = probe["modinfo_exists"]
         merged["_probe_modinfo_sha1"]   = probe["modinfo_sha1"]
         merged["_probe_modinfo_mtime"]  = probe["modinfo_mtime"]
+        merged["_probe_modinfo_size"]   = probe["modinfo_size"]
 
         important_keys = ["mod_name", "author", "version", "description", "priority", "link"]
         field_diffs = _diff_fields(existing, merged, important_keys)
@@ -1265,35 +2459,25 @@ class ModManager(QWidget):
         return merged
 
     def refresh_list(self):
-        # Clear existing tree
-        self.mod_list.clear()
-        self.clear_temp(temp_, temp_drag)
-        
-        self.process_mods_folder()
-        self.sort_mods_by_priority()
+        # temp_drag may still feed a queued install; a later refresh clears it
+        if not self.jobs.busy("mods"):
+            self.clear_temp(temp_drag)
+        self.process_mods_folder(then=self._after_refresh)
 
-        if FEAT_ACTIVATED_SAVE:
-            saved_paths = self.restore_checked_mods()
-        else:
-            saved_paths = ""
-        
-        for i in range(self.mod_list.topLevelItemCount()):
-            top = self.mod_list.topLevelItem(i)
-
-            top_path = top.data(0, Qt.UserRole)
-            if top_path and _normpath(str(top_path)) in saved_paths:
-                top.setCheckState(0, Qt.Checked)
-
-            for j in range(top.childCount()):
-                child = top.child(j)
-                child_path = child.data(0, Qt.UserRole)
-                if child_path and _normpath(str(child_path)) in saved_paths:
-                    child.setCheckState(0, Qt.Checked)
+    def _after_refresh(self, updated: int):
+        self.sort_mods_by_priority()
 
         # self.mod_list.expandAll()
+        self._save_snapshot()
         self.status_label.setText("Mod list refreshed.")
 
-    def process_mods_folder(self):
+    def process_mods_folder(self, only_keys: set | None = None, then=None):
+        """
+        Bring the tree in line with mods/. With `only_keys`, entries outside that set
+        keep their indexed signature (new and vanished entries are still picked up).
+        The scan runs as a job; `then(updated)` is called on the GUI thread once the
+        tree is patched, with how many entries were added, rebuilt or removed.
+        """
         game_folder_text = self.select_game_dir.text().strip()
         if not game_folder_text:
             QMessageBox.warning(self, "Warning", "Before initiating any steps,\nmake sure to choose the game folder first.")
@@ -1301,48 +2485,186 @@ class ModManager(QWidget):
         
         mods_folder = Path(game_folder_text) / 'mods'
         mods_folder.mkdir(parents=True, exist_ok=True)
+        self._start_scan(mods_folder, only_keys, then)
+
+    def _start_scan(self, mods_folder: Path, only_keys: set | None = None, then=None):
+        if self._scan_job is not None:
+            # One scan at a time; requests made meanwhile are merged into one follow-up,
+            # which starts from the index the running scan leaves behind
+            nxt = self._scan_next
+            if nxt is None:
+                nxt = self._scan_next = {"only_keys": only_keys, "then": []}
+            elif nxt["only_keys"] is not None:
+                nxt["only_keys"] = None if only_keys is None else nxt["only_keys"] | only_keys
+            nxt["mods_folder"] = mods_folder
+            if then:
+                nxt["then"].append(then)
+            return
+        index = self._scan_index_for(mods_folder)
+        workers = self._scan_worker_count()
+        self._scan_then = [then] if then else []
+        self._scan_job = self.jobs.submit(
+            "Scanning mods folder", lambda job: self._scan_mods_folder(index, only_keys, workers),
+            PRIORITY_SCAN, ("mods",), on_done=self._on_scan_done,
+        )
 
-        self.temp_mods_extracted(mods_folder)
-
-        local_temp_root = Path.cwd() / "temp_"
-        local_temp_root.mkdir(parents=True, exist_ok=True)
-
-        mods_to_add = []
-        meta_path = REGISTRY_PATH
-        registry = _load_mod_registry()
-        changes_accum = []
+    def _wait_for_scan(self):
+        while self._scan_job is not None:
+            job = self._scan_job
+            job.wait()
+            job.deliver()
+
+    def _after_scan(self, fn) -> bool:
+        """
+        Anything that packs must see the reconciled tree first: while a scan is
+        pending, queue `fn` to run once it (and any follow-up merged into it) is
+        applied, and return True. The event loop keeps running meanwhile.
+        """
+        if self._scan_job is None:
+            return False
+        if fn not in self._scan_waiters:
+            self._scan_waiters.append(fn)
+        self.status_label.setText("Waiting for scan...")
+        return True
 
-        for entry in mods_folder.iterdir():
-            if not (entry.is_dir() or entry.suffix.lower() == '.zip'):
-                continue
+    def _on_scan_done(self, job):
+        if self._scan_job is not job:
+            return
+        self._scan_job = None
+        then, self._scan_then = self._scan_then, []
+        if job.state == DONE:
+            updated = self._apply_scan(job.result)
+            for fn in then:
+                fn(updated)
+        elif job.error is not None:
+            print(f"[!] Background scan failed: {job.error}")
+            self.status_label.setText("⚠️ Scanning the mods folder failed.")
+
+        nxt, self._scan_next = self._scan_next, None
+        if nxt is not None:
+            self._start_scan(nxt["mods_folder"], nxt["only_keys"])
+            self._scan_then = nxt["then"]
+        else:
+            waiters, self._scan_waiters = self._scan_waiters, []
+            for fn in waiters:
+                fn()
+
+    def _scan_index_for(self, mods_folder: Path) -> dict:
+        # Change index (survives restarts)
+        index = getattr(self, "_scan_index", None)
+        if index is None or index.get("mods_folder") != str(mods_folder):
+            index = self._scan_index = load_scan_index(SCAN_INDEX_PATH, mods_folder)
+        if not FEAT_INCREMENTAL_SCAN:
+            index["entries"] = {}
+        return index
+
+    def _scan_mods_folder(self, index: dict, only_keys: set | None, workers: int) -> dict:
+        """
+        Filesystem half of a rescan: stat, probe and registry updates. Touches no
+        widgets, so it can run on a background thread; _apply_scan() does the rest.
+        Works on a copy of the index entries, which _apply_scan() swaps in.
+        """
+        mods_folder = Path(index["mods_folder"])
+        entries = dict(index["entries"])
+
+        pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="scan")
+        try:
+            # Stat pass: cheap, no metadata reads
+            with os.scandir(mods_folder) as it:
+                listing = sorted((Path(e.path) for e in it), key=lambda p: p.name.lower())
+            old_sigs = {k: v.get("sig") for k, v in entries.items()}
+            current, paths = {}, {}
+            to_stat = []
+            for entry in listing:
+                key = _normalize_key(entry.stem)
+                if only_keys is not None and key in old_sigs and key not in only_keys:
+                    current[key] = old_sigs[key]
+                    paths[key] = entry
+                else:
+                    to_stat.append(entry)
+            for entry, sig in zip(to_stat, pool.map(entry_signature, to_stat)):
+                if sig is None:
+                    continue
+                key = _normalize_key(entry.stem)
+                current[key] = sig
+                paths[key] = entry
 
-            mod_name_stem = _normalize_key(entry.stem)
-            mod_name = _normalize_mod_name(mod_name_stem)
-            tmp_extract = local_temp_root / f"{mod_name_stem}_extracted"
+            added, removed, changed = diff_signatures(old_sigs, current)
 
-            if entry.is_file() and entry.suffix.lower() == '.zip':
-                needs_extract = not tmp_extract.exists() or not REGISTRY_PATH.exists()
-                if needs_extract:
-                    if tmp_extract.exists():
-                        shutil.rmtree(tmp_extract)
-                    tmp_extract.mkdir()
+            # Unchanged entries whose cached record is unusable are probed again
+            stale = set()
+            for key in set(current) - added - changed:
+                if only_keys is not None and key not in only_keys:
+                    continue
+                record = entries[key].get("record") or {}
+                if not record.get("root") or not Path(record["root"]).exists():
+                    stale.add(key)
+            to_probe = added | changed | stale
+
+            changes_accum = []
+            if to_probe:
+                store = _mod_registry()
+                registry = store.get_many(to_probe)
+                order = sorted(to_probe)
+
+                def probe(key):
                     try:
-                        with ZipFile(entry) as z:
-                            z.extractall(tmp_extract)
+                        return self._scan_entry(paths[key], key, registry.get(key))
                     except Exception as e:
-                        print(f"[!] Failed to extract ZIP {entry.name}: {e}")
-                        continue
-
-            metadata = self._load_merge_metadata_for_entry(entry, mod_name_stem, tmp_extract, registry, changes_accum)
-
-            priority = metadata.get("priority", 5)
-            mods_to_add.append((priority, entry, mod_name, metadata))
+                        print(f"[!] Failed to scan {paths[key].name}: {e}")
+                        return None
 
-        try:
-            _write_json_atomic(REGISTRY_PATH, registry)
-        except Exception as e:
-            print(f"[!] Failed to persist meta.ini: {e}")
+                # Probes run in parallel; merging happens here, in key order
+                updates = {}
+                for key, result in zip(order, pool.map(probe, order)):
+                    if result is None:
+                        entries.pop(key, None)
+                        continue
+                    record, metadata, changes = result
+                    updates[key] = metadata
+                    changes_accum.extend(changes)
+                    entries[key] = {"sig": current[key], "record": record}
+
+                if FEAT_REGISTRY_META:
+                    store.upsert_many(updates)
+        finally:
+            pool.shutdown()
+
+        for key in removed:
+            entries.pop(key, None)
+
+        if removed or changed or not self._zip_cache_pruned:
+            self.prune_zip_cache(mods_folder)
+
+        # Rows of vanished mods go once per session and whenever entries disappear
+        if FEAT_REGISTRY_META and (removed or not self._registry_pruned):
+            self.prune_mod_meta(mods_folder)
+
+        return {
+            "index": index,
+            "entries": entries,
+            "paths": paths,
+            "added": added,
+            "removed": removed,
+            "changed": changed,
+            "to_probe": to_probe,
+            "changes": changes_accum,
+        }
 
+    def _apply_scan(self, scan: dict) -> int:
+        """GUI half of a rescan: patch the tree, persist the index, re-arm the watcher."""
+        index, entries = scan["index"], scan["entries"]
+        to_probe, removed = scan["to_probe"], scan["removed"]
+        # File listings of changed or vanished entries are re-walked on next use
+        for key in set(scan["changed"]) | set(removed):
+            root = ((index["entries"].get(key) or {}).get("record") or {}).get("root")
+            if root:
+                self.manifest.invalidate(root)
+                self._drop_conflicts(root)
+        index["entries"] = entries
+        mods_folder = Path(index["mods_folder"])
+
+        changes_accum = scan["changes"]
         if changes_accum and self.notify_meta_changes.isChecked():
             lines = []
             for name, diffs in changes_accum[:10]:  # cap to avoid huge popups
@@ -1359,228 +2681,324 @@ class ModManager(QWidget):
                 "Detected changes in mod metadata:\n\n" + "\n".join(lines) + more
             )
 
-        # ascending priority: 0 = highest first
-        # mods_to_add.sort(key=lambda x: x[0])  # Use priority range
+        self._patch_mod_tree(entries, to_probe)
 
-        # descending priority: 5 = lowest first
-        mods_to_add.sort(key=lambda x: x[0])
-        
-        if FEAT_REGISTRY_META:
-            self.prune_mod_meta(meta_path, mods_folder)
-
-        # Now create tree items
-        for priority, entry, mod_name, metadata in mods_to_add:
-            top = QTreeWidgetItem(self.mod_list, [mod_name])
-            # top.setData(0, Qt.UserRole + 2, uid)
-            if FEAT_ORDER_UI:
-                top.setData(0, Qt.UserRole + 2, priority)
-            top.setData(0, Qt.UserRole + 1, mod_name)
-
-            # Tooltip from registry metadata
-            if FEAT_REGISTRY_META:
-                tip_author = metadata.get("author", "Unknown")
-                tip_version = metadata.get("version", "n/a")
-                tip_desc = metadata.get("description", "")
-                top.setToolTip(0, f"by {tip_author}\nversion {tip_version}\n{tip_desc}")
-
-            top.setFlags(
-                top.flags()
-                | Qt.ItemIsUserCheckable
-                | Qt.ItemIsTristate
-                | Qt.ItemIsEnabled
-                | Qt.ItemIsSelectable
-            )
-            top.setCheckState(0, Qt.Unchecked)
-
-            # shared_files child (always included)
-            shared = entry / 'shared_files'
-            if shared.is_dir():
-                sf = QTreeWidgetItem(top, ["shared_files"])
-                sf.setCheckState(0, Qt.Checked)
-                sf.setData(0, Qt.UserRole, str(shared))
-                sf.setFlags(sf.flags() & ~Qt.ItemIsUserCheckable)
-
-            # handle directory variants/None-Variants
-            if entry.is_dir():
-                vars_dir = [d for d in entry.iterdir() if d.is_dir() and _find_mod_images(d) is not None]
-
-                if len(vars_dir) == 1:
-                    var = vars_dir[0]
-                    top.setData(0, Qt.UserRole, str(var))
-
-                    # Add the single variant as a child
-                    child = QTreeWidgetItem(top, [var.name])
-                    child.setFlags(
-                        child.flags()
-                        | Qt.ItemIsUserCheckable
-                        | Qt.ItemIsEnabled
-                        | Qt.ItemIsSelectable
-                    )
-                    child.setCheckState(0, Qt.Unchecked)
-                    child.setData(0, Qt.UserRole, str(var))
-                
-                elif len(vars_dir) > 1:
-                    for var in vars_dir:
-                        child = QTreeWidgetItem(top, [var.name])
-                        child.setData(0, Qt.UserRole, str(var))
-                        child.setFlags(
-                            child.flags()
-                            | Qt.ItemIsUserCheckable
-                            | Qt.ItemIsEnabled
-                            | Qt.ItemIsSelectable
-                        )
-                        child.setCheckState(0, Qt.Unchecked)
-                        top.setData(0, Qt.UserRole, str(entry))
-
-                ## Non-Variant
-                else:
-                    # Set data on the top-level item itself
-                    top.setData(0, Qt.UserRole, str(entry))
-                    top.setFlags(
-                        top.flags()
-                        | Qt.ItemIsUserCheckable
-                        | Qt.ItemIsEnabled
-                        | Qt.ItemIsSelectable
-                    )
-                    top.setCheckState(0, Qt.Unchecked)
+        try:
+            save_scan_index(SCAN_INDEX_PATH, index)
+        except Exception as e:
+            print(f"[!] Failed to persist scan index: {e}")
+        if to_probe or removed:
+            roots = [(v.get("record") or {}).get("root") for v in entries.values()]
+            self.manifest.forget([r for r in roots if r])
+        self.manifest.save()
+
+        if to_probe or removed:
+            print(f"[Scan] {len(scan['added'])} added, {len(scan['changed'])} changed, {len(removed)} removed, "
+                  f"{len(scan['paths']) - len(to_probe)} reused")
+
+        self._sync_fs_watches(mods_folder, scan["paths"].values())
+        if to_probe or removed:
+            self.warmer.reset()
+        return len(to_probe) + len(removed)
+
+    def _save_snapshot(self):
+        """Persist the tree as shown (order, records, checks, expansion) for the next startup."""
+        index = getattr(self, "_scan_index", None)
+        if not index:
+            return
+        records = {k: v.get("record") for k, v in index["entries"].items()}
+        items = []
+        for mod in self.mod_model.mods:
+            record = records.get(mod.key)
+            if not record:
+                continue
+            expanded = self.mod_list.isExpanded(self._view_index(mod))
+            items.append({"record": record, "checked": mod.checked_paths(), "expanded": expanded})
+        try:
+            _write_json_atomic(SNAPSHOT_PATH, {
+                "version": SNAPSHOT_VERSION,
+                "mods_folder": index["mods_folder"],
+                "items": items,
+            })
+        except Exception as e:
+            print(f"[!] Failed to save mod list snapshot: {e}")
 
-            else:
-                mod_name_stem = _normalize_key(entry.stem)
-                tmp_extract = local_temp_root / f"{mod_name_stem}_extracted"
+    def _show_snapshot(self, mods_folder: Path) -> bool:
+        """Render the saved tree without touching mods/. False if there is nothing usable."""
+        try:
+            with open(SNAPSHOT_PATH, "r", encoding="utf-8") as f:
+                snap = json.load(f)
+            if snap.get("version") != SNAPSHOT_VERSION or snap.get("mods_folder") != str(mods_folder):
+                return False
+            items = snap["items"]
+            mods = [ModNode.from_record(item["record"]) for item in items]
+        except Exception as e:
+            if SNAPSHOT_PATH.exists():
+                print(f"[!] Mod list snapshot unusable: {e}")
+            return False
 
-                # Extract only if not cached
-                needs_extract = not tmp_extract.exists() or not meta_path.exists()
+        model = self.mod_model
+        model.set_mods(mods)
+        model.restore_checks({p for item in items for p in item.get("checked", ())})
+        for mod, item in zip(mods, items):
+            if item.get("expanded"):
+                self.mod_list.expand(self._view_index(mod))
+        self.status_label.setText("Checking mods folder...")
+        return True
 
-                if needs_extract:
-                    if tmp_extract.exists():
-                        shutil.rmtree(tmp_extract)
-                    tmp_extract.mkdir()
-                    try:
-                        with ZipFile(entry) as z:
-                            z.extractall(tmp_extract)
-                    except Exception as e:
-                        print(f"[!] Failed to extract ZIP {entry.name}: {e}")
-                        return
-                    
-                metadata = self.parse_mod_info(entry, mod_name_stem, tmp_extract, meta_path)
-                priority = metadata.get("priority", 5)
-                if FEAT_ORDER_UI:
-                    top.setData(0, Qt.UserRole + 2, priority)
-                
-                # Read extracted content as a mod folder
-                vars_dir = [d for d in tmp_extract.iterdir() if d.is_dir() and _find_mod_images(d) is not None]
-
-                if len(vars_dir) > 1:
-                    for var in vars_dir:
-                        child = QTreeWidgetItem(top, [var.name])
-                        child.setData(0, Qt.UserRole, str(var))
-                        child.setFlags(child.flags() | Qt.ItemIsUserCheckable | Qt.ItemIsEnabled | Qt.ItemIsSelectable)
-                        child.setCheckState(0, Qt.Unchecked)
-                    top.setData(0, Qt.UserRole, str(tmp_extract))
-
-                elif len(vars_dir) == 1:
-                    var = vars_dir[0]
-                    child = QTreeWidgetItem(top, [var.name])
-                    child.setData(0, Qt.UserRole, str(var))
-                    child.setFlags(child.flags() | Qt.ItemIsUserCheckable | Qt.ItemIsEnabled | Qt.ItemIsSelectable)
-                    child.setCheckState(0, Qt.Unchecked)
-                    top.setData(0, Qt.UserRole, str(tmp_extract))
-                
-                else:
-                    # treat root as non-variant
-                    top.setData(0, Qt.UserRole, str(tmp_extract))
-                    top.setFlags(top.flags() | Qt.ItemIsUserCheckable | Qt.ItemIsEnabled | Qt.ItemIsSelectable)
-                    top.setCheckState(0, Qt.Unchecked)
+    def _start_reconcile(self, mods_folder: Path):
+        self._start_scan(mods_folder, then=self._after_refresh)
 
-                top.setToolTip(0, f"by {metadata.get('author', 'Unknown')}\nversion {metadata.get('version', 'n/a')}\n {metadata.get('description', '')}")
+    def _sync_fs_watches(self, mods_folder: Path, entries):
+        if not FEAT_FS_WATCHER:
+            return
+        # mods/ itself catches added/removed entries, each entry its own files; in-place
+        # edits of modinfo.json don't touch the folder, so those get a watch too (if room)
+        entries = sorted(entries, key=lambda p: p.name.lower())
+        wanted = [str(mods_folder)] + [str(p) for p in entries]
+        wanted += [str(p / "modinfo.json") for p in entries if (p / "modinfo.json").is_file()]
+        wanted = set(wanted[:WATCH_LIMIT])
+        watched = set(self.fs_watcher.directories()) | set(self.fs_watcher.files())
+        stale = list(watched - wanted)
+        fresh = list(wanted - watched)
+        if stale:
+            self.fs_watcher.removePaths(stale)
+        if fresh:
+            self.fs_watcher.addPaths(fresh)
+        self._watched_mods_folder = mods_folder
+
+    def _on_fs_event(self, path: str):
+        mods_folder = getattr(self, "_watched_mods_folder", None)
+        if mods_folder is None:
+            return
+        try:
+            rel = Path(path).relative_to(mods_folder)
+        except ValueError:
+            return
+        if rel.parts:
+            self._fs_pending.add(_normalize_key(Path(rel.parts[0]).stem))
+            self.manifest.invalidate(mods_folder / rel.parts[0])
+
+        # Debounce; a never-ending burst still gets applied every WATCH_MAX_DELAY_MS
+        now = time.monotonic()
+        if not self._fs_timer.isActive():
+            self._fs_burst_start = now
+        if (now - self._fs_burst_start) * 1000 >= WATCH_MAX_DELAY_MS:
+            self._fs_timer.start(0)
+        else:
+            self._fs_timer.start(WATCH_DEBOUNCE_MS)
 
-        self.update_mod_order_labels()
+    def _flush_fs_events(self):
+        keys, self._fs_pending = self._fs_pending, set()
+        if not self.select_game_dir.text().strip():
+            return
 
+        def applied(updated: int):
+            if updated:
+                self.status_label.setText(f"Mods folder changed: {updated} entr{'y' if updated == 1 else 'ies'} updated.")
+
+        self.process_mods_folder(only_keys=keys, then=applied)
+
+    def _scan_entry(self, entry: Path, mod_name_stem: str, existing: dict | None) -> tuple[dict, dict, list] | None:
+        """
+        Read metadata and variants of one mods/ entry into a JSON-safe record.
+        Runs on scan worker threads: no widget access, and the registry row is
+        returned for the caller to merge instead of being written here.
+        """
+        mod_name = _normalize_mod_name(mod_name_stem)
+        tmp_extract = None
+
+        if entry.is_file() and entry.suffix.lower() == '.zip':
+            # Reused as-is unless the archive itself changed. The light pass only
+            # writes modinfo/previews; .stream/.core stay zipped until a pack needs them.
+            if FEAT_ZIP_LAZY_EXTRACT:
+                tmp_extract = self.zip_cache.ensure_light(entry)
+            else:
+                tmp_extract = self.zip_cache.ensure(entry)
+            try:
+                listing = scan_archive(entry, img_ext)
+            except Exception as e:
+                print(f"[!] Failed to read ZIP {entry.name}: {e}")
+                return None
+            if tmp_extract is None:
+                print(f"[!] Failed to extract ZIP {entry.name}")
+                return None
 
-    # Append/Update meta.ini
-    def parse_mod_info(self, entry, mod_name_stem, tmp_extract, meta_path):
-        modinfo_path = tmp_extract / "modinfo.json"
-        if not modinfo_path.exists():
-            modinfo_path = entry / "modinfo.json"
+        registry = {mod_name_stem: existing} if isinstance(existing, dict) else {}
+        changes = []
+        metadata = self._load_merge_metadata_for_entry(entry, mod_name_stem, tmp_extract, registry, changes)
 
-        # Base metadata + defaults
-        metadata = {
-            "source_path": str(entry),
-            "mod_name": mod_name_stem,
-            "updated_at": int(time.time()),  # unix ts for quick comparisons
+        if entry.is_dir():
+            # Variants are listed on first expand or pack (_fetch_variants); only hint here
+            vars_dir = None
+            has_children = _has_subdirs(entry, skip=('shared_files',))
+            root = entry
+            shared = entry / 'shared_files'
+        else:
+            # Already known from the central directory
+            vars_dir = [tmp_extract / name for name in listing["variants"]]
+            has_children = bool(vars_dir)
+            root = tmp_extract
+            shared = tmp_extract / 'shared_files' if listing["shared"] else None
+
+        record = {
+            "key": mod_name_stem,
+            "entry": str(entry),
+            "kind": "dir" if entry.is_dir() else "zip",
+            "name": mod_name,
+            "priority": metadata.get("priority", 5),
+            "root": str(root),
+            "variants": None if vars_dir is None else [[v.name, str(v)] for v in vars_dir],
+            "has_children": has_children,
+            "shared": str(shared) if shared and (entry.is_file() or shared.is_dir()) else None,
+            "tooltip": f"by {metadata.get('author', 'Unknown')}\nversion {metadata.get('version', 'n/a')}\n{metadata.get('description', '')}",
         }
+        return record, metadata, changes
+
+    def _fetch_variants(self, mod: ModNode) -> list:
+        """
+        Variant rows of a folder mod, listed on first use. The result is kept in the
+        mod's scan record, which is rebuilt (variants unknown again) when the entry changes.
+        """
+        index = getattr(self, "_scan_index", None) or {}
+        record = (index.get("entries", {}).get(mod.key) or {}).get("record")
+        if record is not None and record.get("variants") is not None:
+            return record["variants"]
+        rows = self._manifest_variants(Path(mod.path)) if mod.path else None
+        if rows is None:
+            rows = [[v.name, str(v)] for v in _list_variant_dirs(Path(mod.path))] if mod.path else []
+        if record is not None and record.get("root") and _normpath(record["root"]) == mod.norm:
+            record["variants"] = rows
+        return rows
+
+    def _manifest_variants(self, folder: Path) -> list | None:
+        """Variant rows (as _list_variant_dirs) from a valid manifest entry, or None without one."""
+        files = self.manifest.cached(folder)
+        if files is None:
+            return None
+        names = {row[REL].split("/", 1)[0] for row in files
+                 if row[CLASS] == IMAGE and row[REL].count("/") == 1}
+        return [[name, str(folder / name)] for name in sorted(names, key=str.lower)]
+
+    def _warm_units(self, mod: ModNode) -> list:
+        """
+        Background jobs that do now what selecting or expanding `mod` would do later,
+        as (job, apply) pairs; `apply(result)` stores a result on the GUI thread.
+        """
+        units = []
+        index = getattr(self, "_scan_index", None) or {}
+        record = (index.get("entries", {}).get(mod.key) or {}).get("record")
+        if (mod.pending and record is not None and record.get("variants") is None
+                and record.get("root") and _normpath(record["root"]) == mod.norm):
+            folder = Path(mod.path)
+
+            def store(rows, record=record):
+                if record.get("variants") is None:
+                    record["variants"] = rows
+
+            job = self.jobs.submit("Warm variants", lambda job: [[v.name, str(v)] for v in _list_variant_dirs(folder)],
+                                   PRIORITY_HOUSEKEEPING, hidden=True)
+            units.append((job, store))
+        if mod.path and (not self.manifest.known(mod.path) or mod.norm not in self._conflict_seen):
+            # The listing also feeds the conflict index ("who else provides this")
+            folder = Path(mod.path)
+
+            def index(rows, mod=mod):
+                if self.mod_model.row_of_path(mod.norm) is not None:
+                    self._index_conflicts(mod)
+
+            units.append((self.jobs.submit("Warm manifest", lambda job: self.manifest.files(folder),
+                                           PRIORITY_HOUSEKEEPING, hidden=True), index))
+        if mod.path:
+            job = self.previews.warm(Path(mod.path), self._label_box(self.image_label2))
+            if job is not None:
+                units.append((job, None))
+        return units
+
+    def _scan_worker_count(self) -> int:
+        return max(1, self.prefs.value("scan/workers", _default_scan_workers(), type=int))
+
+    def _patch_mod_tree(self, entries: dict, rebuilt: set):
+        """Drop rows for vanished/rebuilt entries and add rows for the rest; untouched rows stay as they are."""
+        model = self.mod_model
+        checked_keep = set()
+        positions = {}
+        drop = []
+        for row, mod in enumerate(model.mods):
+            key = mod.key
+            if key in entries and key not in rebuilt:
+                continue
+            # Keep check marks of rebuilt mods by path
+            if key in entries:
+                positions[key] = row
+                checked_keep.update(mod.checked_paths())
+            drop.append(mod)
+        model.remove_mods(drop)
 
-        # Default priority
-        prio_default = 5
-
-        # Merge in modinfo.json if present
-        if modinfo_path.exists():
-            try:
-                with open(modinfo_path, "r", encoding="utf-8") as f:
-                    modinfo = json.load(f)
-                metadata.update(modinfo)
+        shown = {mod.key for mod in model.mods}
 
-                prio = modinfo.get("priority", prio_default)
-                if isinstance(prio, int) and 0 <= prio <= 5:
-                    metadata["priority"] = prio
-            except Exception as e:
-                print(f"[!] Failed to parse modinfo.json in {entry.name}: {e}")
+        if FEAT_ACTIVATED_SAVE:
+            saved_paths = set(self.restore_checked_mods())
+        else:
+            saved_paths = set()
+        saved_paths |= checked_keep
 
-        # Append/Update meta.ini
-        try:
-            # Load existing registry (if any)
-            if meta_path.exists():
-                try:
-                    with open(meta_path, "r", encoding="utf-8") as f:
-                        registry = json.load(f)
-                    if not isinstance(registry, dict):
-                        registry = {}
-                except Exception:
-                    registry = {}
+        added, appended = [], []
+        for key in sorted(entries, key=lambda k: (entries[k]["record"].get("priority", 5), k.lower())):
+            if key in shown:
+                continue
+            mod = ModNode.from_record(entries[key]["record"])
+            added.append(mod)
+            if key in positions:
+                model.insert_mods(positions[key], [mod])
             else:
-                registry = {}
-
-            registry[mod_name_stem] = metadata
-
-            # Optional
-            registry["_meta"] = {
-                "schema": 1,
-                "last_write": int(time.time()),
-                "count": len([k for k in registry.keys() if k != "_meta"]),
-            }
-
-            _write_json_atomic(meta_path, registry)
-        except Exception as e:
-            print(f"[!] Failed to update meta.ini: {e}")
+                appended.append(mod)
+        model.insert_mods(len(model.mods), appended)
+        model.restore_checks(saved_paths, added)
+
+
+    def _zip_archive_for(self, path) -> Path | None:
+        """Map a path inside zip_cache/ back to the mods/ archive it was read from."""
+        index = getattr(self, "_scan_index", None) or {}
+        roots = {}
+        for item in index.get("entries", {}).values():
+            record = item.get("record") or {}
+            if record.get("kind") == "zip" and record.get("root"):
+                roots[_normpath(record["root"])] = record["entry"]
+
+        p = Path(path)
+        for candidate in (p, *p.parents):
+            hit = roots.get(_normpath(str(candidate)))
+            if hit:
+                return Path(hit)
+            if _normpath(str(candidate)) == _normpath(str(ZIP_CACHE_DIR)):
+                break
+        return None
 
-        return metadata
+    def _materialize_zip_mods(self, paths) -> None:
+        """Extract the .stream/.core payload of any lazily scanned ZIP mod among `paths`."""
+        done = set()
+        for path in paths:
+            archive = self._zip_archive_for(path)
+            if archive is None or archive in done:
+                continue
+            done.add(archive)
+            if self.zip_cache.ensure(archive) is None:
+                print(f"[!] Failed to extract ZIP {archive.name}")
 
-    def prune_mod_meta(self, meta_path: Path, mods_folder: Path):
+    def prune_mod_meta(self, mods_folder: Path):
         try:
-            if not meta_path.exists():
-                return
-            with open(meta_path, "r", encoding="utf-8") as f:
-                registry = json.load(f)
-            if not isinstance(registry, dict):
-                return
-
             existing_names = set()
             for entry in mods_folder.iterdir():
                 if entry.is_dir() or entry.suffix.lower() == ".zip":
                     existing_names.add(_normalize_key(entry.stem))
 
-            changed = False
-            for key in list(registry.keys()):
-                if key in ("_meta",):
-                    continue
-                if key not in existing_names:
-                    del registry[key]
-                    changed = True
-
-            if changed:
-                registry["_meta"]["last_prune"] = int(time.time())
-                registry["_meta"]["count"] = len([k for k in registry.keys() if k != "_meta"])
-                _write_json_atomic(meta_path, registry)
+            store = _mod_registry()
+            stale = store.keys() - existing_names
+            if stale:
+                store.delete(stale)
+                store.set_meta("last_prune", int(time.time()))
+            self._registry_pruned = True
         except Exception as e:
             print(f"[!] prune_mod_meta failed: {e}")
 
@@ -1598,109 +3016,85 @@ class ModManager(QWidget):
             print(f"[ERROR] Failed to save activated mods: {e}")
 
 
-    def update_mod_order_labels(self):
-        for i in range(self.mod_list.topLevelItemCount()):
-            item = self.mod_list.topLevelItem(i)
-            raw_name = item.data(0, Qt.UserRole + 1)  # original name
-
-            prio = item.data(0, Qt.UserRole + 2)
-            item.setText(0, f"{i+1:02d}. [{prio if prio is not None else 5}] {raw_name}")
-
     def move_selected_mod_up(self):
-        current = self.mod_list.currentItem()
-        if not current or current.parent():
-            return
-        index = self.mod_list.indexOfTopLevelItem(current)
-        if index > 0:
-            was_expanded = current.isExpanded()
-
-            self.mod_list.takeTopLevelItem(index)
-            self.mod_list.insertTopLevelItem(index - 1, current)
-            self.mod_list.setCurrentItem(current)
-            self.update_mod_order_labels()
-            if was_expanded:
-                self.mod_list.expandItem(current)
+        self._move_selected_mods(-1)
 
     def move_selected_mod_down(self):
-        current = self.mod_list.currentItem()
-        if not current or current.parent():
-            return
-        index = self.mod_list.indexOfTopLevelItem(current)
-        if index < self.mod_list.topLevelItemCount() - 1:
-            was_expanded = current.isExpanded()
+        self._move_selected_mods(+1)
+
+    def _move_selected_mods(self, step: int):
+        # Steps are taken in the full list, also while a search hides rows
+        tops = [self._source_index(ix) for ix in self.mod_list.selectionModel().selectedRows()]
+        rows = {ix.row() for ix in tops if ix.isValid() and not ix.parent().isValid()}
+        current = self._source_index(self.mod_list.currentIndex())
+        if not rows and current.isValid() and not current.parent().isValid():
+            rows = {current.row()}
+        # Rows are permuted in place, so expansion and selection come along
+        if rows and self.mod_model.move_rows(rows, step):
+            self.mod_list.scrollTo(self.mod_list.currentIndex())
+
+    def _source_index(self, view_index: QModelIndex) -> QModelIndex:
+        return self.mod_proxy.mapToSource(view_index)
+
+    def _node_at(self, view_index: QModelIndex) -> ModNode | None:
+        return self.mod_model.node(self._source_index(view_index))
+
+    def _view_index(self, node: ModNode) -> QModelIndex:
+        return self.mod_proxy.mapFromSource(self.mod_model.index_of(node))
+
+    # Search
+    # --------------------------------------------------------------------------
+    def _index_mod(self, mod: ModNode):
+        meta = _mod_registry().get(mod.key) or {}
+        fields = [mod.name, *(meta.get(f, "") for f in SEARCH_FIELDS), *(v.name for v in mod.variants())]
+        self.search_index.add(mod.key, fields)
+
+    def _rebuild_search_index(self):
+        self.search_index.clear()
+        for mod in self.mod_model.mods:
+            self._index_mod(mod)
+        self._refilter()
+
+    def _on_mod_rows_inserted(self, parent: QModelIndex, first: int, last: int):
+        model = self.mod_model
+        if parent.isValid():
+            self._index_mod(model.node(parent))  # variants listed
+        else:
+            for mod in model.mods[first:last + 1]:
+                self._index_mod(mod)
+        self._refilter()
 
-            self.mod_list.takeTopLevelItem(index)
-            self.mod_list.insertTopLevelItem(index + 1, current)
-            self.mod_list.setCurrentItem(current)
-            self.update_mod_order_labels()
-            if was_expanded:
-                self.mod_list.expandItem(current)
+    def _on_mod_rows_removed(self, parent: QModelIndex, first: int, last: int):
+        if parent.isValid():
+            return
+        for mod in self.mod_model.mods[first:last + 1]:
+            self.search_index.remove(mod.key)
+
+    def _on_variant_rows_removed(self, parent: QModelIndex, first: int, last: int):
+        if parent.isValid():
+            self._index_mod(self.mod_model.node(parent))
+
+    def _refilter(self):
+        # New rows pass the current filter as soon as they are indexed
+        if self.search_box.text().strip():
+            self._search_timer.start()
+
+    def _apply_search(self):
+        keys = self.search_index.search(self.search_box.text())
+        self.mod_proxy.set_keys(keys)
+        if keys is None:
+            return
+        self.status_label.setText(f"{len(keys)} of {len(self.mod_model.mods)} mods match.")
 
     def sort_mods_by_priority(self):
-        # Gather raw data
-        mods_to_sort = []
-        for i in range(self.mod_list.topLevelItemCount()):
-            top = self.mod_list.topLevelItem(i)
-            mod_path = top.data(0, Qt.UserRole)
-            mod_name = top.data(0, Qt.UserRole + 1)
-
-            # default when truly None
-            prio = top.data(0, Qt.UserRole + 2)
-            priority = prio if prio is not None else 5
-
-            checked = top.checkState(0)
-            flags   = top.flags()
-
-            # collect children
-            children = []
-            for j in range(top.childCount()):
-                c = top.child(j)
-                children.append((
-                    c.text(0),
-                    c.data(0, Qt.UserRole),
-                    c.checkState(0),
-                    c.flags()
-                ))
-
-            mods_to_sort.append((priority, mod_path, mod_name, checked, flags, children))
-
-        # Sort ascending (0 = highest)
-        mods_to_sort.sort(key=lambda x: x[0], reverse=True)
-
-        # Rebuild the tree
-        self.mod_list.clear()
-        for priority, mod_path, mod_name, checked, flags, children in mods_to_sort:
-            top = QTreeWidgetItem([mod_name])
-            top.setData(0, Qt.UserRole,      mod_path)
-            top.setData(0, Qt.UserRole + 1,  mod_name)
-            if FEAT_ORDER_UI:
-                top.setData(0, Qt.UserRole + 2,  priority)
-            top.setCheckState(0, checked)
-            top.setFlags(flags)
-            self.mod_list.addTopLevelItem(top)
-
-            for text, path, chk, fl in children:
-                child = QTreeWidgetItem([text])
-                child.setData(0, Qt.UserRole, path)
-                child.setCheckState(0, chk)
-                child.setFlags(fl)
-                top.addChild(child)
-
-        # Refresh the “01., 02.” labels
-        self.update_mod_order_labels()
-
+        self.mod_model.sort_by_priority()
         self.status_label.setText("Sorted mods by priority.")
 
     def save_mod_order(self):
         if not FEAT_ORDER_UI:
             return
 
-        order = []
-        for i in range(self.mod_list.topLevelItemCount()):
-            item = self.mod_list.topLevelItem(i)
-            path = item.data(0, Qt.UserRole)
-            if path:
-                order.append(str(path))
+        order = [str(mod.path) for mod in self.mod_model.mods if mod.path]
 
         try:
             self.prefs.setValue("mods/order", order)
@@ -1717,93 +3111,33 @@ class ModManager(QWidget):
         if not saved:
             return
 
-        # Extract all current items into a list of data tuples
-        mods = []
-        for i in range(self.mod_list.topLevelItemCount()):
-            top = self.mod_list.topLevelItem(i)
-            path = top.data(0, Qt.UserRole)
-            prio = top.data(0, Qt.UserRole + 2)
-            name = top.data(0, Qt.UserRole + 1)
-            checked = top.checkState(0)
-            flags = top.flags()
-            children = []
-            for j in range(top.childCount()):
-                c = top.child(j)
-                children.append((
-                    c.text(0),
-                    c.data(0, Qt.UserRole),
-                    c.checkState(0),
-                    c.flags()
-                ))
-            mods.append((path, prio, name, checked, flags, children))
-
-        # Build new ordered list using saved list
-        path_map = { str(path): (path, prio, name, checked, flags, children)
-                    for path, prio, name, checked, flags, children in mods }
-        ordered = []
-        for p in saved:
-            norm = os.path.normcase(os.path.normpath(p))
-            for key in list(path_map):
-                if os.path.normcase(os.path.normpath(key)) == norm:
-                    ordered.append(path_map.pop(key))
-                    break
-        ordered.extend(path_map.values())
-
-        # Rebuild the tree
-        self.mod_list.clear()
-        for path, prio, name, checked, flags, children in ordered:
-            top = QTreeWidgetItem([name])
-            top.setData(0, Qt.UserRole, path)
-            top.setData(0, Qt.UserRole + 1, name)
-            top.setData(0, Qt.UserRole + 2, prio)
-            top.setFlags(flags)
-            top.setCheckState(0, checked)
-            self.mod_list.addTopLevelItem(top)
-            for text, cpath, chk, cflags in children:
-                c = QTreeWidgetItem([text])
-                c.setData(0, Qt.UserRole, cpath)
-                c.setFlags(cflags)
-                c.setCheckState(0, chk)
-                top.addChild(c)
-
-        self.update_mod_order_labels()
-
-
-    def on_mod_selected(self, current: QTreeWidgetItem, previous: QTreeWidgetItem):
+        self.mod_model.order_by_paths(saved)
+
+    def on_mod_selected(self, current: QModelIndex, previous: QModelIndex):
         self.image_label2.clear()
-        if current is None:
+        node = self._node_at(current)
+        if node is None:
+            self.previews.cancel("mod")
             return
 
-        # Grab path from this item or its parent
-        path_str = current.data(0, Qt.UserRole)
-        if not path_str and current.parent():
-            path_str = current.parent().data(0, Qt.UserRole)
+        # Grab path from this row or its mod
+        path_str = node.path or node.top.path
         if not path_str:
+            self.previews.cancel("mod")
             return
 
         mod_folder = Path(path_str)
-        img_path = _find_mod_images(mod_folder)
-
-        if img_path and img_path.exists():
-            # pix = QPixmap(str(img_path))
-            pix = _load_pix(img_path)
-            self.image_label2.setPixmap(
-                pix.scaled(
-                    self.image_label2.size(),
-                    Qt.KeepAspectRatio,
-                    Qt.SmoothTransformation
-                )
-            )
+        # Decoded off the GUI thread; arrowing past a row drops its request
+        image = self.previews.request("mod", mod_folder, self._label_box(self.image_label2))
+        if image is not None:
+            self._show_mod_preview(image)
 
         # Load metadata registry first then fallback
-        registry = _load_mod_registry()
 
-        # The top-level item stores the original (unprefixed) name in UserRole+1
-        top_item = current if current.parent() is None else current.parent()
-        raw_name = top_item.data(0, Qt.UserRole + 1) or top_item.text(0)
-        mod_key = _normalize_key(raw_name)
+        # Registry rows are keyed by the mod's original (unprefixed) name
+        mod_key = _normalize_key(node.top.name)
 
-        metadata = registry.get(mod_key, None)
+        metadata = _mod_registry().get(mod_key)
 
         if not isinstance(metadata, dict):
             meta_file = mod_folder.parent / "modinfo.json"
@@ -1825,7 +3159,7 @@ class ModManager(QWidget):
 
         # Populate the labels (fall back to defaults)
         self.meta_lbl.setWordWrap(True)
-        self.meta_lbl.setText(metadata.get("mod_name", current.text(0)))
+        self.meta_lbl.setText(metadata.get("mod_name", node.name))
         self.meta_author.setText(f"by {metadata.get('author', '')}")
         self.meta_version.setText(f"version {metadata.get('version', '')}")
         self.meta_notes.setWordWrap(True)
@@ -1835,6 +3169,26 @@ class ModManager(QWidget):
         author = metadata.get("author", "")
         self.meta_link.setText(f"Please visit  <a href='{link}'>{author}</a> on Nexus Mods.")
 
+    def _on_preview_ready(self, slot: str, image: QImage):
+        if slot == "mod":
+            self._show_mod_preview(image)
+
+    @staticmethod
+    def _label_box(label: QLabel) -> tuple[int, int]:
+        ratio = label.devicePixelRatioF()
+        return round(label.width() * ratio), round(label.height() * ratio)
+
+    def _show_mod_preview(self, image: QImage):
+        if image.isNull():
+            return
+        self.image_label2.setPixmap(
+            QPixmap.fromImage(image).scaled(
+                self.image_label2.size(),
+                Qt.KeepAspectRatio,
+                Qt.SmoothTransformation
+            )
+        )
+
     def update_open_mods_visibility(self):
         game_path = Path(self.select_game_dir.text().strip())
         if game_path.is_dir() and (game_path / "LocalCacheWinGame").exists():
@@ -1844,15 +3198,11 @@ class ModManager(QWidget):
 
     
     def check_all(self):
-        for i in range(self.mod_list.topLevelItemCount()):
-            top = self.mod_list.topLevelItem(i)
-            top.setCheckState(0, Qt.Checked)
-            self.status_label.setText("All mods checked.")
+        self.mod_model.set_all_active(True)
+        self.status_label.setText("All mods checked.")
 
     def uncheck_all(self):
-        for i in range(self.mod_list.topLevelItemCount()):
-            top = self.mod_list.topLevelItem(i)
-            top.setCheckState(0, Qt.Unchecked)
+        self.mod_model.set_all_active(False)
         self.status_label.setText("All mods unchecked.")
 
 
@@ -1863,8 +3213,8 @@ class ModManager(QWidget):
             return
 
         mods_dir = game_dir / "mods"
-        current  = self.mod_list.currentItem()
-        if not current:
+        current  = self._node_at(self.mod_list.currentIndex())
+        if current is None:
             return
 
         def _safe_remove(p: Path):
@@ -1876,26 +3226,21 @@ class ModManager(QWidget):
             except Exception as e:
                 print(f"[Delete] Failed to delete {p}: {e}")
 
-        parent = current.parent()
+        parent = current.parent
         try:
             if parent is None:
                 # Delete whole mod
-                display_name = current.data(0, Qt.UserRole + 1) or current.text(0)
-                roots = _candidate_roots(mods_dir, str(display_name), current)
-
-                # Remove dirs/zips
-                for r in roots:
-                    if r.is_dir():
-                        _safe_remove(r)
-                    zips = list(mods_dir.glob("*.zip"))
-                    for z in zips:
-                        if _normalize_mod_name(_normalize_key(z.stem)) == _normalize_mod_name(_normalize_key(str(display_name))):
-                            _safe_remove(z)
+                display_name = current.name
+                roots = _candidate_roots(mods_dir, str(display_name), current.path)
+
+                # Dirs/zips to remove
+                targets = [r for r in roots if r.is_dir()]
+                if roots:
+                    wanted = _normalize_mod_name(_normalize_key(str(display_name)))
+                    targets += [z for z in mods_dir.glob("*.zip") if _normalize_mod_name(_normalize_key(z.stem)) == wanted]
 
                 # Remove from tree
-                idx = self.mod_list.indexOfTopLevelItem(current)
-                if idx != -1:
-                    self.mod_list.takeTopLevelItem(idx)
+                self.mod_model.remove_mods([current])
 
                 try:
                     save_file = Path.cwd() / "activated.list"
@@ -1903,7 +3248,7 @@ class ModManager(QWidget):
                         with open(save_file, "r", encoding="utf-8") as f:
                             paths = [line.strip() for line in f if line.strip()]
 
-                        removed_prefixes = set(_normpath(str(r)) for r in roots if r.is_dir())
+                        removed_prefixes = set(_normpath(str(r)) for r in targets if r.is_dir())
                         kept = []
                         for p in paths:
                             np = _normpath(p)
@@ -1926,17 +3271,14 @@ class ModManager(QWidget):
             else:
                 # Delete a single variant
                 top = parent
-                display_name = top.data(0, Qt.UserRole + 1) or top.text(0)
-                var_name = current.text(0)
+                display_name = top.name
+                var_name = current.name
 
-                roots = _candidate_roots(mods_dir, str(display_name), top)
-                for r in roots:
-                    var_folder = r / var_name
-                    if var_folder.exists():
-                        _safe_remove(var_folder)
+                roots = _candidate_roots(mods_dir, str(display_name), top.path)
+                targets = [r / var_name for r in roots if (r / var_name).exists()]
 
                 # Remove from UI
-                parent.removeChild(current)
+                self.mod_model.remove_child(current)
                 removed_text = f"{display_name}/{var_name}"
 
                 try:
@@ -1952,14 +3294,26 @@ class ModManager(QWidget):
                 except Exception as e:
                     print(f"[activated.list] variant cleanup failed: {e}")
 
-            # Tidy meta and refresh
-            try:
-                self.prune_mod_meta(REGISTRY_PATH, mods_dir)
-            except Exception as e:
-                print(f"[meta.ini] prune failed: {e}")
+            # The files go in a job; meta is tidied and the list refreshed after
+            def remove(job):
+                for p in targets:
+                    _safe_remove(p)
+                    self.manifest.invalidate(p)
 
-            self.refresh_list()
-            self.status_label.setText(f"Removed: {removed_text}")
+            def removed(job):
+                try:
+                    self.prune_mod_meta(mods_dir)
+                except Exception as e:
+                    print(f"[registry] prune failed: {e}")
+
+                def refreshed(updated: int):
+                    self._after_refresh(updated)
+                    self.status_label.setText(f"Removed: {removed_text}")
+
+                self.process_mods_folder(then=refreshed)
+
+            self.status_label.setText(f"Removing {removed_text}...")
+            self.jobs.submit(f"Removing {removed_text}", remove, PRIORITY_SCAN, ("mods",), on_done=removed)
 
         except Exception as e:
             print(f"[Remove] Unexpected error: {e}")
@@ -1967,58 +3321,150 @@ class ModManager(QWidget):
 
 
     def pack_mods(self):
-        self.status_label.setText("Packing...")
+        if self._after_scan(self.pack_mods):
+            return
 
+        # Validate game folder
+        game_folder_text = self.select_game_dir.text().strip()
+        if not game_folder_text:
+            QMessageBox.warning(self, "Error", "Please select a valid game folder before packing.")
+            return
         if self.conflict_check.isChecked():
-            conflict_files = sorted(self.check_conflicts())
-            if conflict_files:
-                msg = "Conflicts detected in selected mods:\n\n- " + "\n- ".join(conflict_files[:10])  # Show up to 10
-                if len(conflict_files) > 10:
-                    msg += f"\n...and {len(conflict_files) - 10} more."
-                msg += "\n\nDo you want to proceed anyway?"
-
-                reply = QMessageBox.warning(
-                    self, "Conflicts Detected", msg,
-                    QMessageBox.Yes | QMessageBox.No, QMessageBox.No
-                )
-                if reply == QMessageBox.No:
-                    self.status_label.setText("Packing cancelled due to conflicts.")
-                    return
+            # Duplicates are hashed in a job; packing goes on from _pack_checked()
+            self.status_label.setText("Checking conflicts...")
+            self.check_conflicts(self._pack_checked)
+            return
+        self._start_pack()
 
-        self.thread = QThread()
-        self.worker = PackingWorker(self)
-        self.worker.moveToThread(self.thread)
+    def _pack_checked(self, conflict_files: list):
+        if conflict_files:
+            lines = []
+            for name, labels in conflict_files[:10]:  # Show up to 10
+                shown = list(dict.fromkeys(labels))
+                if len(shown) == 1:
+                    lines.append(f"{name}: {shown[0]} ({len(labels)} copies)")
+                else:
+                    lines.append(f"{name}: " + " ↔ ".join(shown))
+            msg = "Conflicts detected in selected mods:\n\n- " + "\n- ".join(lines)
+            if len(conflict_files) > 10:
+                msg += f"\n...and {len(conflict_files) - 10} more."
+            identical = len(self.conflicts.conflicts(benign=True))
+            if identical:
+                msg += f"\n\n({identical} identical duplicate{'s' if identical != 1 else ''} ignored)"
+            msg += "\n\nDo you want to proceed anyway?"
+
+            reply = QMessageBox.warning(
+                self, "Conflicts Detected", msg,
+                QMessageBox.Yes | QMessageBox.No, QMessageBox.No
+            )
+            if reply == QMessageBox.No:
+                self.status_label.setText("Packing cancelled due to conflicts.")
+                return
 
-        self.thread.started.connect(self.worker.run)
-        self.worker.finished.connect(self.thread.quit)
-        self.worker.finished.connect(self.worker.deleteLater)
-        self.thread.finished.connect(self.thread.deleteLater)
+        self._start_pack()
 
-        self.worker.finished.connect(self.on_pack_finished)
+    def _start_pack(self):
+        game_folder_text = self.select_game_dir.text().strip()
+        self.status_label.setText("Packing...")
 
-        # show modal spinner
-        self.spinner_dialog = QProgressDialog("Packing mods...", None, 0, 0, self)
-        self.spinner_dialog.setWindowTitle("Please Wait")
-        self.spinner_dialog.setWindowModality(Qt.WindowModal)
-        self.spinner_dialog.setCancelButton(None)
-        self.spinner_dialog.setMinimumDuration(0)
-        self.spinner_dialog.show()
+        # The worker only gets paths; the model is read (and colored) here
+        checked_paths, sources = self._collect_pack_selection()
 
-        self.thread.start()
+        # Save checked mod paths
+        if FEAT_ACTIVATED_SAVE:
+            self.write_activated_list(checked_paths)
+
+        spec = {
+            "game_folder": Path(game_folder_text),
+            "sources": sources,
+        }
 
-    def pack_mods_worker(self) -> tuple[bool, str]:
+        worker = PackingWorker(self, spec)
+        worker.progress.connect(self._on_pack_progress)
+        worker.notice.connect(self.notify)
+        self._pack_worker = worker
+
+        # Modal progress; redrawn from the latest report at PROGRESS_FPS
+        waiting = self.jobs.busy("mods") or self.jobs.busy("game")
+        self.pack_dialog = QProgressDialog("Waiting for other jobs..." if waiting else "Packing mods...", "Cancel", 0, 0, self)
+        self.pack_dialog.setWindowTitle("Please Wait")
+        self.pack_dialog.setWindowModality(Qt.WindowModal)
+        self.pack_dialog.canceled.connect(self._cancel_pack)
+        self.pack_dialog.setMinimumDuration(0)
+        self.pack_dialog.setMinimumWidth(420)
+        self.pack_dialog.show()
+        self._pack_status = self._pack_drawn = None
+        self._pack_stage_start = time.monotonic()
+        self._pack_timer = QTimer(self)
+        self._pack_timer.timeout.connect(self._draw_pack_progress)
+        self._pack_timer.start(1000 // PROGRESS_FPS)
+
+        worker.job = self.jobs.submit("Packing mods", worker.run, PRIORITY_PACK, ("mods", "game"), on_done=self._on_pack_done)
+
+    def _cancel_pack(self):
+        # Stops at the next progress report; the pack tool itself runs to completion
+        if self._pack_worker is not None:
+            self._pack_worker.job.cancel()
+            self._pack_timer.stop()
+            self.status_label.setText("Cancelling packing...")
+
+    def _on_pack_done(self, job):
+        worker, self._pack_worker = self._pack_worker, None
+        if worker is not None:
+            worker.deleteLater()
+        if job.state == DONE:
+            self.on_pack_finished(*job.result)
+        elif job.state == CANCELLED:
+            self._pack_timer.stop()
+            self.pack_dialog.close()
+            self.status_label.setText("Packing cancelled.")
+        else:
+            self.on_pack_finished(False, f"Packing failed:\n{job.error}")
+
+    def _on_pack_progress(self, status: PackStatus):
+        # Only remembered here; _draw_pack_progress paints the latest one per frame
+        if self._pack_status is None or status.stage != self._pack_status.stage:
+            self._pack_stage_start = time.monotonic()
+        self._pack_status = status
+
+    def _draw_pack_progress(self):
+        st = self._pack_status
+        if st is None or st is self._pack_drawn:
+            return
+        self._pack_drawn = st
+        dlg = self.pack_dialog
+
+        lines = [st.stage]
+        if st.files_total:
+            files = f"{st.files_done} / {st.files_total} files"
+            lines.append(f"{files} · {_fmt_size(st.bytes_done)} / {_fmt_size(st.bytes_total)}" if st.bytes_total else files)
+        if st.bytes_total:
+            done, total = st.bytes_done, st.bytes_total
+        else:
+            done, total = st.files_done, st.files_total
+        if total:
+            dlg.setRange(0, 1000)
+            dlg.setValue(min(1000, int(done * 1000 / total)))
+            elapsed = time.monotonic() - self._pack_stage_start
+            if st.bytes_done and elapsed > 0.5:
+                rate = st.bytes_done / elapsed
+                eta = (st.bytes_total - st.bytes_done) / rate
+                lines.append(f"{_fmt_size(rate)}/s · about {eta:.0f} s left")
+        else:
+            dlg.setRange(0, 0)  # busy, e.g. while the pack tool runs
+        dlg.setLabelText("\n".join(lines))
+        self.status_label.setText(f"{st.stage}…")
+
+    def pack_mods_worker(self, spec: dict, worker: PackingWorker) -> tuple[bool, str]:
+        """Runs as a scheduler job: no widget access, progress and messages go through `worker`."""
+        gf = spec["game_folder"]
+        worker.stage("Restoring game files")
         try:
-            self.restore_default()
+            for level, title, text in self._restore_game_files(gf / 'LocalCacheWinGame' / 'package'):
+                worker.notice.emit(level, title, text)
         except Exception:
             pass  # ignore errors during automatic restore
 
-        # Validate game folder
-        game_folder_text = self.select_game_dir.text().strip()
-        if not game_folder_text:
-            QMessageBox.warning(self, "Error", "Please select a valid game folder before packing.")
-            return False, "No game folder"
-
-        gf = Path(game_folder_text)
         lcache = gf / 'LocalCacheWinGame'
         pkg = lcache / 'package'
         ar = pkg / 'ar'
@@ -2029,64 +3475,19 @@ class ModManager(QWidget):
         build_stream_id = '25'
         temp_inputs = self.temp_dir
 
-        # Collect checked mod paths
-        checked_paths = []
-        variant_paths = []
-        top_paths = []
-        default_brush = QBrush()  # current theme/default
-        magenta_brush = QBrush(QColor("magenta"))
-
-        for i in range(self.mod_list.topLevelItemCount()):
-            top = self.mod_list.topLevelItem(i)
-            top_path = top.data(0, Qt.UserRole)
-
-            top_has_checked_variant = False
-            first_checked_variant_path = None
-
-            for j in range(top.childCount()):
-                child = top.child(j)
-                is_checked = child.checkState(0) == Qt.Checked
-
-                # Colorize based on checked status
-                child.setForeground(0, magenta_brush if is_checked else default_brush)
-
-                if is_checked:
-                    child_path = child.data(0, Qt.UserRole)
-                    if child_path:
-                        variant_paths.append(Path(child_path))
-                        first_checked_variant_path = Path(child_path)
-                        print(f"[✓] Variant path: {child_path}")
-                    top_has_checked_variant = True
-
-            is_top_checked = top.checkState(0) == Qt.Checked
-
-            if is_top_checked or top_has_checked_variant:
-                if is_top_checked and top_path:
-                    checked_paths.append(top_path)
-                    if top.childCount() == 0:
-                        # Treat as a variant for conflict checking
-                        variant_paths.append(Path(top_path))
-
-                if top_path:
-                    top_paths.append(Path(top_path))
-                    print(f"[✓] Top mod path (from UserRole): {top_path}")
-                elif first_checked_variant_path:
-                    reconstructed = first_checked_variant_path.parent
-                    top_paths.append(reconstructed)
-                    print(f"[✓] Top mod path (reconstructed): {reconstructed}")
-                else:
-                    print("[!] Could not determine top-level path")
+        # Checked mod folders in load order, collected by pack_mods() on the GUI thread
+        sources = spec["sources"]
 
-            # Color checked top-level items
-            if is_top_checked or top_has_checked_variant:
-                top.setForeground(0, magenta_brush)
-            else:
-                top.setForeground(0, default_brush)
+        # ZIP mods only have their previews on disk until now
+        worker.stage("Extracting ZIP mods")
+        self._materialize_zip_mods([path for _, path, _ in sources])
 
-
-        # Save checked mod paths
-        if FEAT_ACTIVATED_SAVE:
-            self.write_activated_list(checked_paths)
+        # Every staged file gets exactly one source; the plan is logged before anything is copied
+        worker.stage("Planning")
+        plan = _build_pack_plan(self._plan_candidates(sources))
+        print(f"[Plan] {_plan_summary(plan)}")
+        for line in _plan_report(plan):
+            print(f"[Plan] {line}")
 
         # Clear/create temp
         if temp_inputs.exists():
@@ -2094,12 +3495,8 @@ class ModManager(QWidget):
         temp_inputs.mkdir(parents=True, exist_ok=True)
 
         # Collect files
-        collected = False
-        collected |= self.collect_from_variants(variant_paths, temp_inputs)
-        collected |= self.collect_top_level_streams(top_paths, temp_inputs)
-        for path in top_paths:
-            if path.suffix.lower() == '.zip':
-                collected |= self.collect_from_zip(path, temp_inputs)
+        worker.stage("Collecting files", plan["files"], plan["bytes"])
+        collected = self.stage_pack_plan(plan, temp_inputs, worker.advance)
 
         # Restore original .org backups
         for fname in ('streaming_graph.core', 'streaming_links.stream'):
@@ -2114,41 +3511,64 @@ class ModManager(QWidget):
             cmd = [str(exe), str(out_file), build_stream_id]
 
             if not exe.exists():
-                QMessageBox.critical(self, "Error", f"Pack tool not found:\n{exe}")
-                return False, "Missing pack tool"
+                return False, f"Pack tool not found:\n{exe}"
 
-            self.status_label.setText("Packing…")
+            worker.stage("Running pack tool")
             try:
                 subprocess.run(cmd, cwd=pack_dir, check=True)
             except Exception as e:
                 print(f"Pack tool error (ignored): {e}")
 
-            self.status_label.setText("Finalizing…")
+            worker.stage("Finalizing")
             deadline = time.time() + 2.0
             while time.time() < deadline:
                 if out_file.exists():
                     break
-                QCoreApplication.processEvents()
                 time.sleep(0.05)
             else:
-                QMessageBox.critical(self, "Error", f"Output not found:\n{out_file.name}")
-                return False, "Output not found"
+                return False, f"Output not found:\n{out_file.name}"
 
             try:
-                shutil.copy(out_file, ar / out_file.name)
-                self.status_label.setText("Done.")
-                file_count = len(list(temp_inputs.glob("*.stream")) + list(temp_inputs.glob("*.core")))
-                return True, f"-- Mod pack created: {out_file.name}\n-- {file_count} files included"
+                size = out_file.stat().st_size
+                worker.stage("Installing pack", 1, size)
+                last = [0]
+
+                def copied(done, total):
+                    worker.advance(nbytes=done - last[0])
+                    last[0] = done
+
+                _copy_file_chunked(out_file, ar / out_file.name, copied)
+                worker.advance(files=1)
+                message = f"-- Mod pack created: {out_file.name}\n-- {plan['files']} files included"
+                if plan["overridden"]:
+                    message += f"\n-- {plan['overridden']} overridden copies skipped"
+                return True, message
             except Exception as copy_exc:
-                QMessageBox.critical(self, "Error", f"Failed to copy:\n{copy_exc}")
-                return False, "Copy failed"
+                return False, f"Failed to copy:\n{copy_exc}"
         else:
-            self.status_label.setText("No eligible files.")
             return False, "No eligible files"
 
     def restore_default(self):
         gf = Path(self.select_game_dir.text().strip())
         pkg = gf / 'LocalCacheWinGame' / 'package'
+        self.status_label.setText("Restoring game files...")
+        self.jobs.submit("Restoring game files", lambda job: self._restore_game_files(pkg), PRIORITY_PACK, ("game",),
+                         on_done=self._on_restore_done)
+
+    def _on_restore_done(self, job):
+        if job.state == CANCELLED:
+            return
+        problems = job.result if job.state == DONE else [("critical", "Unexpected Error", str(job.error))]
+        for level, title, text in problems:
+            if level == "warning":
+                QMessageBox.warning(self, title, text)
+            else:
+                QMessageBox.critical(self, title, text)
+        self.status_label.setText("Restored game files and cleared pack mods.")
+
+    def _restore_game_files(self, pkg: Path) -> list[tuple[str, str, str]]:
+        """Put the backed-up core files back and empty pkg/ar. No widget access; returns (level, title, text) problems."""
+        problems = []
         # restore individual core files
         for fname in ['streaming_graph.core', 'streaming_links.stream']:
             backup_file = self.backup_dir / fname
@@ -2157,17 +3577,16 @@ class ModManager(QWidget):
                 if backup_file.exists():
                     shutil.copy(backup_file, dest_file)
             except PermissionError as pe:
-                QMessageBox.warning(
-                    self, "Permission Error",
+                problems.append((
+                    "warning", "Permission Error",
                     f"Could not restore {fname} due to permission error: {pe}\n\n"
                     "Try closing the game or running the app with elevated permissions."
-                )
+                ))
             except Exception as e:
-                QMessageBox.critical(
-                    self,
-                    "Unexpected Error",
+                problems.append((
+                    "critical", "Unexpected Error",
                     f"An unexpected error occurred while restoring '{fname}':\n{e}"
-                )
+                ))
 
         # clear any existing modded archives in pkg/ar
         ar_dir = pkg / 'ar'
@@ -2180,128 +3599,402 @@ class ModManager(QWidget):
                         shutil.rmtree(item)
                 except Exception as e:
                     print(f"Error deleting {item}: {e}")
-        self.status_label.setText("Restored game files and cleared pack mods.")
+        return problems
+
+
+    def _collect_pack_selection(self, color: bool = True) -> tuple[list, list]:
+        """
+        (checked_paths, sources) of the active mods. `sources` are (label, folder,
+        recursive) in load order, lowest precedence first: down the list, and within
+        a mod its top-level files, then shared_files, then the chosen variant. A mod
+        without variants is packed whole. Active mods are colored magenta, the rest reset.
+        """
+        checked_paths, sources = [], []
+        magenta = QColor("magenta")
+        colors = {}
+        self.mod_model.populate([m for m in self.mod_model.mods if m.pending and m.is_active()])
+
+        for mod in self.mod_model.mods:
+            active = mod.is_active()
+            colors[mod] = magenta if active else None
+            for child in mod.children:
+                colors[child] = magenta if child.is_active() else None
+            if not active:
+                continue
 
+            checked_paths.extend(mod.checked_paths())
+            if mod.path:
+                sources.append((mod.name, Path(mod.path), not mod.children))
+                print(f"[✓] Top mod path: {mod.path}")
+            else:
+                print("[!] Could not determine top-level path")
+
+            # shared_files comes first among the children, so the chosen variant wins over it
+            for child in mod.children:
+                if child.is_active() and child.path:
+                    sources.append((f"{mod.name}/{child.name}", Path(child.path), True))
+                    print(f"[✓] Variant path: {child.path}")
+
+        if color:
+            self.mod_model.set_colors(colors)
+        return checked_paths, sources
+
+    def check_conflicts(self, then):
+        """
+        Color the active mods/variants that share a file name and call `then` with
+        the conflicts as (name, labels of the providers), from the conflict index.
+        Byte-identical copies are not conflicts. ZIP payloads and file listings are
+        prepared in a job first, and copies not hashed yet are hashed in one (the
+        one the live colors started, if it is still running).
+        """
+        if then in self._check_then:
+            return
+        self._check_then.append(then)
+        if len(self._check_then) > 1:
+            return  # a check is under way; `then` gets its report
+
+        def ready(ok):
+            if not ok:
+                self._check_then = []
+                self.status_label.setText("⚠️ Checking conflicts failed.")
+                return
+            self._sync_conflicts()
+            self._hash_conflicts(self._conflicts_checked)
 
-    def check_conflicts(self):
-        IGNORED_EXTENSIONS = {'.png', '.jpg', '.jpeg', '.bmp', '.gif', '.txt', '.md', '.ini', '.json'}
+        self._prepare_conflicts(None, ready)
 
-        # Collect all checked mod paths (variants + top-level mods)
-        checked_mod_paths = []
+    def _conflicts_checked(self):
+        # Conflict detection and coloring
+        red = QColor(Qt.red)
+        colors = {}
+        for mod in self.mod_model.mods:
+            conflict_in_top = bool(mod.norm) and self.conflicts.conflicting(mod.norm)
+            for child in mod.children:
+                conflict = bool(child.norm) and self.conflicts.conflicting(child.norm)
+                colors[child] = red if conflict else None
+                if conflict:
+                    conflict_in_top = True
+            colors[mod] = red if conflict_in_top else None
+
+        self.mod_model.set_colors(colors)
+        report = self.conflicts.report()
+        waiters, self._check_then = self._check_then, []
+        for fn in waiters:
+            fn(report)
+
+    def _sync_conflicts(self, mods=None) -> set:
+        """
+        Re-index active mods whose files changed and mark every source active or not.
+        Without `mods` the whole list is synced and sources no longer listed are
+        deactivated. Returns the sources whose conflict state may have changed.
+        """
+        full = mods is None
+        if full:
+            mods = self.mod_model.mods
+        affected = set()
+        for mod in mods:
+            if mod.is_active():
+                affected |= self._index_conflicts(mod)
+            for node in (mod, *mod.children):
+                if node.norm:
+                    affected |= self.conflicts.set_active(node.norm, node.is_active())
+        if full:
+            live = {n.norm for m in mods for n in (m, *m.children) if n.norm}
+            for source in self.conflicts.active() - live:
+                affected |= self.conflicts.set_active(source, False)
+        return affected
+
+    def _listing_folders(self, mod: ModNode) -> list:
+        """Folders whose manifest listings _index_conflicts() reads for `mod`: its own, plus children kept elsewhere."""
+        return [mod.path, *(c.path for c in mod.children if c.norm and os.path.dirname(c.norm) != mod.norm)]
+
+    def _zip_payload_missing(self, path) -> bool:
+        """True for a lazily scanned ZIP mod (its zip_cache folder) whose .stream/.core files are not out yet."""
+        return (_normpath(str(path)).startswith(_normpath(str(ZIP_CACHE_DIR)) + os.sep)
+                and not self.zip_cache.is_complete(Path(path)))
+
+    def _prepare_conflicts(self, mods, then, tried: frozenset = frozenset()):
+        """
+        Get the active `mods` (default: the whole list) ready to be indexed without
+        touching the disk here, then call `then(True)` on the GUI thread. ZIP mods
+        get their payload extracted and unlisted folders are walked in a "Listing mod
+        files" job; variants it makes known are listed in another pass. Folders a
+        pass already tried are not retried. `then(False)` if a job fails or is cancelled.
+        """
+        todo = self.mod_model.mods if mods is None else [m for m in mods if self._listed(m)]
+        todo = [m for m in todo if m.path and m.is_active()]
+        self.mod_model.populate([m for m in todo if m.pending and self.manifest.known(m.path)])
+        zips, need = [], []
+        for mod in todo:
+            if self._zip_payload_missing(mod.path) and mod.path not in tried:
+                zips.append(mod.path)
+            need += [p for p in self._listing_folders(mod)
+                     if p not in tried and p not in zips and not self.manifest.known(p)]
+        if not zips and not need:
+            then(True)
+            return
 
-        for i in range(self.mod_list.topLevelItemCount()):
-            top = self.mod_list.topLevelItem(i)
-            top_path = top.data(0, Qt.UserRole)
-            if top.checkState(0) == Qt.Checked and top_path:
-                checked_mod_paths.append(Path(top_path))
+        def work(job):
+            self._materialize_zip_mods([Path(p) for p in zips])
+            for path in zips + need:
+                job.check()
+                self.manifest.files(path)  # re-walks extracted ZIP folders
 
-            for j in range(top.childCount()):
-                child = top.child(j)
-                if child.checkState(0) == Qt.Checked:
-                    child_data = child.data(0, Qt.UserRole)
-                    if child_data:
-                        checked_mod_paths.append(Path(child_data))
+        def listed(job):
+            if job.state == DONE:
+                self._prepare_conflicts(mods, then, tried | set(zips) | set(need))
+            else:
+                then(False)
+
+        # "mods": never extracts next to a pack or plan doing the same
+        self.jobs.submit("Listing mod files", work, PRIORITY_SCAN, ("mods",), on_done=listed)
+
+    def _index_conflicts(self, mod: ModNode) -> set:
+        """
+        (Re)index the files `mod` and its children provide, from the mod folder's
+        manifest; nothing is done while that listing and the children are unchanged.
+        A mod without variants provides its whole folder, one with variants only its
+        top-level files (the rest belong to the children). Previews and notes are skipped.
+        """
+        if not mod.path:
+            return set()
+        heads, extra = {}, []
+        for child in mod.children:
+            if child.norm and os.path.dirname(child.norm) == mod.norm:
+                heads[os.path.basename(child.path)] = child.norm
+            elif child.norm:
+                extra.append(child)
+        lists = tuple(self.manifest.files(path) for path in self._listing_folders(mod))
+        shape = (mod.pending, tuple(c.norm for c in mod.children))
+        seen = self._conflict_seen.get(mod.norm)
+        if (seen is not None and seen[1] == shape and len(seen[0]) == len(lists)
+                and all(a is b for a, b in zip(seen[0], lists))):
+            return set()
+
+        recursive = not mod.children and not mod.pending
+        files = {mod.norm: {}}
+        labels = {mod.norm: mod.name}
+        for child in mod.children:
+            if child.norm:
+                files[child.norm] = {}
+                labels[child.norm] = f"{mod.name}/{child.name}"
+
+        def add(source, rel, size):
+            files[source].setdefault(rel.rsplit("/", 1)[-1], []).append((rel, size))
+
+        for row in lists[0]:
+            if row[CLASS] in (IMAGE, META):
+                continue
+            rel = row[REL]
+            head, sep, rest = rel.partition("/")
+            if not sep or recursive:
+                add(mod.norm, rel, row[SIZE])
+            elif head in heads:
+                add(heads[head], rest, row[SIZE])
+        for child, rows in zip(extra, lists[1:]):
+            for row in rows:
+                if row[CLASS] not in (IMAGE, META):
+                    add(child.norm, row[REL], row[SIZE])
+
+        affected = set()
+        for source in (seen[2] if seen else set()) - files.keys():
+            affected |= self.conflicts.remove_source(source)
+        for source, found in files.items():
+            affected |= self.conflicts.set_source(source, found, labels[source])
+        self._conflict_seen[mod.norm] = (lists, shape, set(files))
+        return affected
+
+    def _conflict_digest(self, source: str, rel: str) -> str | None:
+        # Only same-name, same-size copies get here. Never reads files: what is not
+        # hashed yet goes through _hash_conflicts()
+        return self.manifest.file_digest(os.path.join(source, rel), compute=False)
+
+    def _hash_conflicts(self, then=None, tried: frozenset = frozenset()):
+        """
+        Hash duplicate copies the index could not judge yet, in a job. `then()` runs
+        on the GUI thread once that is done (right away if nothing is left to hash);
+        while a job runs it is waited for, and afterwards only copies it did not try
+        are hashed, so no file is read twice and unreadable ones end the wait.
+        """
+        if then is not None and then not in self._hash_then:
+            self._hash_then.append(then)
+        if self._hash_job is not None:
+            return
+        self.conflicts.conflicts()  # judges every duplicated name, noting the unhashed ones
+        paths = [path for path in (os.path.join(source, rel) for source, rel in self.conflicts.unhashed())
+                 if path not in tried]
+        if not paths:
+            waiters, self._hash_then = self._hash_then, []
+            for fn in waiters:
+                fn()
+            return
 
-        # Build name → count map
-        name_counts = {}
-        for path in checked_mod_paths:
-            for f in Path(path).rglob('*'):
-                if f.is_file() and f.suffix.lower() not in IGNORED_EXTENSIONS:
-                    name_counts[f.name] = name_counts.get(f.name, 0) + 1
+        def work(job):
+            for path in paths:
+                job.check()
+                self.manifest.file_digest(path)
 
-        # Conflict detection and coloring
-        conflicts = set()
-        for i in range(self.mod_list.topLevelItemCount()):
-            top = self.mod_list.topLevelItem(i)
-            top_path = top.data(0, Qt.UserRole)
-            conflict_in_top = False
-
-            # Check top-level mod directly
-            if top.checkState(0) == Qt.Checked and top_path:
-                for f in Path(top_path).rglob('*'):
-                    if f.is_file() and f.suffix.lower() not in IGNORED_EXTENSIONS:
-                        if name_counts.get(f.name, 0) > 1:
-                            conflicts.add(f.name)
-                            conflict_in_top = True
-                            break
-
-            # Check children
-            for j in range(top.childCount()):
-                child = top.child(j)
-                child_data = child.data(0, Qt.UserRole)
-                child_path = Path(child_data) if child_data else None
-                conflict = False
-
-                if child.checkState(0) == Qt.Checked and child_path:
-                    for f in child_path.rglob('*'):
-                        if f.is_file() and f.suffix.lower() not in IGNORED_EXTENSIONS:
-                            if name_counts.get(f.name, 0) > 1:
-                                conflicts.add(f.name)
-                                conflict = True
-                                break
-
-                child.setForeground(0, Qt.red if conflict else QBrush())
-                if conflict:
-                    conflict_in_top = True
+        def hashed(job):
+            self._hash_job = None
+            if job.state == DONE:
+                self._recolor_conflicts(self.conflicts.rehash())
+            if self._hash_then:
+                self._hash_conflicts(tried=tried | set(paths))
 
-            top.setForeground(0, Qt.red if conflict_in_top else QBrush())
-
-        return list(conflicts)
-
-    def collect_from_variants(self, variant_paths: list[Path], temp_dir: Path) -> bool:
-        collected = False
-        for f in variant_paths:
-            if f.is_dir():
-                for file in f.rglob('*'):
-                    if file.suffix.lower() in ('.stream', '.core'):
-                        shutil.copy(file, temp_dir / file.name)
-                        collected = True
-                        print(f"[Variant] Collected: {file}")
-        return collected
-
-    def collect_top_level_streams(self, mod_paths: list[Path], temp_dir: Path) -> bool:
-        collected = False
-        for mod_path in mod_paths:
-            if mod_path.is_dir():
-                for f in mod_path.iterdir():
-                    if f.suffix.lower() in ('.stream', '.core'):
-                    # if (
-                    #     (f.suffix.lower() == '.stream' and '_' in f.stem and f.stem.endswith(('mesh', 'texture')))
-                    #     or (f.suffix.lower() == '.core' and all(c in '0123456789ABCDEFabcdef' for c in _normalize_key(f.stem)))
-                    # ):
-                        shutil.copy(f, temp_dir / f.name)
-                        print(f"[Top-Level] Collected: {f.name}")
-                        
-                        collected = True
-        return collected
-
-    def collect_from_zip(self, path: Path, temp_dir: Path) -> bool:
-        collected = False
-        try:
-            with ZipFile(path) as z:
-                for info in z.infolist():
-                    name = Path(info.filename).name
-                    stem = Path(name).stem
-                    ext  = Path(name).suffix.lower()
-
-                    is_stream = (ext == '.stream' and '_' in stem and stem.endswith(('mesh', 'texture')))
-                    is_core   = (ext == '.core' and all(c in '0123456789abcdefABCDEF' for c in _normalize_key(stem)))
-
-                    if is_stream or is_core:
-                        # skip directories
-                        if info.is_dir():
-                            continue
-                        with z.open(info) as src, open(temp_dir / name, 'wb') as dst:
-                            dst.write(src.read())
-                        print(f"[Zip] Extracted: {name}")
-                        collected = True
-        except BadZipFile:
-            QMessageBox.warning(self, "Warning", f"Invalid zip: {path.name}")
-        return collected
+        self._hash_job = self.jobs.submit("Hashing duplicate files", work, PRIORITY_HOUSEKEEPING, on_done=hashed)
+
+    def _live_conflicts(self) -> bool:
+        return FEAT_CONFLICT_COLOR and self.conflict_check.isChecked()
+
+    def _on_conflict_flags_toggled(self, on: bool):
+        if on:
+            self._schedule_conflicts()
+            return
+        red = QColor(Qt.red)
+        self.mod_model.set_colors({n: None for m in self.mod_model.mods for n in (m, *m.children) if n.color == red})
+
+    def _on_checks_changed(self, top_left: QModelIndex, bottom_right: QModelIndex, roles=()):
+        if Qt.CheckStateRole not in roles:
+            return
+        model = self.mod_model
+        if top_left.parent().isValid():
+            self._schedule_conflicts([model.node(top_left.parent())])
+        else:
+            self._schedule_conflicts(model.mods[top_left.row():bottom_right.row() + 1])
+
+    def _schedule_conflicts(self, mods=None):
+        """Queue a live conflict update for `mods` (default: the whole list); bursts collapse into one."""
+        if mods is None:
+            self._conflict_full = True
+        else:
+            for mod in mods:
+                self._conflict_dirty[id(mod)] = mod
+        if self._live_conflicts():
+            self._conflict_timer.start()
+
+    def _listed(self, mod: ModNode) -> bool:
+        row = self.mod_model.row_of_path(mod.norm) if mod.norm else None
+        return row is not None and self.mod_model.mods[row] is mod
+
+    def _update_conflicts(self):
+        """
+        Live update: index and (de)activate only the mods whose checks changed, then
+        recolor the rows whose conflict state moved. ZIP payloads and unlisted files
+        are prepared in a job first; a burst of changes meanwhile is picked up when
+        it finishes.
+        """
+        if not self._live_conflicts() or self._conflict_listing:
+            return
+        full, self._conflict_full = self._conflict_full, False
+        dirty, self._conflict_dirty = self._conflict_dirty, {}
+        mods = None if full else list(dirty.values())
+
+        def ready(ok):
+            self._conflict_listing = False
+            if ok:
+                self._apply_conflicts(None if full else [m for m in mods if self._listed(m)])
+            if self._conflict_dirty or self._conflict_full:
+                self._conflict_timer.start()
+
+        self._conflict_listing = True
+        self._prepare_conflicts(mods, ready)
+
+    def _apply_conflicts(self, mods):
+        affected = self._sync_conflicts(mods) | self._conflict_recolor
+        self._conflict_recolor = set()
+        self._recolor_conflicts(affected)
+        self._hash_conflicts()
+
+    def _node_for_source(self, source: str) -> ModNode | None:
+        model = self.mod_model
+        row = model.row_of_path(source)
+        if row is not None:
+            return model.mods[row]
+        row = model.row_of_path(os.path.dirname(source))
+        if row is None:
+            return None
+        return next((c for c in model.mods[row].children if c.norm == source), None)
+
+    def _recolor_conflicts(self, sources):
+        """Redraw the mods owning `sources`: red where the index reports a real conflict."""
+        red = QColor(Qt.red)
+        tops = {}
+        for source in sources:
+            node = self._node_for_source(source)
+            if node is not None:
+                tops[id(node.top)] = node.top
+        colors = {}
+        for mod in tops.values():
+            conflict_in_top = bool(mod.norm) and self.conflicts.conflicting(mod.norm)
+            for child in mod.children:
+                conflict = bool(child.norm) and self.conflicts.conflicting(child.norm)
+                if (child.color == red) != conflict:
+                    colors[child] = red if conflict else None
+                conflict_in_top = conflict_in_top or conflict
+            if (mod.color == red) != conflict_in_top:
+                colors[mod] = red if conflict_in_top else None
+        if colors:
+            self.mod_model.set_colors(colors)
+
+    def _drop_conflicts(self, root: str):
+        norm = _normpath(root)
+        self._conflict_seen.pop(norm, None)
+        self._conflict_recolor |= self.conflicts.remove_under(norm)
+
+    def _plan_candidates(self, sources: list) -> list:
+        """
+        (label, src, name, size) of every .stream/.core the sources provide, in source
+        order. ZIP mods are planned from their extracted zip_cache folders.
+        """
+        out = []
+        for label, path, recursive in sources:
+            for row in self.manifest.files(path, (STREAM, CORE), recursive):
+                out.append((label, path / row[REL], row[REL].rsplit("/", 1)[-1], row[SIZE]))
+        return out
+
+    def stage_pack_plan(self, plan: dict, temp_dir: Path, progress=None) -> bool:
+        """Copy each planned target into `temp_dir` once, from its winning source."""
+        for t in plan["targets"]:
+            label, src, size = t["winner"]
+            shutil.copy(src, temp_dir / t["name"])
+            print(f"[Stage] {t['name']} ← {label}")
+            if progress:
+                progress(1, size)
+        return bool(plan["targets"])
+
+    def preview_pack_plan(self):
+        """Dry run: show what Pack would stage, from which mod, and what it overrides."""
+        if self._after_scan(self.preview_pack_plan):
+            return
+        if not self.select_game_dir.text().strip():
+            QMessageBox.warning(self, "Error", "Please select a valid game folder before packing.")
+            return
+        _, sources = self._collect_pack_selection(color=False)
+        if not sources:
+            QMessageBox.information(self, "Pack Plan", "No mods are activated.")
+            return
+
+        def plan(job):
+            self._materialize_zip_mods([path for _, path, _ in sources])
+            job.check()
+            return _build_pack_plan(self._plan_candidates(sources))
+
+        def planned(job):
+            if job.state == DONE:
+                self.status_label.setText("Pack plan ready.")
+                box = QMessageBox(QMessageBox.Information, "Pack Plan",
+                                  _plan_summary(job.result) + "\nLower in the list wins.", QMessageBox.Ok, self)
+                box.setDetailedText("\n".join(_plan_report(job.result)))
+                box.exec_()
+            elif job.state != CANCELLED:
+                self.status_label.setText("⚠️ Planning the pack failed.")
 
+        self.status_label.setText("Planning pack...")
+        self.jobs.submit("Planning pack", plan, PRIORITY_PACK, ("mods",), on_done=planned)
 
     def on_pack_finished(self, success: bool, message: str):
-        self.spinner_dialog.close()
+        self._pack_timer.stop()
+        self.pack_dialog.close()
         if success:
             QMessageBox.information(self, "Packing Complete", message)
             self.status_label.setText("Done.")
@@ -2532,13 +4225,19 @@ class StreamPacking(QWidget):
         )
 
 
-class ExternalLinkPage(QWebEnginePage):
-    def acceptNavigationRequest(self, url: QUrl, nav_type: QWebEnginePage.NavigationType, isMainFrame: bool):
-        # If the user clicked a link, open externally
-        if nav_type == QWebEnginePage.NavigationTypeLinkClicked:
-            QDesktopServices.openUrl(url)
-            return False
-        return super().acceptNavigationRequest(url, nav_type, isMainFrame)
+def _external_link_page(view) -> QObject:
+    """A page that opens clicked links in the browser (QtWebEngine is only loaded here)."""
+    from PyQt5.QtWebEngineWidgets import QWebEnginePage
+
+    class ExternalLinkPage(QWebEnginePage):
+        def acceptNavigationRequest(self, url: QUrl, nav_type: QWebEnginePage.NavigationType, isMainFrame: bool):
+            # If the user clicked a link, open externally
+            if nav_type == QWebEnginePage.NavigationTypeLinkClicked:
+                QDesktopServices.openUrl(url)
+                return False
+            return super().acceptNavigationRequest(url, nav_type, isMainFrame)
+
+    return ExternalLinkPage(view)
 
 class Help(QWidget):
     def __init__(self, parent=None):
@@ -2546,6 +4245,9 @@ class Help(QWidget):
         self.init_ui()
 
     def init_ui(self):
+        import markdown
+        from PyQt5.QtWebEngineWidgets import QWebEngineView
+
         # Load & convert markdown
         md_path = Path.cwd() / "res/info.md"
         raw     = md_path.read_text(encoding='utf-8')
@@ -2566,7 +4268,7 @@ class Help(QWidget):
 
         # Set up QWebEngineView + custom page
         view = QWebEngineView(self)
-        page = ExternalLinkPage(view)
+        page = _external_link_page(view)
         view.setPage(page)
         view.setHtml(full_html, QUrl.fromLocalFile(str(md_path.parent) + '/'))
 
@@ -2575,7 +4277,31 @@ class Help(QWidget):
         self.setLayout(layout)
 
 
+class _FirstPaintProbe(QObject):
+    """Prints the startup timing report on the first paint event."""
+    def __init__(self, marks: dict):
+        super().__init__()
+        self.marks = marks
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Paint:
+            QApplication.instance().removeEventFilter(self)
+            QTimer.singleShot(0, self.report)
+        return False
+
+    def report(self):
+        m = self.marks
+        now = time.perf_counter()
+        print(f"[Startup] imports {m['imported'] - m['start']:.3f}s | "
+              f"window {m['shown'] - m['window']:.3f}s | "
+              f"first paint {now - m['shown']:.3f}s | "
+              f"total {now - m['start']:.3f}s")
+
+
 def main():
+    if FEAT_HELP_WEBENGINE:
+        # QtWebEngine is imported lazily, after the QApplication exists
+        QCoreApplication.setAttribute(Qt.AA_ShareOpenGLContexts)
     app = QApplication(sys.argv)
     QCoreApplication.setOrganizationName("Julz876")
     QCoreApplication.setApplicationName("HFWModManager")
@@ -2593,9 +4319,14 @@ def main():
         return 1
     app._lock = lock 
 
+    marks = {"start": _T_START, "imported": _T_IMPORTED, "window": time.perf_counter()}
     mgr = ModManager()
     mgr.resize(1200, 400)
     mgr.show()
+    marks["shown"] = time.perf_counter()
+    if STARTUP_TIMING:
+        app._paint_probe = _FirstPaintProbe(marks)
+        app.installEventFilter(app._paint_probe)
     return app.exec_()
 
 if __name__ == "__main__":
@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+import os
+import logging
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+
+class ConflictIndex:
+    """
+    Inverted index from target file name to the sources (mod, variant or
+    shared_files folders) that provide it.
+
+    Every source carries its files as {name: [(rel, size), ...]}; several rels
+    under one name are copies that overwrite each other inside that source.
+    Sources are indexed, replaced and dropped one at a time, and separately
+    marked active (selected for packing). For active sources the index keeps a
+    per-name copy count and the set of names with more than one active copy,
+    so a selection change costs the size of the sources it touches and reading
+    the conflicts costs their number. Updates return the sources whose conflict
+    state may have changed, for the caller to redraw.
+
+    A name whose copies all have the same size is checked once more through
+    `digest(source, rel)`: byte-identical copies (the same dependency shipped
+    twice) are benign and not reported as conflicts. The verdict is cached per
+    name until its active copies change; while a digest is unknown (None) the
+    name counts as a conflict and its copies are listed by unhashed(), so the
+    caller can hash them (in the background) and call rehash().
+    Not thread-safe; owned by the GUI thread.
+    """
+
+    def __init__(self, digest=None):
+        self.digest = digest
+        self._files: dict[str, dict[str, list]] = {}  # source -> {name: [(rel, size), ...]}
+        self._labels: dict[str, str] = {}             # source -> display label
+        self._providers: dict[str, set[str]] = {}     # name -> sources providing it
+        self._active: set[str] = set()
+        self._counts: dict[str, int] = {}             # name -> copies among active sources
+        self._conflicts: set[str] = set()             # names with more than one active copy
+        self._verdicts: dict[str, bool] = {}          # name -> copies differ (cached, see _differs)
+        self._unhashed: set[str] = set()              # names judged without all digests
+
+    def __contains__(self, source):
+        return source in self._files
+
+    # Updates
+    # --------------------------------------------------------------------------
+    def set_source(self, source: str, files: dict, label: str | None = None) -> set[str]:
+        """(Re)index `source` from {name: [(rel, size), ...]}."""
+        if label is not None:
+            self._labels[source] = label
+        old = self._files.get(source)
+        if old == files:
+            # Same names and sizes, the content may still have changed
+            touched = {name: True for name in files if name in self._conflicts}
+            for name in touched:
+                self._verdicts.pop(name, None)
+            return self._affected(source, touched) if source in self._active else set()
+        old = old or {}
+        touched = {}
+        if source in self._active:
+            self._count(old, -1, touched)
+        for name in old.keys() - files.keys():
+            providers = self._providers.get(name)
+            if providers is not None:
+                providers.discard(source)
+                if not providers:
+                    del self._providers[name]
+        for name in files.keys() - old.keys():
+            self._providers.setdefault(name, set()).add(source)
+        self._files[source] = files
+        if source in self._active:
+            self._count(files, 1, touched)
+        return self._affected(source, touched)
+
+    def remove_source(self, source: str) -> set[str]:
+        affected = self.set_source(source, {}) if source in self._files else set()
+        self._files.pop(source, None)
+        self._labels.pop(source, None)
+        self._active.discard(source)
+        return affected
+
+    def remove_under(self, folder: str) -> set[str]:
+        """Drop `folder` and every source inside it."""
+        prefix = folder.rstrip(os.sep) + os.sep
+        affected = set()
+        for source in [s for s in self._files if s == folder or s.startswith(prefix)]:
+            affected |= self.remove_source(source)
+        return affected
+
+    def set_active(self, source: str, on: bool) -> set[str]:
+        if on == (source in self._active):
+            return set()
+        touched = {}
+        if on:
+            self._active.add(source)
+            self._count(self._files.get(source, {}), 1, touched)
+        else:
+            self._count(self._files.get(source, {}), -1, touched)
+            self._active.discard(source)
+        affected = self._affected(source, touched)
+        affected.add(source)
+        return affected
+
+    def _count(self, files: dict, delta: int, touched: dict):
+        counts, conflicts = self._counts, self._conflicts
+        for name, copies in files.items():
+            if name not in touched:
+                touched[name] = name in conflicts
+                self._verdicts.pop(name, None)
+            n = counts.get(name, 0) + delta * len(copies)
+            if n > 0:
+                counts[name] = n
+            else:
+                counts.pop(name, None)
+            if n > 1:
+                conflicts.add(name)
+            else:
+                conflicts.discard(name)
+
+    def _affected(self, source: str, touched: dict) -> set[str]:
+        """`source` plus the active providers of touched names that are or were duplicated."""
+        affected = {source} if touched else set()
+        for name, was in touched.items():
+            if was or name in self._conflicts:
+                affected |= self._providers.get(name, set()) & self._active
+        return affected
+
+    def _differs(self, name: str) -> bool:
+        """True unless every active copy of `name` has the same size and digest."""
+        verdict = self._verdicts.get(name)
+        if verdict is not None:
+            return verdict
+        copies = [(source, rel, size) for source in self._providers.get(name, ()) if source in self._active
+                  for rel, size in self._files[source][name]]
+        if len({size for _, _, size in copies}) > 1:
+            verdict = True
+        elif self.digest is None:
+            return True
+        else:
+            digests = set()
+            for source, rel, _ in copies:
+                digest = self.digest(source, rel)
+                if digest is None:
+                    self._unhashed.add(name)
+                    return True  # not hashed (yet); ask again next time
+                digests.add(digest)
+            verdict = len(digests) > 1
+        self._verdicts[name] = verdict
+        return verdict
+
+    def unhashed(self) -> list[tuple[str, str]]:
+        """(source, rel) of the active copies of duplicated names that still lack a digest."""
+        out = []
+        for name in self._unhashed & self._conflicts:
+            for source in self._providers.get(name, ()):
+                if source in self._active:
+                    out.extend((source, rel) for rel, _ in self._files[source][name])
+        return out
+
+    def rehash(self) -> set[str]:
+        """Judge the unhashed names again on the next query; returns their active providers."""
+        names, self._unhashed = self._unhashed, set()
+        affected = set()
+        for name in names:
+            affected |= self._providers.get(name, set()) & self._active
+        return affected
+
+    # Queries
+    # --------------------------------------------------------------------------
+    def active(self) -> set[str]:
+        return set(self._active)
+
+    def label(self, source: str) -> str:
+        return self._labels.get(source, source)
+
+    def conflicts(self, benign: bool = False) -> set[str]:
+        """
+        Names provided more than once by the active sources with differing content;
+        with `benign`, those whose copies are all identical instead.
+        """
+        return {name for name in self._conflicts if self._differs(name) != benign}
+
+    def conflicting(self, source: str) -> bool:
+        """True if `source` is active and provides a name that really conflicts."""
+        if source not in self._active:
+            return False
+        return any(name in self._conflicts and self._differs(name) for name in self._files.get(source, ()))
+
+    def providers(self, name: str, active_only: bool = False) -> list[tuple[str, str]]:
+        """(source, rel) for every copy of `name`, sorted by label: "who else provides this"."""
+        out = []
+        for source in self._providers.get(name, ()):
+            if active_only and source not in self._active:
+                continue
+            for rel, _ in self._files[source][name]:
+                out.append((source, rel))
+        out.sort(key=lambda item: (self.label(item[0]).lower(), item[1]))
+        return out
+
+    def report(self, benign: bool = False) -> list[tuple[str, list[str]]]:
+        """(name, labels of the active sources providing it) for each conflict (see conflicts()), sorted by name."""
+        out = []
+        for name in sorted(self.conflicts(benign), key=str.lower):
+            labels = [self.label(source) for source, _ in self.providers(name, active_only=True)]
+            out.append((name, labels))
+        return out
@@ -0,0 +1,205 @@
+from __future__ import annotations
+
+import time
+import heapq
+import logging
+import itertools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# Lower runs first
+PRIORITY_INTERACTIVE = 0
+PRIORITY_SCAN = 1
+PRIORITY_PACK = 2
+PRIORITY_HOUSEKEEPING = 3
+PRIORITY_NAMES = {
+    PRIORITY_INTERACTIVE: "interactive",
+    PRIORITY_SCAN: "scan",
+    PRIORITY_PACK: "pack",
+    PRIORITY_HOUSEKEEPING: "housekeeping",
+}
+
+PENDING, RUNNING, DONE, FAILED, CANCELLED = "pending", "running", "done", "failed", "cancelled"
+
+
+class JobCancelled(Exception):
+    """Raised from inside a job (see Job.check) to stop it at a safe point."""
+
+
+class Job:
+    """One unit of background work; `fn(job)` runs on a scheduler thread."""
+
+    def __init__(self, scheduler: 'JobScheduler', name: str, fn, priority: int, resources, hidden: bool, on_done):
+        self.name = name
+        self.fn = fn
+        self.priority = priority
+        self.resources = frozenset(resources)
+        self.hidden = hidden
+        self.state = PENDING
+        self.result = None
+        self.error = None
+        self.started = None
+        self.finished = None
+        self._scheduler = scheduler
+        self._on_done = on_done
+        self._cancel = threading.Event()
+        self._done = threading.Event()
+
+    def __repr__(self):
+        return f"<Job {self.name!r} {self.state}>"
+
+    def cancel(self):
+        """Ask the job to stop; a queued job is dropped, a running one sees cancelled()."""
+        self._scheduler._cancel(self)
+
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    def check(self):
+        if self._cancel.is_set():
+            raise JobCancelled(self.name)
+
+    def done(self) -> bool:
+        return self._done.is_set()
+
+    def wait(self, timeout: float | None = None) -> bool:
+        return self._done.wait(timeout)
+
+    def elapsed(self) -> float:
+        if self.started is None:
+            return 0.0
+        return (self.finished or time.monotonic()) - self.started
+
+    def deliver(self):
+        """Run the on_done callback once, on the calling thread (the GUI, normally)."""
+        if not self.done():
+            return
+        callback, self._on_done = self._on_done, None
+        if callback is not None:
+            callback(self)
+
+
+class JobScheduler:
+    """
+    Priority queue in front of a thread pool.
+
+    A job is handed to the pool only when a worker is free, so a queued preview
+    always goes before queued scans, packs and housekeeping. Each job names the
+    resources it needs ("mods", "game", ...); two jobs sharing a resource never
+    run at the same time, and a blocked job lets the next runnable one through.
+    Cancellation is cooperative: jobs poll cancelled() / check().
+    `on_change(job)` is called from any thread whenever a visible job is queued,
+    started or finished, and when a hidden job with an on_done callback finishes
+    (so it can be delivered); listeners check job.hidden for the rest.
+    """
+
+    def __init__(self, workers: int = 4, on_change=None):
+        self.workers = workers
+        self.on_change = on_change
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="job")
+        self._lock = threading.Lock()
+        self._queue = []            # heap of (priority, seq, job)
+        self._running = set()
+        self._held = {}             # resource -> running job
+        self._seq = itertools.count()
+        self._closed = False
+
+    def submit(self, name: str, fn, priority: int = PRIORITY_HOUSEKEEPING, resources=(),
+               hidden: bool = False, on_done=None) -> Job:
+        job = Job(self, name, fn, priority, resources, hidden, on_done)
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("scheduler is shut down")
+            heapq.heappush(self._queue, (priority, next(self._seq), job))
+        self._changed(job)
+        self._dispatch()
+        return job
+
+    def jobs(self) -> list[Job]:
+        """Visible jobs that are queued or running, running first."""
+        with self._lock:
+            running = sorted(self._running, key=lambda j: j.started)
+            queued = [j for _, _, j in sorted(self._queue) if j.state == PENDING]
+        return [j for j in running + queued if not j.hidden]
+
+    def busy(self, resource: str) -> bool:
+        with self._lock:
+            return resource in self._held or any(
+                resource in j.resources for _, _, j in self._queue if j.state == PENDING)
+
+    def shutdown(self, wait: bool = True):
+        """Drop queued jobs, ask running ones to stop and (optionally) wait for them."""
+        with self._lock:
+            self._closed = True
+            jobs = [j for _, _, j in self._queue] + list(self._running)
+        for job in jobs:
+            job.cancel()
+        self._pool.shutdown(wait=wait)
+
+    def _dispatch(self):
+        started = []
+        with self._lock:
+            blocked = []
+            while self._queue and not self._closed and len(self._running) < self.workers:
+                item = heapq.heappop(self._queue)
+                job = item[2]
+                if job.state != PENDING:
+                    continue  # cancelled while queued
+                if any(r in self._held for r in job.resources):
+                    blocked.append(item)
+                    continue
+                for r in job.resources:
+                    self._held[r] = job
+                self._running.add(job)
+                job.state = RUNNING
+                job.started = time.monotonic()
+                started.append(job)
+            for item in blocked:
+                heapq.heappush(self._queue, item)
+        for job in started:
+            self._changed(job)
+            self._pool.submit(self._run, job)
+
+    def _run(self, job: Job):
+        try:
+            job.check()
+            job.result = job.fn(job)
+            state = DONE
+        except JobCancelled:
+            state = CANCELLED
+        except Exception as e:
+            job.error = e
+            state = FAILED
+            logging.exception("Job %r failed", job.name)
+        with self._lock:
+            for r in job.resources:
+                if self._held.get(r) is job:
+                    del self._held[r]
+            self._running.discard(job)
+            job.state = state
+            job.finished = time.monotonic()
+        job._done.set()
+        self._changed(job)
+        self._dispatch()
+
+    def _cancel(self, job: Job):
+        job._cancel.set()
+        with self._lock:
+            if job.state != PENDING:
+                return
+            job.state = CANCELLED
+            job.finished = time.monotonic()
+        job._done.set()
+        self._changed(job)
+
+    def _changed(self, job: Job):
+        if job.hidden and not (job.done() and job._on_done is not None):
+            return
+        if self.on_change is not None:
+            try:
+                self.on_change(job)
+            except Exception as e:
+                logging.error("Job listener failed: %s", e)
@@ -0,0 +1,273 @@
+from __future__ import annotations
+
+import os
+import json
+import hashlib
+import logging
+import tempfile
+import threading
+from pathlib import Path
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+MANIFEST_VERSION = 2
+_HASH_CHUNK = 4 << 20
+_HASH_MEMO_LIMIT = 50000  # remembered (inode, size, mtime) -> sha1 pairs
+
+STREAM, CORE, IMAGE, META, OTHER = "stream", "core", "image", "meta", "other"
+_CLASSES = {
+    ".stream": STREAM,
+    ".core": CORE,
+    ".png": IMAGE, ".jpg": IMAGE, ".jpeg": IMAGE, ".bmp": IMAGE, ".gif": IMAGE,
+    ".txt": META, ".md": META, ".ini": META, ".json": META,
+}
+
+# Fields of a manifest row: [rel, size, mtime_ns, class, sha1 or None]
+REL, SIZE, MTIME, CLASS, SHA1 = range(5)
+
+
+def file_class(name: str) -> str:
+    if name.startswith("."):
+        return META  # hidden/bookkeeping files (zip_cache markers, .DS_Store, ...)
+    return _CLASSES.get(os.path.splitext(name)[1].lower(), OTHER)
+
+
+def _key(folder) -> str:
+    return os.path.normcase(os.path.abspath(folder))
+
+
+def _walk(folder: str) -> tuple[list, dict] | None:
+    """
+    (rows, dirs) for everything below `folder`: rows sorted by relative path
+    ("/"-separated), dirs mapping each relative directory ("" is the folder
+    itself) to its mtime. Symlinked folders are not followed. None if `folder`
+    cannot be listed.
+    """
+    rows, dirs = [], {}
+    stack = [""]
+    while stack:
+        rel = stack.pop()
+        path = os.path.join(folder, rel) if rel else folder
+        try:
+            # Stat before listing: a file added meanwhile leaves a newer mtime behind
+            dirs[rel] = os.stat(path).st_mtime_ns
+            with os.scandir(path) as it:
+                entries = list(it)
+        except OSError:
+            if not rel:
+                return None
+            dirs.pop(rel, None)
+            continue
+        for e in entries:
+            sub = f"{rel}/{e.name}" if rel else e.name
+            try:
+                if e.is_dir(follow_symlinks=False):
+                    stack.append(sub)
+                    continue
+                if not e.is_file():
+                    continue
+                st = e.stat()
+            except OSError:
+                continue
+            rows.append([sub, st.st_size, st.st_mtime_ns, file_class(e.name), None])
+    rows.sort(key=lambda r: r[REL])
+    return rows, dirs
+
+
+class ManifestStore:
+    """
+    Persisted file listings of mod and variant folders (manifest.idx).
+
+    One entry per folder: every file below it as a row (see REL..SHA1) plus the
+    mtime of every directory walked. An entry is reused while none of those
+    mtimes moved (adding, removing or renaming a file bumps its parent's), so
+    checking it costs one stat per directory instead of a walk. In-place edits
+    leave directory mtimes alone; invalidate() marks entries stale when the
+    watcher or a rescan reports a change. Hashes are computed on demand and
+    remembered per (inode, size, mtime), so a file is read once per change no
+    matter how many entries list it; rows carry theirs across a re-walk.
+    Rows returned by files() are shared: read them, don't modify them.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._entries: dict[str, dict] = {}  # folder key -> {"dirs", "files", "stale"}
+        self._digests: dict[str, str] = {}   # "inode:size:mtime_ns" -> sha1, oldest first
+        self._dirty = False
+        self._load()
+
+    def _load(self):
+        try:
+            if self.path.exists():
+                with open(self.path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                if (isinstance(data, dict) and data.get("version") == MANIFEST_VERSION
+                        and isinstance(data.get("entries"), dict)):
+                    self._entries = data["entries"]
+                    if isinstance(data.get("hashes"), dict):
+                        self._digests = data["hashes"]
+        except Exception as e:
+            logging.warning("Manifest unreadable, rebuilding: %s", e)
+
+    def save(self):
+        """Write the manifest if anything changed since the last save."""
+        with self._lock:
+            if not self._dirty:
+                return
+            data = json.dumps({"version": MANIFEST_VERSION, "entries": self._entries, "hashes": self._digests})
+            self._dirty = False
+        fd, tmp = tempfile.mkstemp(prefix=self.path.name + ".", suffix=".tmp", dir=str(self.path.parent))
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(data)
+            os.replace(tmp, self.path)
+        except OSError as e:
+            logging.error("Manifest not saved: %s", e)
+            with self._lock:
+                self._dirty = True
+        finally:
+            if os.path.exists(tmp):
+                try:
+                    os.unlink(tmp)
+                except OSError:
+                    pass
+
+    # Lookups
+    # --------------------------------------------------------------------------
+    def known(self, folder) -> bool:
+        """True if `folder` has an entry not marked stale (directory mtimes are not checked)."""
+        with self._lock:
+            entry = self._entries.get(_key(folder))
+        return entry is not None and not entry.get("stale")
+
+    def cached(self, folder) -> list | None:
+        """Rows of `folder` if its entry is still valid, without walking; else None."""
+        key = _key(folder)
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None or entry.get("stale"):
+            return None
+        for rel, mtime in entry["dirs"].items():
+            try:
+                if os.stat(os.path.join(key, rel) if rel else key).st_mtime_ns != mtime:
+                    return None
+            except OSError:
+                return None
+        return entry["files"]
+
+    def files(self, folder, classes=None, recursive: bool = True) -> list:
+        """
+        Rows of `folder`, walking it only if the entry is missing or out of date.
+        `classes` keeps only those file classes; without `recursive` only files
+        directly inside `folder` are returned.
+        """
+        rows = self.cached(folder)
+        if rows is None:
+            rows = self.refresh(folder)
+        if classes is not None:
+            rows = [r for r in rows if r[CLASS] in classes]
+        if not recursive:
+            rows = [r for r in rows if "/" not in r[REL]]
+        return rows
+
+    def refresh(self, folder) -> list:
+        """Walk `folder` now and store the result; hashes of unchanged files are kept."""
+        key = _key(folder)
+        walked = _walk(key)
+        with self._lock:
+            old = self._entries.get(key)
+            if walked is None:
+                if old is not None:
+                    del self._entries[key]
+                    self._dirty = True
+                return []
+            rows, dirs = walked
+            if old is not None:
+                hashes = {r[REL]: r for r in old["files"] if r[SHA1]}
+                for row in rows:
+                    prev = hashes.get(row[REL])
+                    if prev is not None and prev[SIZE] == row[SIZE] and prev[MTIME] == row[MTIME]:
+                        row[SHA1] = prev[SHA1]
+            self._entries[key] = {"dirs": dirs, "files": rows}
+            self._dirty = True
+        return rows
+
+    def file_digest(self, path, compute: bool = True) -> str | None:
+        """
+        sha1 of the file at `path`, read in chunks only if its (inode, size, mtime)
+        has not been hashed before. With compute=False only a remembered hash is
+        returned (None otherwise), so callers on the GUI thread never block on I/O.
+        """
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        memo = f"{st.st_ino}:{st.st_size}:{st.st_mtime_ns}"
+        with self._lock:
+            digest = self._digests.get(memo)
+        if digest is not None or not compute:
+            return digest
+        h = hashlib.sha1()
+        try:
+            with open(path, "rb") as f:
+                for chunk in iter(lambda: f.read(_HASH_CHUNK), b""):
+                    h.update(chunk)
+        except OSError:
+            return None
+        digest = h.hexdigest()
+        with self._lock:
+            self._digests[memo] = digest
+            while len(self._digests) > _HASH_MEMO_LIMIT:
+                del self._digests[next(iter(self._digests))]
+            self._dirty = True
+        return digest
+
+    def digest(self, folder, row: list, compute: bool = True) -> str | None:
+        """sha1 of the file behind `row` (see file_digest); stored in the row while it is current."""
+        path = os.path.join(_key(folder), row[REL])
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        current = st.st_size == row[SIZE] and st.st_mtime_ns == row[MTIME]
+        if current and row[SHA1]:
+            return row[SHA1]
+        digest = self.file_digest(path, compute)
+        if digest is not None and current:
+            with self._lock:
+                row[SHA1] = digest
+        return digest
+
+    # Invalidation
+    # --------------------------------------------------------------------------
+    def invalidate(self, path) -> int:
+        """
+        Mark stale every entry for `path`, inside it or containing it (a change in a
+        variant also changes its mod's listing). Returns how many entries were marked.
+        """
+        key = _key(path)
+        count = 0
+        with self._lock:
+            for folder, entry in self._entries.items():
+                if entry.get("stale"):
+                    continue
+                if folder == key or folder.startswith(key + os.sep) or key.startswith(folder + os.sep):
+                    entry["stale"] = True
+                    count += 1
+            if count:
+                self._dirty = True
+        return count
+
+    def forget(self, keep) -> int:
+        """Drop entries for folders that are not under any of `keep` (vanished mods)."""
+        roots = [_key(p) for p in keep]
+        with self._lock:
+            gone = [k for k in self._entries
+                    if not any(k == r or k.startswith(r + os.sep) for r in roots)]
+            for k in gone:
+                del self._entries[k]
+            if gone:
+                self._dirty = True
+        return len(gone)
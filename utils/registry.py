@@ -0,0 +1,329 @@
+from __future__ import annotations
+
+import os
+import json
+import time
+import sqlite3
+import logging
+import threading
+from pathlib import Path
+from contextlib import contextmanager
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+SCHEMA_VERSION = 1
+
+
+class ModRegistryStore:
+    """
+    SQLite-backed mod registry (replaces the whole-file JSON meta.ini).
+
+    One row per registry key (the entry stem), plus an indexed `mod_name` column
+    holding the normalized display name, so lookups by name don't scan every row.
+    The database runs in WAL mode; use batch() to group many writes in one transaction.
+    """
+
+    def __init__(self, path: Path, name_fn=None, legacy_json: Path | None = None):
+        self.path = Path(path)
+        self._name_fn = name_fn or (lambda key: key)
+        self._lock = threading.RLock()
+        self._depth = 0
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS mods (
+                key        TEXT PRIMARY KEY,
+                mod_name   TEXT NOT NULL,
+                data       TEXT NOT NULL,
+                updated_at INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS mods_by_name ON mods(mod_name);
+            CREATE TABLE IF NOT EXISTS meta (
+                name  TEXT PRIMARY KEY,
+                value TEXT
+            );
+        """)
+        self.set_meta("schema", SCHEMA_VERSION)
+        if legacy_json is not None:
+            self.import_legacy(Path(legacy_json))
+
+    # Transactions
+    # --------------------------------------------------------------------------
+    @contextmanager
+    def batch(self):
+        """Group writes into one transaction (nested calls join the outer one)."""
+        with self._lock:
+            if self._depth == 0:
+                self._conn.execute("BEGIN IMMEDIATE")
+            self._depth += 1
+            try:
+                yield self
+            except Exception:
+                self._depth -= 1
+                if self._depth == 0:
+                    self._conn.execute("ROLLBACK")
+                raise
+            self._depth -= 1
+            if self._depth == 0:
+                self._conn.execute("COMMIT")
+
+    # Reads
+    # --------------------------------------------------------------------------
+    def get(self, key: str) -> dict | None:
+        with self._lock:
+            row = self._conn.execute("SELECT data FROM mods WHERE key = ?", (key,)).fetchone()
+        return self._decode(row[0]) if row else None
+
+    def get_many(self, keys) -> dict[str, dict]:
+        keys = list(keys)
+        out = {}
+        with self._lock:
+            for i in range(0, len(keys), 500):
+                chunk = keys[i:i + 500]
+                marks = ",".join("?" * len(chunk))
+                for key, data in self._conn.execute(f"SELECT key, data FROM mods WHERE key IN ({marks})", chunk):
+                    out[key] = self._decode(data)
+        return out
+
+    def find_by_name(self, mod_name: str) -> dict[str, dict]:
+        with self._lock:
+            rows = self._conn.execute("SELECT key, data FROM mods WHERE mod_name = ?", (mod_name,)).fetchall()
+        return {key: self._decode(data) for key, data in rows}
+
+    def all(self) -> dict[str, dict]:
+        with self._lock:
+            rows = self._conn.execute("SELECT key, data FROM mods").fetchall()
+        return {key: self._decode(data) for key, data in rows}
+
+    def keys(self) -> set[str]:
+        with self._lock:
+            return {k for (k,) in self._conn.execute("SELECT key FROM mods")}
+
+    def get_meta(self, name: str, default=None):
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE name = ?", (name,)).fetchone()
+        return json.loads(row[0]) if row else default
+
+    # Writes
+    # --------------------------------------------------------------------------
+    def upsert(self, key: str, data: dict):
+        self.upsert_many({key: data})
+
+    def upsert_many(self, rows: dict[str, dict]):
+        if not rows:
+            return
+        now = int(time.time())
+        params = [(k, self._name_fn(k), json.dumps(v), now) for k, v in rows.items()]
+        with self.batch():
+            self._conn.executemany(
+                "INSERT INTO mods(key, mod_name, data, updated_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET mod_name = excluded.mod_name, "
+                "data = excluded.data, updated_at = excluded.updated_at",
+                params,
+            )
+
+    def delete(self, keys) -> int:
+        keys = list(keys)
+        if not keys:
+            return 0
+        with self.batch():
+            cur = self._conn.executemany("DELETE FROM mods WHERE key = ?", [(k,) for k in keys])
+        return cur.rowcount
+
+    def set_meta(self, name: str, value):
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO meta(name, value) VALUES (?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET value = excluded.value",
+                (name, json.dumps(value)),
+            )
+
+    # Legacy
+    # --------------------------------------------------------------------------
+    def import_legacy(self, json_path: Path) -> int:
+        """One-time import of a JSON meta.ini; the file is renamed once imported."""
+        if not json_path.exists():
+            return 0
+        try:
+            with open(json_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except Exception as e:
+            logging.error("meta.ini import failed: %s", e)
+            return 0
+
+        rows = {}
+        if isinstance(data, dict):
+            rows = {k: v for k, v in data.items() if k != "_meta" and isinstance(v, dict)}
+        existing = self.keys()
+        with self.batch():
+            # Rows already in the database are newer than the legacy file
+            self.upsert_many({k: v for k, v in rows.items() if k not in existing})
+            self.set_meta("legacy_imported", int(time.time()))
+
+        try:
+            os.replace(json_path, json_path.with_suffix(".ini_legacy"))
+        except OSError as e:
+            logging.warning("Could not rename %s: %s", json_path, e)
+        logging.info("Imported %d registry rows from %s", len(rows), json_path.name)
+        return len(rows)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    @staticmethod
+    def _decode(data: str) -> dict:
+        try:
+            value = json.loads(data)
+            return value if isinstance(value, dict) else {}
+        except ValueError:
+            return {}
+
+
+class RegistryCache:
+    """
+    Shared in-memory view of the registry.
+
+    Rows are loaded from the store once; reads are plain dict lookups and never
+    touch disk. Writes only mark keys dirty and (re)arm a debounced background
+    timer that flushes them to the store in one transaction. close() flushes
+    whatever is still pending; writes after that are dropped with a warning.
+    """
+
+    def __init__(self, store: ModRegistryStore, name_fn=None, flush_delay: float = 1.5):
+        self.store = store
+        self.flush_delay = flush_delay
+        self._name_fn = name_fn or (lambda key: key)
+        self._lock = threading.RLock()
+        self._flush_lock = threading.Lock()
+        self._timer = None
+        self._closed = False
+        self._dirty: set[str] = set()
+        self._deleted: set[str] = set()
+        self._meta: dict = {}
+        self._rows: dict[str, dict] = store.all()
+        self._by_name: dict[str, set[str]] = {}
+        for key in self._rows:
+            self._by_name.setdefault(self._name_fn(key), set()).add(key)
+
+    # Reads (no disk access)
+    # --------------------------------------------------------------------------
+    def get(self, key: str) -> dict | None:
+        return self._rows.get(key)
+
+    def get_many(self, keys) -> dict[str, dict]:
+        rows = self._rows
+        return {k: rows[k] for k in keys if k in rows}
+
+    def find_by_name(self, mod_name: str) -> dict[str, dict]:
+        with self._lock:
+            return {k: self._rows[k] for k in self._by_name.get(mod_name, ())}
+
+    def keys(self) -> set[str]:
+        with self._lock:
+            return set(self._rows)
+
+    # Writes (write-behind)
+    # --------------------------------------------------------------------------
+    def _refuse(self, what: str) -> bool:
+        # Caller holds the lock
+        if self._closed:
+            logging.warning("Registry closed, %s dropped", what)
+        return self._closed
+
+    def upsert_many(self, rows: dict[str, dict]):
+        if not rows:
+            return
+        with self._lock:
+            if self._refuse(f"update of {len(rows)} mod(s)"):
+                return
+            for key, data in rows.items():
+                if key not in self._rows:
+                    self._by_name.setdefault(self._name_fn(key), set()).add(key)
+                self._rows[key] = data
+                self._dirty.add(key)
+                self._deleted.discard(key)
+        self.schedule_flush()
+
+    def upsert(self, key: str, data: dict):
+        self.upsert_many({key: data})
+
+    def delete(self, keys) -> int:
+        count = 0
+        with self._lock:
+            if self._refuse("delete"):
+                return 0
+            for key in keys:
+                if self._rows.pop(key, None) is None:
+                    continue
+                names = self._by_name.get(self._name_fn(key))
+                if names:
+                    names.discard(key)
+                self._dirty.discard(key)
+                self._deleted.add(key)
+                count += 1
+        if count:
+            self.schedule_flush()
+        return count
+
+    def set_meta(self, name: str, value):
+        with self._lock:
+            if self._refuse(f"meta {name!r}"):
+                return
+            self._meta[name] = value
+        self.schedule_flush()
+
+    # Flushing
+    # --------------------------------------------------------------------------
+    def has_pending(self) -> bool:
+        with self._lock:
+            return bool(self._dirty or self._deleted or self._meta)
+
+    def schedule_flush(self):
+        """Debounce: every write pushes the flush back by flush_delay seconds."""
+        with self._lock:
+            if self._closed:
+                return
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = threading.Timer(self.flush_delay, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def flush(self):
+        with self._flush_lock:
+            with self._lock:
+                dirty = {k: self._rows[k] for k in self._dirty if k in self._rows}
+                deleted = set(self._deleted)
+                meta = dict(self._meta)
+                self._dirty.clear()
+                self._deleted.clear()
+                self._meta.clear()
+            if not (dirty or deleted or meta):
+                return
+            try:
+                with self.store.batch():
+                    self.store.upsert_many(dirty)
+                    self.store.delete(deleted)
+                    for name, value in meta.items():
+                        self.store.set_meta(name, value)
+            except Exception as e:
+                logging.error("Registry flush failed, will retry: %s", e)
+                with self._lock:
+                    # Keep newer in-memory changes; only re-mark what is still current
+                    self._dirty |= {k for k in dirty if k in self._rows}
+                    self._deleted |= {k for k in deleted if k not in self._rows}
+                    for name, value in meta.items():
+                        self._meta.setdefault(name, value)
+                self.schedule_flush()
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        self.flush()
+        self.store.close()
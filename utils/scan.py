@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import os
+import json
+import zlib
+import logging
+import tempfile
+from pathlib import Path
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+INDEX_VERSION = 2
+
+
+def entry_signature(entry: Path) -> dict | None:
+    """
+    Cheap stat-based fingerprint of one top-level entry in the mods folder.
+
+    Folders also fold in the (name, size, mtime) of their direct children, so
+    replacing modinfo.json or a variant folder's contents is noticed even though
+    the folder's own mtime does not change.
+    Returns None if the entry vanished or is not a folder/ZIP.
+    """
+    try:
+        st = os.stat(entry)
+    except OSError:
+        return None
+
+    if os.path.isdir(entry):
+        kind = "dir"
+        crc = 0
+        try:
+            with os.scandir(entry) as it:
+                for e in sorted(it, key=lambda d: d.name):
+                    try:
+                        cst = e.stat()
+                    except OSError:
+                        continue
+                    crc = zlib.crc32(f"{e.name}|{cst.st_size}|{cst.st_mtime_ns}".encode("utf-8"), crc)
+        except OSError:
+            return None
+        children = crc & 0xffffffff
+    elif entry.suffix.lower() == ".zip":
+        kind = "zip"
+        children = 0
+    else:
+        return None
+
+    return {
+        "type": kind,
+        "size": st.st_size,
+        "mtime": st.st_mtime_ns,
+        "inode": st.st_ino,
+        "children": children,
+    }
+
+
+def diff_signatures(old: dict, new: dict) -> tuple[set, set, set]:
+    """Return (added, removed, changed) keys between two {key: signature} maps."""
+    added = set(new) - set(old)
+    removed = set(old) - set(new)
+    changed = {k for k in set(new) & set(old) if new[k] != old[k]}
+    return added, removed, changed
+
+
+def load_scan_index(path: Path, mods_folder: Path) -> dict:
+    """
+    Load the persisted index. Layout:
+      {"version": INDEX_VERSION, "mods_folder": str, "entries": {key: {"sig": {...}, "record": {...}}}}
+    An index written for another mods folder (or another version) is discarded.
+    """
+    try:
+        if path.exists():
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if (isinstance(data, dict)
+                    and data.get("version") == INDEX_VERSION
+                    and data.get("mods_folder") == str(mods_folder)
+                    and isinstance(data.get("entries"), dict)):
+                return data
+    except Exception as e:
+        logging.warning("Scan index unreadable, rebuilding: %s", e)
+    return {"version": INDEX_VERSION, "mods_folder": str(mods_folder), "entries": {}}
+
+
+def save_scan_index(path: Path, index: dict):
+    """Write the index next to its final location, then swap it in."""
+    fd, tmp = tempfile.mkstemp(prefix=path.name + ".", suffix=".tmp", dir=str(path.parent))
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(index, f)
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import re
+import bisect
+import logging
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+_TOKEN_RE = re.compile(r"[^\W_]+", re.UNICODE)
+
+
+def tokenize(text: str) -> list[str]:
+    return _TOKEN_RE.findall(str(text).casefold())
+
+
+def _trigrams(token: str) -> set[str]:
+    return {token[i:i + 3] for i in range(len(token) - 2)}
+
+
+class ModSearchIndex:
+    """
+    In-memory inverted index over mod metadata.
+
+    Every document (a mod key) is split into lowercase word tokens. Lookups go
+    token -> documents; a sorted vocabulary answers prefix queries by bisection
+    and a trigram -> tokens map narrows substring queries to a few candidates.
+    Documents are added, replaced and removed one at a time, so the index never
+    needs a rebuild when the mod list changes.
+    """
+
+    def __init__(self):
+        self._docs: dict[str, set[str]] = {}      # key -> its tokens
+        self._postings: dict[str, set[str]] = {}  # token -> keys
+        self._vocab: list[str] = []               # sorted tokens
+        self._grams: dict[str, set[str]] = {}     # trigram -> tokens
+
+    def __len__(self):
+        return len(self._docs)
+
+    def __contains__(self, key):
+        return key in self._docs
+
+    # Updates
+    # --------------------------------------------------------------------------
+    def add(self, key: str, fields):
+        """Index (or re-index) `key` from an iterable of field values."""
+        tokens = set()
+        for value in fields:
+            if value:
+                tokens.update(tokenize(value))
+        old = self._docs.get(key)
+        if old == tokens:
+            return
+        if old is not None:
+            self._unlink(key, old - tokens)
+            tokens_new = tokens - old
+        else:
+            tokens_new = tokens
+        self._docs[key] = tokens
+        for token in tokens_new:
+            keys = self._postings.get(token)
+            if keys is None:
+                keys = self._postings[token] = set()
+                bisect.insort(self._vocab, token)
+                for gram in _trigrams(token):
+                    self._grams.setdefault(gram, set()).add(token)
+            keys.add(key)
+
+    def remove(self, key: str):
+        tokens = self._docs.pop(key, None)
+        if tokens:
+            self._unlink(key, tokens)
+
+    def clear(self):
+        self._docs.clear()
+        self._postings.clear()
+        self._vocab.clear()
+        self._grams.clear()
+
+    def _unlink(self, key: str, tokens):
+        for token in tokens:
+            keys = self._postings.get(token)
+            if keys is None:
+                continue
+            keys.discard(key)
+            if keys:
+                continue
+            del self._postings[token]
+            i = bisect.bisect_left(self._vocab, token)
+            if i < len(self._vocab) and self._vocab[i] == token:
+                del self._vocab[i]
+            for gram in _trigrams(token):
+                grams = self._grams.get(gram)
+                if grams is not None:
+                    grams.discard(token)
+                    if not grams:
+                        del self._grams[gram]
+
+    # Queries
+    # --------------------------------------------------------------------------
+    def _tokens_with_prefix(self, term: str) -> list[str]:
+        i = bisect.bisect_left(self._vocab, term)
+        out = []
+        while i < len(self._vocab) and self._vocab[i].startswith(term):
+            out.append(self._vocab[i])
+            i += 1
+        return out
+
+    def _tokens_containing(self, term: str):
+        if len(term) < 3:
+            # Too short for trigrams; the vocabulary is small enough to scan
+            return [t for t in self._vocab if term in t]
+        candidates = None
+        for gram in _trigrams(term):
+            tokens = self._grams.get(gram)
+            if not tokens:
+                return []
+            candidates = set(tokens) if candidates is None else candidates & tokens
+        return [t for t in candidates if term in t]
+
+    def search(self, query: str, substring: bool = True) -> set[str] | None:
+        """
+        Keys matching every word of `query`: as a token prefix, or anywhere inside
+        a token with `substring`. None for an empty query (nothing to filter).
+        """
+        terms = tokenize(query)
+        if not terms:
+            return None
+        result = None
+        # Rarest-looking (longest) term first keeps the intersections small
+        for term in sorted(set(terms), key=len, reverse=True):
+            tokens = self._tokens_containing(term) if substring else self._tokens_with_prefix(term)
+            keys = set()
+            for token in tokens:
+                keys |= self._postings[token]
+            result = keys if result is None else result & keys
+            if not result:
+                return set()
+        return result
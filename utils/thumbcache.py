@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import os
+import json
+import hashlib
+import logging
+import tempfile
+import threading
+from pathlib import Path
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+_HASH_CHUNK = 1 << 20
+_DIGEST_INDEX = "digests.json"  # source path -> [size, mtime_ns, sha1], next to the thumbnails
+_DIGEST_LIMIT = 20000           # remembered sources, oldest dropped first
+
+
+class ThumbnailCache:
+    """
+    Downscaled previews on disk, as <root>/<sha1[:2]>/<sha1>-<tag>.png.
+
+    sha1 is taken over the source image's bytes and `tag` names the target size,
+    so the same screenshot shipped in two mods shares one thumbnail per size.
+    The sha1 is remembered per path/size/mtime in <root>/digests.json (see save()),
+    so a source is hashed once per change and a warm hit costs one stat.
+    Entries are touched on use; prune() drops the least recently used ones until
+    the directory fits its byte budget.
+    """
+
+    def __init__(self, root: Path, budget_bytes: int):
+        self.root = Path(root)
+        self.budget = budget_bytes
+        self._lock = threading.Lock()
+        self._digests: dict[str, list] | None = None  # path -> [size, mtime_ns, sha1], loaded on first use
+        self._dirty = False
+
+    def _memo(self) -> dict:
+        # Caller holds the lock
+        if self._digests is None:
+            self._digests = {}
+            try:
+                with open(self.root / _DIGEST_INDEX, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                if isinstance(data, dict):
+                    self._digests = data
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                logging.warning("Thumbnail digest index unreadable, rebuilding: %s", e)
+        return self._digests
+
+    def source_hash(self, source: Path) -> str | None:
+        try:
+            st = os.stat(source)
+        except OSError:
+            return None
+        key = os.path.normcase(os.path.abspath(source))
+        with self._lock:
+            memo = self._memo().get(key)
+        if memo is not None and memo[0] == st.st_size and memo[1] == st.st_mtime_ns:
+            return memo[2]
+        h = hashlib.sha1()
+        try:
+            with open(source, "rb") as f:
+                for chunk in iter(lambda: f.read(_HASH_CHUNK), b""):
+                    h.update(chunk)
+        except OSError:
+            return None
+        digest = h.hexdigest()
+        with self._lock:
+            digests = self._memo()
+            digests.pop(key, None)
+            digests[key] = [st.st_size, st.st_mtime_ns, digest]
+            while len(digests) > _DIGEST_LIMIT:
+                del digests[next(iter(digests))]
+            self._dirty = True
+        return digest
+
+    def save(self):
+        """Write the digest index if sources were hashed since the last save."""
+        with self._lock:
+            if not self._dirty:
+                return
+            data = json.dumps(self._digests)
+            self._dirty = False
+        tmp = None
+        try:
+            self.root.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(prefix=_DIGEST_INDEX + ".", suffix=".tmp", dir=str(self.root))
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(data)
+            os.replace(tmp, self.root / _DIGEST_INDEX)
+        except OSError as e:
+            logging.error("Thumbnail digest index not saved: %s", e)
+            with self._lock:
+                self._dirty = True
+        finally:
+            if tmp and os.path.exists(tmp):
+                try:
+                    os.unlink(tmp)
+                except OSError:
+                    pass
+
+    def path_for(self, digest: str, tag: str) -> Path:
+        return self.root / digest[:2] / f"{digest}-{tag}.png"
+
+    def lookup(self, source: Path, tag: str) -> Path | None:
+        """Cached thumbnail of `source` at `tag`, or None."""
+        digest = self.source_hash(source)
+        if digest is None:
+            return None
+        target = self.path_for(digest, tag)
+        try:
+            os.utime(target)  # recently used
+        except OSError:
+            return None
+        return target
+
+    def store(self, source: Path, tag: str, write) -> Path | None:
+        """Store a thumbnail; `write(tmp_path)` writes the PNG, which is then swapped in."""
+        digest = self.source_hash(source)
+        if digest is None:
+            return None
+        target = self.path_for(digest, tag)
+        tmp = target.with_name(f"{target.name}.{threading.get_ident()}.tmp")
+        try:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            if not write(str(tmp)):
+                raise OSError("encoder failed")
+            os.replace(tmp, target)
+        except Exception as e:
+            logging.warning("Thumbnail not cached for %s: %s", Path(source).name, e)
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            return None
+        return target
+
+    def prune(self) -> int:
+        """Remove least recently used thumbnails (and stray temp files) beyond the budget."""
+        if not self.root.exists():
+            return 0
+        files = []
+        removed = 0
+        for d in self.root.iterdir():
+            if not d.is_dir():
+                continue
+            for f in d.iterdir():
+                try:
+                    st = f.stat()
+                except OSError:
+                    continue
+                if f.suffix == ".tmp":
+                    try:
+                        f.unlink()
+                        removed += 1
+                    except OSError:
+                        pass
+                    continue
+                files.append((st.st_mtime, st.st_size, f))
+
+        used = sum(size for _, size, _ in files)
+        files.sort()
+        for _, size, f in files:
+            if used <= self.budget:
+                break
+            try:
+                f.unlink()
+                used -= size
+                removed += 1
+            except OSError as e:
+                logging.error("[Cleanup] Failed to remove %s: %s", f, e)
+        return removed
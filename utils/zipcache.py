@@ -0,0 +1,220 @@
+from __future__ import annotations
+
+import os
+import re
+import json
+import zlib
+import struct
+import shutil
+import logging
+from pathlib import Path
+from zipfile import ZipFile
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+MARKER_NAME = ".complete"
+LIGHT_MARKER_NAME = ".light"
+HEAVY_EXTS = ('.stream', '.core')
+_EOCD_SIG = b"PK\x05\x06"
+_EOCD_LEN = 22
+
+
+def _central_directory_crc(archive: Path) -> int:
+    """
+    CRC32 of the raw central directory bytes. Every member's name, size and CRC
+    live there, so any content change shows up without reading the payload.
+    Falls back to hashing ZipFile's parsed listing for ZIP64/odd archives.
+    """
+    with open(archive, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        file_size = f.tell()
+        tail_len = min(file_size, _EOCD_LEN + 0xFFFF)
+        f.seek(file_size - tail_len)
+        tail = f.read(tail_len)
+        pos = tail.rfind(_EOCD_SIG)
+        if pos >= 0 and pos + _EOCD_LEN <= len(tail):
+            cd_size, cd_offset = struct.unpack("<II", tail[pos + 12:pos + 20])
+            if cd_size != 0xFFFFFFFF and cd_offset != 0xFFFFFFFF and cd_offset + cd_size <= file_size:
+                f.seek(cd_offset)
+                return zlib.crc32(f.read(cd_size)) & 0xffffffff
+
+    crc = 0
+    with ZipFile(archive) as z:
+        for info in z.infolist():
+            crc = zlib.crc32(f"{info.filename}|{info.CRC}|{info.file_size}".encode("utf-8"), crc)
+    return crc & 0xffffffff
+
+
+def _is_heavy(name: str) -> bool:
+    return name.lower().endswith(HEAVY_EXTS)
+
+
+def scan_archive(archive: Path, image_exts) -> dict:
+    """
+    Read what the mod list needs straight from the central directory:
+      variants - top-level folders that directly hold a preview image
+      shared   - whether a shared_files/ folder exists
+      heavy    - number/bytes of .stream/.core members (not extracted by a light pass)
+    Nothing is written to disk.
+    """
+    image_exts = tuple(e.lower() for e in image_exts)
+    variants = set()
+    shared = False
+    heavy_count = heavy_bytes = 0
+    with ZipFile(archive) as z:
+        for info in z.infolist():
+            parts = info.filename.replace("\\", "/").strip("/").split("/")
+            if parts[0] == "shared_files" and len(parts) > 1:
+                shared = True
+            if info.is_dir():
+                continue
+            if _is_heavy(parts[-1]):
+                heavy_count += 1
+                heavy_bytes += info.file_size
+            elif len(parts) == 2 and parts[1].lower().endswith(image_exts):
+                variants.add(parts[0])
+    return {
+        "variants": sorted(variants, key=str.lower),
+        "shared": shared,
+        "heavy_count": heavy_count,
+        "heavy_bytes": heavy_bytes,
+    }
+
+
+class ZipExtractCache:
+    """
+    Persistent, content-addressed extraction cache for ZIP mods.
+
+    Each archive is extracted once into <root>/<stem>-<key>, where key covers the
+    archive's size, mtime and central-directory CRC. A directory is only reused if it
+    carries the completion marker, so an interrupted extraction is never picked up.
+
+    ensure_light() only writes the small members (modinfo.json, previews, readmes) and
+    leaves .stream/.core payloads inside the archive until ensure() needs them.
+    """
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self._keys: dict[tuple, str] = {}  # (path, size, mtime_ns) -> key
+
+    def archive_key(self, archive: Path) -> str:
+        st = os.stat(archive)
+        memo = (os.path.normcase(os.path.abspath(archive)), st.st_size, st.st_mtime_ns)
+        key = self._keys.get(memo)
+        if key is None:
+            ident = zlib.crc32(f"{st.st_size}|{st.st_mtime_ns}".encode("ascii")) & 0xffffffff
+            key = f"{ident:08x}{_central_directory_crc(archive):08x}"
+            self._keys[memo] = key
+        return key
+
+    def path_for(self, archive: Path) -> Path:
+        stem = re.sub(r"[^\w.\- ]", "_", Path(archive).stem)[:60]
+        return self.root / f"{stem}-{self.archive_key(archive)}"
+
+    def is_complete(self, target: Path) -> bool:
+        return (target / MARKER_NAME).is_file()
+
+    def is_light(self, target: Path) -> bool:
+        return (target / LIGHT_MARKER_NAME).is_file()
+
+    def ensure_light(self, archive: Path) -> Path | None:
+        """Return the cache dir for `archive` with at least its small members extracted."""
+        try:
+            target = self.path_for(archive)
+        except Exception as e:
+            logging.error("Cannot fingerprint %s: %s", archive, e)
+            return None
+        if self.is_complete(target) or self.is_light(target):
+            return target
+
+        self.root.mkdir(parents=True, exist_ok=True)
+        partial = target.with_name(target.name + ".partial")
+        for stale in (partial, target):
+            if stale.exists():
+                shutil.rmtree(stale, ignore_errors=True)
+
+        try:
+            with ZipFile(archive) as z:
+                light = [i for i in z.infolist() if not _is_heavy(i.filename)]
+                z.extractall(partial, members=light)
+            partial.mkdir(parents=True, exist_ok=True)
+            (partial / LIGHT_MARKER_NAME).touch()
+            os.replace(partial, target)
+        except Exception as e:
+            logging.error("Failed to read ZIP %s: %s", Path(archive).name, e)
+            shutil.rmtree(partial, ignore_errors=True)
+            return None
+        return target
+
+    def ensure(self, archive: Path) -> Path | None:
+        """Return the extracted directory for `archive`, extracting it if needed."""
+        try:
+            target = self.path_for(archive)
+        except Exception as e:
+            logging.error("Cannot fingerprint %s: %s", archive, e)
+            return None
+        if self.is_complete(target):
+            return target
+
+        if self.is_light(target):
+            # Top up in place; .complete is only written once every payload is out
+            try:
+                with ZipFile(archive) as z:
+                    heavy = [i for i in z.infolist() if _is_heavy(i.filename)]
+                    z.extractall(target, members=heavy)
+                self._write_marker(target, archive)
+            except Exception as e:
+                logging.error("Failed to extract ZIP %s: %s", Path(archive).name, e)
+                return None
+            logging.info("Extracted payload of %s (%d files)", Path(archive).name, len(heavy))
+            return target
+
+        self.root.mkdir(parents=True, exist_ok=True)
+        partial = target.with_name(target.name + ".partial")
+        for stale in (partial, target):
+            if stale.exists():
+                shutil.rmtree(stale, ignore_errors=True)
+
+        try:
+            with ZipFile(archive) as z:
+                z.extractall(partial)
+            self._write_marker(partial, archive)
+            os.replace(partial, target)
+        except Exception as e:
+            logging.error("Failed to extract ZIP %s: %s", Path(archive).name, e)
+            shutil.rmtree(partial, ignore_errors=True)
+            return None
+
+        logging.info("Extracted %s -> %s", Path(archive).name, target.name)
+        return target
+
+    def _write_marker(self, target: Path, archive: Path):
+        with open(target / MARKER_NAME, "w", encoding="utf-8") as f:
+            json.dump({"archive": str(archive), "key": self.archive_key(archive)}, f)
+
+    def prune(self, live_archives: list[Path]) -> int:
+        """Drop cache dirs whose archive is gone (deleted or replaced), plus leftovers."""
+        if not self.root.exists():
+            return 0
+        keep = set()
+        for archive in live_archives:
+            try:
+                keep.add(self.path_for(archive).name)
+            except Exception:
+                continue
+
+        removed = 0
+        for d in self.root.iterdir():
+            if d.name in keep:
+                continue
+            try:
+                if d.is_dir():
+                    shutil.rmtree(d)
+                else:
+                    d.unlink()
+                removed += 1
+                logging.info("[Cleanup] Removed stale extraction: %s", d.name)
+            except Exception as e:
+                logging.error("[Cleanup] Failed to remove %s: %s", d, e)
+        return removed